@@ -17,6 +17,7 @@ from ..core import utils
 from ..core.config import Config
 from ..core.backtrace import loadBacktraceHook
 from ..core.version import getVersionInfo
+from ..libs.benchmark import getProfiler, profile
 
 from .actions import registerAction
 from .args import getRootParser, registerParser
@@ -75,6 +76,13 @@ def rootParser(parser):
                        help='color logs during an interactive session')
    parser.add_argument('--help-all', action=HelpAllAction,
                        help='display all available clis')
+   parser.add_argument('--profile', action='store_true',
+                       help='print where the time was spent once done')
+   parser.add_argument('--profile-json', type=str,
+                       help='also dump the profiling spans to a json file')
+   parser.add_argument('--trace', type=str,
+                       help='write a trace-event file of the spans, for '
+                            'chrome://tracing or perfetto')
    addCommonArgs(parser)
 
 def parseArgs(args):
@@ -95,8 +103,22 @@ def parseArgs(args):
 
    return root, args
 
+def reportProfile(args):
+   profiler = getProfiler()
+   profiler.writeTrace()
+   if args.profile:
+      print(profiler.report(), file=sys.stderr)
+   if args.profile_json:
+      profiler.dump(args.profile_json)
+
 def main(args):
    root, args = parseArgs(args)
+   if args.profile or args.profile_json or args.trace:
+      profiler = getProfiler()
+      profiler.enable()
+      profiler.processName = 'arista %s' % args.action
+      if args.trace:
+         profiler.openTrace(args.trace)
 
    try:
       setupLogging(
@@ -122,11 +144,15 @@ def main(args):
                  ' '.join('%s=%s' % x for x in getVersionInfo().items()))
 
    try:
-      root.runAction(CliContext(), args)
+      with profile('arista %s', args.action):
+         root.runAction(CliContext(), args)
    except ActionComplete as e:
       return e.code
    except ActionError as e:
       logging.error('%s', e)
       return e.code
+   finally:
+      if getProfiler().enabled:
+         reportProfile(args)
 
    return 0
@@ -10,6 +10,8 @@ from ...core.config import Config
 from ...core.component import Priority
 from ...core.log import getLogger
 from ...core.platform import loadPrerequisites
+from ...core.xcvr import setXcvrControls
+from ...libs.benchmark import getProfiler, profile
 
 logging = getLogger(__name__)
 
@@ -26,21 +28,18 @@ def forkForLateInitialization(platform):
    else:
       if pid > 0:
          logging.debug('initializing slow drivers in child %d', pid)
-         platform.waitForIt()
+         with profile('wait for critical drivers'):
+            platform.waitForIt()
+         # NOTE: the child records its own events, see Profiler.writeTrace
+         getProfiler().writeTrace()
          os._exit(0) # pylint: disable=protected-access
+      profiler = getProfiler()
+      if profiler.processName is not None:
+         profiler.processName += ' (late init)'
 
 def setupXcvrs(platform):
-   for xcvrSlot in platform.getInventory().getXcvrSlots().values():
-      try:
-         xcvrSlot.setModuleSelect(True)
-      except NotImplementedError:
-         pass
-      xcvrSlot.setTxDisable(False)
-      if Config().xcvr_lpmode_out:
-         try:
-            xcvrSlot.setLowPowerMode(False)
-         except NotImplementedError:
-            pass
+   setXcvrControls(platform.getInventory(), moduleSelect=True, txDisable=False,
+                   lowPowerMode=False if Config().xcvr_lpmode_out else None)
 
 @registerAction(setupParser)
 def doSetup(ctx, args):
@@ -55,7 +54,8 @@ def doSetup(ctx, args):
       if args.early or not args.late:
          logging.debug('setting up critical drivers')
          loadPrerequisites()
-         platform.setup(Priority.defaultFilter)
+         with profile('setup default priority'):
+            platform.setup(Priority.defaultFilter)
 
       # NOTE: This assumes that none of the resetable devices are
       #       initialized in background.
@@ -64,7 +64,8 @@ def doSetup(ctx, args):
          logging.debug('taking devices out of reset')
          platform.resetOut()
          logging.debug('initializing xcvrs')
-         setupXcvrs(platform)
+         with profile('setup xcvrs'):
+            setupXcvrs(platform)
 
       if args.late or not args.early:
          if args.background:
@@ -73,8 +74,10 @@ def doSetup(ctx, args):
          else:
             logging.debug('setting up slow drivers normally')
 
-         platform.setup(Priority.backgroundFilter)
+         with profile('setup background priority'):
+            platform.setup(Priority.backgroundFilter)
 
       if args.early or not args.late:
          if not args.background:
-            platform.waitForIt()
+            with profile('wait for critical drivers'):
+               platform.waitForIt()
@@ -1,33 +1,128 @@
+import gc
 import os
+import signal
+import time
 
+from ..core.config import Config
 from ..core.log import getLogger, getLoggerManager
 
-from .exception import ActionComplete
+from .exception import ActionComplete, ActionError
 
 logging = getLogger(__name__)
 
-def processIterParentWait(collection):
-   """The collection needs to be an iterable"""
+POLL_DELAY = 0.05
+KILL_GRACE_PERIOD = 5
 
-   pids = []
+class ForkedChild(object):
+   def __init__(self, item, pid, timeout):
+      self.item = item
+      self.pid = pid
+      self.begin = time.monotonic()
+      self.deadline = self.begin + timeout if timeout else None
+      self.signaled = None
+      self.code = None
 
-   for item in collection:
-      pid = os.fork()
-      if pid == 0:
-         logging.debug('[child %s] starting for %s...', os.getpid(), item)
-         getLoggerManager().setPrefix('%s: ' % item)
-         # NOTE: once in the fork, yield the item and stop the iteration
-         #       it means that each item in the for loop will be executed in a
-         #       different process.
-         yield item
+   def __str__(self):
+      return 'child %d (%s)' % (self.pid, self.item)
+
+   def poll(self):
+      pid, status = os.waitpid(self.pid, os.WNOHANG)
+      if not pid:
+         return False
+      if os.WIFEXITED(status):
+         self.code = os.WEXITSTATUS(status)
+      else:
+         self.code = -os.WTERMSIG(status)
+      return True
+
+   def kill(self):
+      try:
+         os.kill(self.pid, signal.SIGKILL)
+         os.waitpid(self.pid, 0)
+      except OSError:
+         pass
+
+   def checkTimeout(self, now):
+      if self.deadline is None or now < self.deadline:
          return
+      sig = signal.SIGTERM
+      if now >= self.deadline + KILL_GRACE_PERIOD:
+         sig = signal.SIGKILL
+      if self.signaled != sig:
+         logging.error('[parent] %s timed out, sending %s', self, sig.name)
+         os.kill(self.pid, sig)
+         self.signaled = sig
+
+   @property
+   def duration(self):
+      return time.monotonic() - self.begin
+
+   @property
+   def failed(self):
+      return self.code != 0 or self.signaled is not None
+
+def processIterParentWait(collection, workers=None, timeout=None):
+   """The collection needs to be an iterable
+
+   Each item is handled in its own process, at most workers processes run at
+   once and each of them is terminated after timeout seconds. The parent only
+   waits for the children and completes the action with their aggregated exit
+   status.
+   """
+   workers = Config().fork_workers if workers is None else workers
+   timeout = Config().fork_timeout if timeout is None else timeout
+   pending = list(collection)
+   total = len(pending)
+   running = []
+   failed = []
+
+   # NOTE: everything allocated so far, the platform included, is inherited by
+   #       the children. Freezing it prevents the garbage collector of each
+   #       child from touching and thus duplicating these pages.
+   parent = os.getpid()
+   freeze = hasattr(gc, 'freeze')
+   if freeze:
+      gc.collect()
+      gc.freeze()
+
+   try:
+      while pending or running:
+         while pending and (workers <= 0 or len(running) < workers):
+            item = pending.pop(0)
+            pid = os.fork()
+            if pid == 0:
+               logging.debug('[child %s] starting for %s...', os.getpid(), item)
+               getLoggerManager().setPrefix('%s: ' % item)
+               # NOTE: once in the fork, yield the item and stop the iteration
+               #       it means that each item in the for loop will be executed
+               #       in a different process.
+               yield item
+               return
+            running.append(ForkedChild(item, pid, timeout))
 
-      pids.append(pid)
+         time.sleep(POLL_DELAY)
+         now = time.monotonic()
+         for child in list(running):
+            if not child.poll():
+               child.checkTimeout(now)
+               continue
+            running.remove(child)
+            logging.debug('[parent] %s exited with %d after %.2fs', child,
+                          child.code, child.duration)
+            if child.failed:
+               failed.append(child)
+   finally:
+      # NOTE: the children also run this when their generator is closed
+      if os.getpid() == parent:
+         for child in running:
+            logging.error('[parent] killing %s', child)
+            child.kill()
+         if freeze:
+            gc.unfreeze()
 
-   # wait for processes to finish
-   for pid in pids:
-      logging.debug('[parent] waiting for child %d', pid)
-      os.waitpid(pid, 0)
+   if failed:
+      raise ActionError('%d/%d children failed: %s' % (
+         len(failed), total, ', '.join(str(c.item) for c in failed)))
 
    logging.debug('[parent] all children completed')
 
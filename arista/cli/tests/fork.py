@@ -0,0 +1,96 @@
+import gc
+import os
+import tempfile
+import time
+
+from ...tests.testing import patch, unittest
+
+from ..exception import ActionComplete, ActionError
+from ..fork import ForkedChild, processIterParentWait
+
+class ProcessIterParentWaitTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.TemporaryDirectory()
+
+   def tearDown(self):
+      self.tmpdir.cleanup()
+
+   def _path(self, *parts):
+      return os.path.join(self.tmpdir.name, *parts)
+
+   def _run(self, items, action, **kwargs):
+      try:
+         for item in processIterParentWait(items, **kwargs):
+            code = 1
+            try:
+               code = action(item)
+            finally:
+               # NOTE: never return to the test runner from a child
+               os._exit(code) # pylint: disable=protected-access
+      except ActionError as e:
+         return e
+      self.fail('the parent did not complete the action')
+      return None
+
+   def _trackConcurrency(self, item):
+      marker = self._path('running.%s' % item)
+      with open(marker, 'w'):
+         pass
+      running = len([f for f in os.listdir(self.tmpdir.name)
+                     if f.startswith('running.')])
+      with open(self._path('result.%s' % item), 'w') as f:
+         f.write(str(running))
+      time.sleep(0.1)
+      os.unlink(marker)
+      return 0
+
+   def testBoundedWorkers(self):
+      res = self._run(range(5), self._trackConcurrency, workers=2, timeout=10)
+      self.assertIsInstance(res, ActionComplete)
+      self.assertEqual(res.code, 0)
+      peaks = []
+      for item in range(5):
+         with open(self._path('result.%d' % item)) as f:
+            peaks.append(int(f.read()))
+      self.assertLessEqual(max(peaks), 2)
+
+   def testAggregatedStatus(self):
+      res = self._run(range(4), lambda item: item % 2, workers=4, timeout=10)
+      self.assertNotIsInstance(res, ActionComplete)
+      self.assertEqual(res.code, 1)
+      self.assertIn('2/4', res.msg)
+
+   def testTimeout(self):
+      begin = time.monotonic()
+      res = self._run(['slow', 'fast'],
+                      lambda item: time.sleep(30 if item == 'slow' else 0) or 0,
+                      workers=2, timeout=0.2)
+      self.assertLess(time.monotonic() - begin, 10)
+      self.assertNotIsInstance(res, ActionComplete)
+      self.assertIn('1/2 children failed: slow', res.msg)
+
+   def testParentFailureReapsChildren(self):
+      pids = []
+      def checkTimeout(child, now):
+         pids.append(child.pid)
+         raise RuntimeError('parent failure')
+
+      with patch.object(ForkedChild, 'checkTimeout', checkTimeout):
+         with self.assertRaises(RuntimeError):
+            self._run(range(2), lambda item: time.sleep(30) or 0,
+                      workers=2, timeout=60)
+      self.assertTrue(pids)
+      for pid in pids:
+         with self.assertRaises(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)
+      if hasattr(gc, 'get_freeze_count'):
+         self.assertEqual(gc.get_freeze_count(), 0)
+
+   def testSignaledChild(self):
+      res = self._run(['killed'], lambda item: os.kill(os.getpid(), 9) or 0,
+                      workers=1, timeout=10)
+      self.assertNotIsInstance(res, ActionComplete)
+      self.assertIn('1/1 children failed: killed', res.msg)
+
+if __name__ == '__main__':
+   unittest.main()
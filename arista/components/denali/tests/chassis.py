@@ -1,5 +1,9 @@
+import threading
 
+from ....core.config import Config
 from ....core.utils import incrange
+from ....libs import benchmark
+from ....libs.benchmark import Profiler
 
 from ....platforms.chassis.camp import Camp
 from ....platforms.chassis.northface import NorthFace
@@ -15,7 +19,7 @@ from ....platforms.linecard.wolverine import (
 )
 from ....platforms.supervisor.otterlake import OtterLake
 
-from ....tests.testing import unittest
+from ....tests.testing import unittest, patch
 
 class DenaliChassisTest(unittest.TestCase):
    def _buildChassis(self, chassis, supervisors, fabrics, linecards):
@@ -74,5 +78,42 @@ class DenaliChassisTest(unittest.TestCase):
          5: WolverineQCpuBkMs,
       })
 
+class DenaliChassisLoadTest(DenaliChassisTest):
+   def setUp(self):
+      self.collects = None
+      self.saved = benchmark.profiler
+      benchmark.profiler = Profiler()
+      benchmark.profiler.enable()
+
+   def tearDown(self):
+      Config().card_load_workers = 8
+      benchmark.profiler = self.saved
+
+   def _buildChassis(self, chassis, supervisors, fabrics, linecards):
+      with patch('arista.core.modular.gc') as modularGc, \
+           patch('arista.core.card.gc') as cardGc:
+         chassis = super()._buildChassis(chassis, supervisors, fabrics, linecards)
+      cardGc.collect.assert_not_called()
+      self.collects = modularGc.collect.call_count
+      return chassis
+
+   def testLoadedCards(self):
+      chassis = self._buildBasicChassis(Camp, OtterLake, Brooks)
+      self.assertEqual(self.collects, 2)
+      self.assertEqual([type(c) for c in chassis.iterLinecards()],
+                       [Clearwater, ClearwaterMs, Clearwater2, Clearwater2Ms])
+      self.assertEqual([type(c) for c in chassis.iterFabrics()], [Brooks] * 6)
+      spans = [s for s in benchmark.profiler.spans
+               if s.name.startswith('load linecard slot')]
+      self.assertEqual(len(spans), Camp.NUM_LINECARDS)
+      # the slots are loaded by the workers, not by the caller
+      self.assertNotIn(threading.get_native_id(), [s.tid for s in spans])
+
+   def testSerialLoad(self):
+      Config().card_load_workers = 1
+      chassis = self._buildBasicChassis(Camp, OtterLake, Brooks)
+      self.assertEqual(len(list(chassis.iterLinecards())), 4)
+      self.assertEqual(self.collects, 2)
+
 if __name__ == '__main__':
    unittest.main()
@@ -0,0 +1,119 @@
+# NOTE: prebuilt index of the psu models, kept in sync by the psu_models tests
+#       regenerate it from getPsuManager().buildIndex() when adding a model
+
+# class name -> module defining it
+PSU_MODELS = {
+   'AristaPsu': 'arista',
+   'Art700': 'artesyn',
+   'ArtesynPsu': 'artesyn',
+   'CSU500DP': 'artesyn',
+   'DPS1500AB': 'delta',
+   'DPS1600AB': 'delta',
+   'DPS1600CB': 'delta',
+   'DPS1900AB': 'delta',
+   'DPS495CB': 'delta',
+   'DPS500AB': 'delta',
+   'DPS750AB': 'delta',
+   'DS460': 'artesyn',
+   'DS495SPE': 'artesyn',
+   'DS750PED': 'emerson',
+   'DeltaPsu': 'delta',
+   'ECD1502005': 'delta',
+   'ECD16020102': 'delta',
+   'ECD26020037': 'delta',
+   'ECD3000M': 'delta',
+   'EmersonPsu': 'emerson',
+   'Fixed100AC': 'fixed',
+   'Fixed150AC': 'fixed',
+   'FixedPsuModel': 'fixed',
+   'LiteOn2400HV': 'liteon',
+   'LiteonPsu': 'liteon',
+   'PS2102': 'liteon',
+   'PS2242': 'liteon',
+   'Pwr568': 'arista',
+   'Pwr585': 'arista',
+   'Pwr591': 'arista',
+   'Pwr663': 'arista',
+}
+
+# addresses to probe for pmbus psus, in order
+PSU_PMBUS_ADDRS = [0x58, 0x40]
+
+# (manufacturer, part name) -> [(module, class name, pmbus address)]
+PSU_PMBUS_MODELS = {
+   ('arista', 'PWR-00568'): [('arista', 'Pwr568', 0x58)],
+   ('arista', 'PWR-00585'): [('arista', 'Pwr585', 0x58)],
+   ('arista', 'PWR-00586'): [('arista', 'Pwr585', 0x58)],
+   ('arista', 'PWR-00591'): [('arista', 'Pwr591', 0x58)],
+   ('arista', 'PWR-00663'): [('arista', 'Pwr663', 0x58)],
+   ('artesyn', '700-015522-0000'): [('artesyn', 'Art700', 0x40)],
+   ('artesyn', 'CSU500DP-3'): [('artesyn', 'CSU500DP', 0x58)],
+   ('artesyn', 'CSU500DP-3-001'): [('artesyn', 'CSU500DP', 0x58)],
+   ('artesyn', 'DS460'): [('artesyn', 'DS460', 0x58)],
+   ('artesyn', 'DS460S-3'): [('artesyn', 'DS460', 0x58)],
+   ('artesyn', 'DS460S-3-001'): [('artesyn', 'DS460', 0x58)],
+   ('artesyn', 'DS460S-3-002'): [('artesyn', 'DS460', 0x58)],
+   ('artesyn', 'DS460S-3-003'): [('artesyn', 'DS460', 0x58)],
+   ('artesyn', 'DS495SPE-3-401'): [('artesyn', 'DS495SPE', 0x58)],
+   ('artesyn', 'DS495SPE-3-402'): [('artesyn', 'DS495SPE', 0x58)],
+   ('artesyn', 'DS495SPE-3-404'): [('artesyn', 'DS495SPE', 0x58)],
+   ('artesyn', 'DS495SPE-3-405'): [('artesyn', 'DS495SPE', 0x58)],
+   ('delta', 'DPS-1500AB-10 A'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1500AB-7 A'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1500AB-7 B'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1500AB-8 A'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1500AB-8 B'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1500AB-9 A'): [('delta', 'DPS1500AB', 0x58)],
+   ('delta', 'DPS-1600AB-14 A'): [('delta', 'DPS1600AB', 0x58)],
+   ('delta', 'DPS-1600CB N'): [('delta', 'DPS1600CB', 0x58)],
+   ('delta', 'DPS-1600CB P'): [('delta', 'DPS1600CB', 0x58)],
+   ('delta', 'DPS-1900AB A'): [('delta', 'DPS1900AB', 0x58)],
+   ('delta', 'DPS-1900AB-1 A'): [('delta', 'DPS1900AB', 0x58)],
+   ('delta', 'DPS-495CB A'): [('delta', 'DPS495CB', 0x58)],
+   ('delta', 'DPS-495CB C'): [('delta', 'DPS495CB', 0x58)],
+   ('delta', 'DPS-495CB-1 A'): [('delta', 'DPS495CB', 0x58)],
+   ('delta', 'DPS-495CB-1 C'): [('delta', 'DPS495CB', 0x58)],
+   ('delta', 'DPS-500AB-40 A'): [('delta', 'DPS500AB', 0x58)],
+   ('delta', 'DPS-500AB-41 A'): [('delta', 'DPS500AB', 0x58)],
+   ('delta', 'DPS-500AB-42 A'): [('delta', 'DPS500AB', 0x58)],
+   ('delta', 'DPS-500AB-43 A'): [('delta', 'DPS500AB', 0x58)],
+   ('delta', 'DPS-750AB-24 A'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'DPS-750AB-24 B'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'DPS-750AB-24 C'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'DPS-750AB-25 A'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'DPS-750AB-25 B'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'DPS-750AB-25 C'): [('delta', 'DPS750AB', 0x58)],
+   ('delta', 'ECD15020056'): [('delta', 'ECD1502005', 0x58)],
+   ('delta', 'ECD15020057'): [('delta', 'ECD1502005', 0x58)],
+   ('delta', 'ECD16020035'): [('delta', 'ECD3000M', 0x40)],
+   ('delta', 'ECD16020097'): [('delta', 'ECD3000M', 0x40)],
+   ('delta', 'ECD16020102'): [('delta', 'ECD16020102', 0x58)],
+   ('delta', 'ECD26020037'): [('delta', 'ECD26020037', 0x58)],
+   ('delta', 'ECD56020024'): [('delta', 'ECD3000M', 0x40)],
+   ('delta', 'ECD56020026'): [('delta', 'ECD3000M', 0x40)],
+   ('emerson', '700-015522-0000'): [('artesyn', 'Art700', 0x40)],
+   ('emerson', 'CSU500DP-3'): [('artesyn', 'CSU500DP', 0x58)],
+   ('emerson', 'CSU500DP-3-001'): [('artesyn', 'CSU500DP', 0x58)],
+   ('emerson', 'DS460'): [('artesyn', 'DS460', 0x58)],
+   ('emerson', 'DS460S-3'): [('artesyn', 'DS460', 0x58)],
+   ('emerson', 'DS460S-3-001'): [('artesyn', 'DS460', 0x58)],
+   ('emerson', 'DS460S-3-002'): [('artesyn', 'DS460', 0x58)],
+   ('emerson', 'DS460S-3-003'): [('artesyn', 'DS460', 0x58)],
+   ('emerson', 'DS495SPE-3-401'): [('artesyn', 'DS495SPE', 0x58)],
+   ('emerson', 'DS495SPE-3-402'): [('artesyn', 'DS495SPE', 0x58)],
+   ('emerson', 'DS495SPE-3-404'): [('artesyn', 'DS495SPE', 0x58)],
+   ('emerson', 'DS495SPE-3-405'): [('artesyn', 'DS495SPE', 0x58)],
+   ('emerson', 'DS750PED-3'): [('emerson', 'DS750PED', 0x58)],
+   ('emerson', 'DS750PED-3-001'): [('emerson', 'DS750PED', 0x58)],
+   ('emerson', 'DS750PED-3-402'): [('emerson', 'DS750PED', 0x58)],
+   ('emerson', 'DS750PED-3-403'): [('emerson', 'DS750PED', 0x58)],
+   ('liteon power', 'DD-2102-1A'): [('liteon', 'PS2102', 0x58)],
+   ('liteon power', 'DD-2102-1AR'): [('liteon', 'PS2102', 0x58)],
+   ('liteon power', 'DD-2242-3A'): [('liteon', 'PS2242', 0x58)],
+   ('liteon power', 'DD-2242-3AR'): [('liteon', 'PS2242', 0x58)],
+   ('liteon power', 'PS-2102-1A'): [('liteon', 'PS2102', 0x58)],
+   ('liteon power', 'PS-2102-1AR'): [('liteon', 'PS2102', 0x58)],
+   ('liteon power', 'PS-2242-3A'): [('liteon', 'PS2242', 0x58)],
+   ('liteon power', 'PS-2242-3AR'): [('liteon', 'PS2242', 0x58)],
+   ('liteon power', 'PS-2242-9A'): [('liteon', 'LiteOn2400HV', 0x58)],
+}
@@ -15,7 +15,7 @@ from ..core.utils import (
    FileWaiter,
    incrange,
    inSimulation,
-   MmapResource,
+   SharedMmapResource,
    simulateWith,
    writeConfig
 )
@@ -193,7 +193,7 @@ class Scd(PciComponent):
       ]
       self.driver = drivers[1]
       self.smbusMasters = OrderedDict()
-      self.mmapReady = False
+      self.mmap_ = None
       self.interrupts = []
       self.fanGroups = []
       self.leds = []
@@ -243,16 +243,20 @@ class Scd(PciComponent):
       return interrupt
 
    def getMmap(self):
-      path = os.path.join(self.addr.getSysfsPath(), "resource0")
-      if not self.mmapReady:
+      if self.mmap_ is None:
+         path = os.path.join(self.addr.getSysfsPath(), "resource0")
          # check that the scd driver is loaded the first time
          drv = self.drivers['scd']
          if not drv.loaded():
             # This codepath is unlikely to be used
             drv.setup()
             FileWaiter(path, 5).waitFileReady()
-         self.mmapReady = True
-      return MmapResource(path)
+         self.mmap_ = SharedMmapResource(path)
+      return self.mmap_
+
+   def invalidateMmap(self):
+      if self.mmap_ is not None:
+         self.mmap_.invalidate()
 
    def getVersion(self):
       if inSimulation():
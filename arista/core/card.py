@@ -74,18 +74,22 @@ class Card(Sku):
       return self.CPU_CLS is not None
 
    def setup(self, filters=Priority.defaultFilter):
+      self.preloadModules(filters)
       super(Card, self).setup()
       super(Card, self).finish(filters=filters)
 
    def setupStandby(self, filters=Priority.defaultFilter):
+      self.standby.preloadModules(filters)
       self.standby.setup()
       self.standby.finish(filters)
 
    def setupControlPlane(self, filters=Priority.defaultFilter):
+      self.control.preloadModules(filters)
       self.control.setup()
       self.control.finish(filters)
 
    def setupMain(self, filters=Priority.defaultFilter):
+      self.main.preloadModules(filters)
       self.main.setup()
       self.main.finish(filters)
 
@@ -120,12 +124,13 @@ class CardSlot(SlotComponent):
    def enablePciPort(self):
       self.pci.enable()
 
-   def unloadCard(self):
+   def unloadCard(self, collect=True):
       self.card.detach()
       self.card = None
-      gc.collect()
+      if collect:
+         gc.collect()
 
-   def loadCard(self, card=None, **kwargs):
+   def loadCard(self, card=None, collect=True, **kwargs):
       if card is None:
          assert self.card, "No default card definition loaded"
          if not self.getPresence():
@@ -150,7 +155,7 @@ class CardSlot(SlotComponent):
 
       if self.card is not None:
          # Cleanup existing card definition
-         self.unloadCard()
+         self.unloadCard(collect=collect)
 
       self.card = card
       self.card.refresh()
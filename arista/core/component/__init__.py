@@ -1,8 +1,14 @@
 from collections import OrderedDict
 
 from ..config import Config
+from ..driver import modprobeAll
+from ..i2c_utils import getI2cExecutor
 from ..inventory import Inventory
 
+from .graph import ComponentSetupGraph
+
+from ...libs.benchmark import profile
+
 DEFAULT_WAIT_TIMEOUT = 15
 
 class Priority(object):
@@ -100,17 +106,45 @@ class Component(object):
 
    def setup(self):
       for driver in self.drivers.values():
-         driver.setup()
+         with profile('setup %s', driver):
+            driver.setup()
       for driver in self.drivers.values():
-         driver.finish()
+         with profile('finish %s', driver):
+            driver.finish()
 
    def finish(self, filters=Priority.defaultFilter):
       # underlying component are initialized recursively but require the parent to
       # be fully initialized
+      workers = int(Config().component_setup_workers)
+      if workers > 1 and not ComponentSetupGraph.inWorker():
+         ComponentSetupGraph(self, filters, workers).run()
+         return
       for component in self.iterComponents(filters, recursive=False):
-         component.setup()
+         with profile('setup %s', component):
+            component.setup()
       for component in self.iterComponents(recursive=False):
          component.finish(filters)
+      self.finalize()
+
+   def iterSetupComponents(self, filters=Priority.defaultFilter):
+      '''Components setup by finish(filters), in the serial order'''
+      for component in self.iterComponents(filters, recursive=False):
+         yield component
+      for component in self.iterComponents(recursive=False):
+         for sub in component.iterSetupComponents(filters):
+            yield sub
+
+   def preloadModules(self, filters=Priority.defaultFilter):
+      '''Load the kernel modules needed to setup this component and the ones
+      setup by finish(filters) with a single modprobe'''
+      modules = []
+      for component in [self] + list(self.iterSetupComponents(filters)):
+         for driver in component.drivers.values():
+            modules.extend(driver.getPreloadModules())
+      modprobeAll(modules)
+
+   def finalize(self):
+      '''Called once the component and all its children are setup'''
 
    def refresh(self):
       for component in self.components:
@@ -172,8 +206,9 @@ class Component(object):
          ctx.inventories.add(self.inventory)
 
       if ctx.recursive:
-         output["components"] = [c.genDiag(ctx) for c in
-                         self.iterComponents(filters=None, recursive=False)]
+         output["components"] = getI2cExecutor().map(
+            lambda c: c.genDiag(ctx),
+            self.iterComponents(filters=None, recursive=False))
       return output
 
 class PciComponent(Component):
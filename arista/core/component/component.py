@@ -106,8 +106,8 @@ class Component(LegacyComponent):
       powerCycle = self.driver.getPowerCycle(desc, **kwargs)
       return self.inventory.addPowerCycle(powerCycle)
 
-   def finish(self, filters=Priority.defaultFilter):
-      super(Component, self).finish(filters=filters)
+   def finalize(self):
+      super(Component, self).finalize()
       if Config().write_hw_thresholds:
          for ts in self._tempSensorsWorkaround:
             try:
@@ -0,0 +1,112 @@
+import contextvars
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..log import getLogger
+
+from ...libs.benchmark import profile
+
+logging = getLogger(__name__)
+
+class ComponentSetupGraph(object):
+   '''Setup the components below a root concurrently
+
+   The component tree is the dependency graph: a component is only setup once
+   its parent is, and its own children are only visited after that. Distinct
+   subtrees do not depend on each other and are handled by a bounded pool of
+   workers. Which components are setup and which ones are visited is the same
+   as for the serial Component.finish, finalize() is called on every visited
+   component once all of its subtree is done.
+   '''
+
+   local = threading.local()
+
+   def __init__(self, root, filters, workers):
+      self.root = root
+      self.filters = filters
+      self.workers = workers
+      self.lock = threading.Lock()
+      self.pending = {}
+      self.errors = []
+      self.done = threading.Event()
+      self.pool = None
+
+   @classmethod
+   def inWorker(cls):
+      return getattr(cls.local, 'worker', False)
+
+   def _initWorker(self):
+      self.local.worker = True
+
+   def run(self):
+      with ThreadPoolExecutor(max_workers=self.workers,
+                              thread_name_prefix='setup',
+                              initializer=self._initWorker) as pool:
+         self.pool = pool
+         self._visit(self.root, None)
+         self.done.wait()
+      if self.errors:
+         raise self.errors[0]
+
+   def _failed(self, component, action, error):
+      logging.error('%s: %s failed: %s', component, action, error)
+      with self.lock:
+         self.errors.append(error)
+
+   def _submit(self, component, parent, setup, visit):
+      # NOTE: tasks run within a copy of the context of the parent so that
+      #       their profiling spans are nested like in the serial setup
+      context = contextvars.copy_context()
+      self.pool.submit(context.run, self._run, component, parent, setup, visit)
+
+   def _run(self, component, parent, setup, visit):
+      if setup and not self.errors:
+         try:
+            with profile('setup %s', component):
+               component.setup()
+         except Exception as e: # pylint: disable=broad-except
+            self._failed(component, 'setup', e)
+      if visit:
+         self._visit(component, parent)
+      else:
+         self._childDone(parent)
+
+   def _visit(self, component, parent):
+      children = []
+      if not self.errors:
+         try:
+            setups = list(component.iterComponents(self.filters,
+                                                   recursive=False))
+            visits = list(component.iterComponents(recursive=False))
+            children = [(c, True, c in visits) for c in setups] + \
+                       [(c, False, True) for c in visits if c not in setups]
+         except Exception as e: # pylint: disable=broad-except
+            self._failed(component, 'visit', e)
+      if not children:
+         self._finalize(component, parent)
+         return
+      with self.lock:
+         self.pending[component] = [len(children), parent]
+      for child, setup, visit in children:
+         self._submit(child, component, setup, visit)
+
+   def _childDone(self, component):
+      with self.lock:
+         pending = self.pending[component]
+         pending[0] -= 1
+         if pending[0]:
+            return
+         del self.pending[component]
+      self._finalize(component, pending[1])
+
+   def _finalize(self, component, parent):
+      if not self.errors:
+         try:
+            component.finalize()
+         except Exception as e: # pylint: disable=broad-except
+            self._failed(component, 'finalize', e)
+      if parent is None:
+         self.done.set()
+      else:
+         self._childDone(parent)
@@ -30,6 +30,10 @@ class Config():
          cls.instance_.linecard_standby_only = True
          cls.instance_.linecard_cpu_enable = False
          cls.instance_.power_off_linecard_on_reboot = True
+         cls.instance_.linecard_power_on_budget = 4
+         cls.instance_.card_load_workers = 8
+         cls.instance_.fork_workers = 8
+         cls.instance_.fork_timeout = 600
          cls.instance_.power_off_fabric_on_reboot = False
          cls.instance_.write_hw_thresholds = True
          cls.instance_.report_hw_thresholds = False
@@ -47,6 +51,7 @@ class Config():
          cls.instance_.api_rpc_host = '127.0.0.1'
          cls.instance_.api_rpc_port = '12322'
          cls.instance_.api_linecard_reboot_graceful = False
+         cls.instance_.api_rpc_batch_timeout = 60
          cls.instance_.cooling_data_points = 10
          cls.instance_.cooling_export_path = None
          cls.instance_.cooling_max_decrease = 10
@@ -57,6 +62,13 @@ class Config():
          cls.instance_.cooling_target_factor = 0.8
          cls.instance_.cooling_gc_count = 15
          cls.instance_.cooling_xcvrs_via_api = False
+         cls.instance_.sysfs_fd_cache = False
+         cls.instance_.sysfs_fd_cache_size = 256
+         cls.instance_.hwmon_snapshot_ttl = 0
+         cls.instance_.i2c_bus_idle_timeout = 5
+         cls.instance_.i2c_executor_workers = 0
+         cls.instance_.psu_identity_cache = True
+         cls.instance_.component_setup_workers = 0
          cls.instance_._parseConfig()
          cls.instance_._parseCmdline()
       return cls.instance_
@@ -5,6 +5,7 @@ from collections import deque
 from ..libs.python import monotonicRaw
 
 from .config import Config
+from .i2c_utils import getI2cExecutor
 from .log import getLogger
 from .utils import inSimulation
 
@@ -192,10 +193,8 @@ class CoolingZone(object):
       self.initialized = True
 
    def update(self):
-      for f in self.fans.values():
-         f.update()
-      for t in self.thermals.values():
-         t.update()
+      items = list(self.fans.values()) + list(self.thermals.values())
+      getI2cExecutor().map(lambda item: item.update(), items)
 
    @property
    def lastSpeed(self):
@@ -1,6 +1,9 @@
 
 import os
 import subprocess
+import threading
+
+from collections import OrderedDict
 
 from .. import utils
 from ..utils import FileWaiter, inDebug, inSimulation
@@ -8,17 +11,96 @@ from ..log import getLogger
 
 logging = getLogger(__name__)
 
+def moduleName(name):
+   return name.replace('-', '_')
+
+class KernelModules(object):
+   '''Set of the loaded kernel modules
+
+   /proc/modules is read once and only read again after modules were loaded or
+   unloaded, as dependencies could have been loaded too. In simulation the set
+   only tracks what was loaded by this process.
+   '''
+   def __init__(self, path='/proc/modules'):
+      self.path = path
+      self.lock = threading.Lock()
+      self.modules = None
+
+   def _read(self):
+      if inSimulation():
+         return set()
+      with open(self.path) as f:
+         return set(line.split(' ', 1)[0] for line in f)
+
+   def getLoaded(self):
+      with self.lock:
+         if self.modules is None:
+            self.modules = self._read()
+         return self.modules
+
+   def isLoaded(self, name):
+      return moduleName(name) in self.getLoaded()
+
+   def changed(self, loaded=None, unloaded=None):
+      with self.lock:
+         if self.modules is None:
+            return
+         if not inSimulation():
+            self.modules = None
+            return
+         self.modules.update(moduleName(name) for name in loaded or [])
+         self.modules.difference_update(moduleName(name) for name in unloaded or [])
+
+kernelModules = None
+
+def getKernelModules():
+   global kernelModules
+   if kernelModules is None:
+      kernelModules = KernelModules()
+   return kernelModules
+
 def modprobe(name, args=None):
    logging.debug('loading module %s', name)
    if args is None:
       args = []
-   args = ['modprobe', name.replace('-', '_')] + args
+   args = ['modprobe', moduleName(name)] + args
    if inDebug():
       args += ['dyndbg=+pf']
-   if inSimulation():
-      logging.debug('exec: %s', ' '.join(args))
-   else:
-      subprocess.check_call(args)
+   try:
+      if inSimulation():
+         logging.debug('exec: %s', ' '.join(args))
+      else:
+         subprocess.check_call(args)
+   finally:
+      getKernelModules().changed(loaded=[name])
+
+def modprobeAll(names):
+   '''Load the modules not loaded yet with a single modprobe invocation
+
+   Only modules without arguments can be loaded this way. A failure is only
+   logged, the drivers load their module again on setup and report the error.
+   '''
+   modules = getKernelModules()
+   names = [name for name in OrderedDict.fromkeys(moduleName(n) for n in names)
+            if not modules.isLoaded(name)]
+   if not names:
+      return
+   if inDebug():
+      # NOTE: modprobe -a does not take module parameters like dyndbg
+      for name in names:
+         modprobe(name)
+      return
+   logging.debug('loading modules %s', ' '.join(names))
+   args = ['modprobe', '-a'] + names
+   try:
+      if inSimulation():
+         logging.debug('exec: %s', ' '.join(args))
+      else:
+         subprocess.check_call(args)
+   except (OSError, subprocess.CalledProcessError) as e:
+      logging.warning('failed to load modules %s: %s', ' '.join(names), e)
+   finally:
+      modules.changed(loaded=names)
 
 def deviceListForModule(name):
    devices = []
@@ -44,22 +126,17 @@ def deviceListForModule(name):
 
 def rmmod(name):
    logging.debug('unloading module %s', name)
-   args = ['modprobe', '-r', name.replace('-', '_')]
-   if inSimulation():
-      logging.debug('exec: %s', ' '.join(args))
-   else:
-      subprocess.check_call(args)
+   args = ['modprobe', '-r', moduleName(name)]
+   try:
+      if inSimulation():
+         logging.debug('exec: %s', ' '.join(args))
+      else:
+         subprocess.check_call(args)
+   finally:
+      getKernelModules().changed(unloaded=[name])
 
 def isModuleLoaded(name):
-   if inSimulation():
-      return False
-
-   with open('/proc/modules') as f:
-      start = '%s ' % name.replace('-', '_')
-      for line in f.readlines():
-         if line.startswith(start):
-            return True
-   return False
+   return getKernelModules().isLoaded(name)
 
 class Driver(object):
    def __init__(self, **kwargs):
@@ -68,6 +145,10 @@ class Driver(object):
    def setup(self):
       pass
 
+   def getPreloadModules(self):
+      '''Kernel modules loaded by setup() that can be loaded ahead of time'''
+      return []
+
    def finish(self):
       pass
 
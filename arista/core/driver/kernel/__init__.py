@@ -8,6 +8,7 @@ from .. import (
    modprobe,
    rmmod,
 )
+from ...config import Config
 from ...log import getLogger
 from ...utils import inSimulation
 from .. import utils
@@ -16,11 +17,13 @@ from ....libs.retry import tryGet
 
 from .sysfs import (
    FanSysfsImpl,
+   HwmonSnapshot,
    GpioSysfsImpl,
    LedSysfsImpl,
    RailSysfsImpl,
    ResetSysfsImpl,
    TempSysfsImpl,
+   getSysfsFdCache,
 )
 
 logging = getLogger(__name__)
@@ -37,6 +40,8 @@ class KernelDriver(Driver):
       self.margs = margs if margs is not None else self.ARGS
       self.module = module or self.MODULE
       self.hwmonPath = None
+      self.hwmonGeneration = 0
+      self.hwmonSnapshot = None
 
    def __str__(self):
       return '%s(module=%s)' % (self.__class__.__name__, self.module)
@@ -47,6 +52,11 @@ class KernelDriver(Driver):
       if not self.loaded():
          modprobe(self.module, self.margs)
 
+   def getPreloadModules(self):
+      if self.PASSIVE or not self.module or self.margs:
+         return []
+      return [self.module]
+
    def clean(self):
       if self.PASSIVE:
          return
@@ -66,6 +76,17 @@ class KernelDriver(Driver):
       except Exception as e: # pylint: disable=broad-except
          logging.error('Failed to unload %s: %s', self.module, e)
 
+   def refresh(self):
+      oldPath = self.hwmonPath
+      if oldPath is None:
+         return
+      self.hwmonPath = None
+      if self.getHwmonPath() != oldPath:
+         logging.debug('%s: hwmon path changed from %s to %s',
+                       self, oldPath, self.hwmonPath)
+         getSysfsFdCache().invalidatePrefix(oldPath)
+         self.hwmonGeneration += 1
+
    def loaded(self):
       return isModuleLoaded(self.module)
 
@@ -79,6 +100,15 @@ class KernelDriver(Driver):
          self.hwmonPath = utils.locateHwmonFolder(self.getSysfsPath())
       return self.hwmonPath
 
+   def getHwmonSnapshot(self):
+      ttl = Config().hwmon_snapshot_ttl
+      if not ttl or inSimulation():
+         return None
+      path = self.getHwmonPath()
+      if self.hwmonSnapshot is None or self.hwmonSnapshot.path != path:
+         self.hwmonSnapshot = HwmonSnapshot(path, float(ttl))
+      return self.hwmonSnapshot
+
    def getHwmonEntry(self, entry):
       return os.path.join(self.getHwmonPath(), entry)
 
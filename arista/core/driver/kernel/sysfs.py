@@ -1,5 +1,9 @@
 
 import os
+import threading
+import time
+
+from collections import OrderedDict
 
 from ... import utils
 from ...config import Config
@@ -24,6 +28,229 @@ from ....inventory.temp import Temp
 
 logging = getLogger(__name__)
 
+class SysfsCachedFd(object):
+   def __init__(self, path, fd):
+      self.path = path
+      self.fd = fd
+      self.users = 0
+      self.evicted = False
+
+   def close(self):
+      try:
+         os.close(self.fd)
+      except OSError:
+         pass
+
+class SysfsFdCache(object):
+   '''Keep sysfs attributes open across accesses
+
+   sysfs attributes can be read again from offset 0 with pread to get a fresh
+   value, which saves an open/close pair on every access.
+   The number of descriptors kept open is bounded using an LRU policy.
+   '''
+   def __init__(self, maxFds=256, enabled=True):
+      self.maxFds = maxFds
+      self.enabled = enabled
+      self.fds = OrderedDict()
+      self.lock = threading.Lock()
+      self.hits = 0
+      self.misses = 0
+      self.evictions = 0
+      self.syscallsSaved = 0
+
+   def __len__(self):
+      return len(self.fds)
+
+   def _evict(self, key):
+      cached = self.fds.pop(key)
+      cached.evicted = True
+      self.evictions += 1
+      if not cached.users:
+         cached.close()
+
+   def acquire(self, path, flags):
+      key = (path, flags)
+      with self.lock:
+         cached = self.fds.get(key)
+         if cached is not None:
+            self.fds.move_to_end(key)
+            cached.users += 1
+            self.hits += 1
+            # open and close
+            self.syscallsSaved += 2
+            return cached
+      fd = os.open(path, flags)
+      with self.lock:
+         self.misses += 1
+         cached = self.fds.get(key)
+         if cached is not None:
+            # another thread opened it in the meantime
+            os.close(fd)
+            self.fds.move_to_end(key)
+         else:
+            cached = SysfsCachedFd(path, fd)
+            self.fds[key] = cached
+            while len(self.fds) > self.maxFds:
+               self._evict(next(iter(self.fds)))
+         cached.users += 1
+         return cached
+
+   def release(self, cached):
+      with self.lock:
+         cached.users -= 1
+         if cached.evicted and not cached.users:
+            cached.close()
+
+   def contains(self, path):
+      with self.lock:
+         return (path, os.O_RDONLY) in self.fds or \
+                (path, os.O_WRONLY) in self.fds
+
+   def exists(self, path):
+      '''Whether path exists, its descriptors are dropped when it does not
+
+      NOTE: a cached descriptor outlives the removal of its attribute, e.g.
+            when the driver is unbound, so it does not prove that the path
+            still exists.
+      '''
+      if os.path.exists(path):
+         return True
+      self.invalidate(path)
+      return False
+
+   def invalidate(self, path):
+      with self.lock:
+         for key in [k for k in self.fds if k[0] == path]:
+            self._evict(key)
+
+   def invalidatePrefix(self, prefix):
+      prefix = os.path.join(prefix, '')
+      with self.lock:
+         for key in [k for k in self.fds if k[0].startswith(prefix)]:
+            self._evict(key)
+
+   def clear(self):
+      with self.lock:
+         for key in list(self.fds):
+            self._evict(key)
+
+   def read(self, path, size=4096):
+      cached = self.acquire(path, os.O_RDONLY)
+      try:
+         return os.pread(cached.fd, size, 0).decode()
+      except OSError:
+         self.invalidate(path)
+         raise
+      finally:
+         self.release(cached)
+
+   def write(self, path, value):
+      cached = self.acquire(path, os.O_WRONLY)
+      try:
+         os.pwrite(cached.fd, value.encode(), 0)
+      except OSError:
+         self.invalidate(path)
+         raise
+      finally:
+         self.release(cached)
+
+   def stats(self):
+      return {
+         'enabled': self.enabled,
+         'open': len(self.fds),
+         'maxFds': self.maxFds,
+         'hits': self.hits,
+         'misses': self.misses,
+         'evictions': self.evictions,
+         'syscallsSaved': self.syscallsSaved,
+      }
+
+_sysfsFdCache = None
+def getSysfsFdCache():
+   global _sysfsFdCache
+   if _sysfsFdCache is None:
+      config = Config()
+      _sysfsFdCache = SysfsFdCache(maxFds=config.sysfs_fd_cache_size,
+                                   enabled=config.sysfs_fd_cache)
+   return _sysfsFdCache
+
+class HwmonSnapshot(object):
+   '''Serve the attributes of a hwmon device from memory
+
+   The directory listing and the value of every attribute accessed so far are
+   read in a single pass and kept for ttl seconds. Concurrent callers share
+   the same refresh.
+   '''
+   def __init__(self, path, ttl):
+      self.path = path
+      self.ttl = ttl
+      self.lock = threading.Lock()
+      self.attributes = set()
+      self.entries = set()
+      self.values = {}
+      self.timestamp = None
+      self.refreshCount = 0
+
+   def __str__(self):
+      return '%s(path=%s, ttl=%s)' % (self.__class__.__name__, self.path, self.ttl)
+
+   def isFresh(self):
+      return self.timestamp is not None and \
+             time.monotonic() - self.timestamp < self.ttl
+
+   def _readAttribute(self, name):
+      path = os.path.join(self.path, name)
+      try:
+         cache = getSysfsFdCache()
+         if cache.enabled:
+            return cache.read(path)
+         with open(path, 'r') as f:
+            return f.read()
+      except (IOError, UnicodeDecodeError):
+         return None
+
+   def _refresh(self):
+      try:
+         entries = set(os.listdir(self.path))
+      except OSError:
+         entries = set()
+      values = {}
+      for name in self.attributes & entries:
+         values[name] = self._readAttribute(name)
+      self.entries = entries
+      self.values = values
+      self.timestamp = time.monotonic()
+      self.refreshCount += 1
+      logging.io('%s: refreshed %d attributes', self, len(values))
+
+   def _ensureFresh(self):
+      if self.isFresh():
+         return
+      with self.lock:
+         if not self.isFresh():
+            self._refresh()
+
+   def exists(self, name):
+      self._ensureFresh()
+      return name in self.entries
+
+   def read(self, name):
+      self._ensureFresh()
+      if name not in self.attributes:
+         with self.lock:
+            self.attributes.add(name)
+            if name in self.entries:
+               self.values[name] = self._readAttribute(name)
+      return self.values.get(name)
+
+   def invalidate(self, name=None):
+      with self.lock:
+         if name is None:
+            self.timestamp = None
+         else:
+            self.values.pop(name, None)
+            self.attributes.discard(name)
+
 class SysfsEntry(object):
    def __init__(self, parent, name, prefix=None, pathCallback=None):
       self.parent = parent
@@ -31,8 +258,10 @@ class SysfsEntry(object):
       self.baseName = name
       self.name_ = None
       self.prefix_ = prefix
+      self.inHwmon = pathCallback is None
       self.pathCallback = pathCallback or self.driver.getHwmonEntry
       self.entryPath_ = None
+      self.generation_ = None
 
    def __str__(self):
       return '%s(path=%s)' % (self.__class__.__name__, self.entryPath)
@@ -53,13 +282,30 @@ class SysfsEntry(object):
 
    @property
    def entryPath(self):
-      if self.entryPath_ is None:
+      generation = getattr(self.driver, 'hwmonGeneration', None)
+      if self.entryPath_ is None or self.generation_ != generation:
          self.entryPath_ = self.pathCallback(self.name)
+         self.generation_ = generation
       return self.entryPath_
 
+   def getSnapshot(self):
+      if not self.inHwmon:
+         return None
+      getHwmonSnapshot = getattr(self.driver, 'getHwmonSnapshot', None)
+      if getHwmonSnapshot is None:
+         return None
+      return getHwmonSnapshot()
+
    def exists(self):
       try:
-         return os.path.exists(self.entryPath)
+         snapshot = self.getSnapshot()
+         if snapshot is not None:
+            return snapshot.exists(self.name)
+         path = self.entryPath
+         cache = getSysfsFdCache()
+         if cache.enabled:
+            return cache.exists(path)
+         return os.path.exists(path)
       except FileNotFoundError:
          return False
 
@@ -73,6 +319,14 @@ class SysfsEntry(object):
       if utils.inSimulation():
          return '1'
       try:
+         snapshot = self.getSnapshot()
+         if snapshot is not None:
+            value = snapshot.read(self.name)
+            if value is not None:
+               return value
+         cache = getSysfsFdCache()
+         if cache.enabled:
+            return cache.read(self.entryPath)
          with open(self.entryPath, 'r') as f:
             return f.read()
       except IOError:
@@ -83,6 +337,10 @@ class SysfsEntry(object):
       if utils.inSimulation():
          return True
       try:
+         cache = getSysfsFdCache()
+         if cache.enabled:
+            cache.write(self.entryPath, value)
+            return True
          with open(self.entryPath, 'w') as f:
             f.write(value)
       except Exception: # pylint: disable=broad-except
@@ -99,6 +357,9 @@ class SysfsEntry(object):
    def write(self, value):
       raw = self._writeConversion(value)
       logging.io('%s.write(%s) -> %s', self, value, raw)
+      snapshot = self.getSnapshot()
+      if snapshot is not None:
+         snapshot.invalidate(self.name)
       return self._write(raw)
 
 class SysfsEntryInt(SysfsEntry):
@@ -1,17 +1,54 @@
 
-from contextlib import closing
-
 from .gpio import GpioFuncImpl
 
-from ... import utils
 from ...log import getLogger
-from ...i2c_utils import I2cMsg
-from ...utils import SMBus
+from ...i2c_utils import I2cPooledBus, I2cPooledMsg, getI2cBusPool
 
 from . import UserDriver
 
 logging = getLogger(__name__)
 
+class I2cDevBatch(object):
+   '''Batch of transfers to the device of an I2cDevDriver
+
+   Each method queues a transfer and returns it, its result is available after
+   submit() which also returns all the results in order.
+   '''
+   def __init__(self, driver):
+      self.address = driver.addr.address
+      self.batch = driver.msg.batch()
+
+   def __len__(self):
+      return len(self.batch)
+
+   def read_byte_data(self, reg):
+      return self.batch.read_bytes(self.address, [reg], 1,
+                                   convert=lambda data: data[0])
+
+   def write_byte_data(self, reg, data):
+      return self.batch.write_bytes(self.address, [reg, data])
+
+   def read_word_data(self, reg):
+      return self.batch.read_bytes(self.address, [reg], 2,
+                                   convert=lambda data: data[0] | data[1] << 8)
+
+   def write_word_data(self, reg, data):
+      return self.batch.write_bytes(self.address,
+                                    [reg, data & 0xff, (data >> 8) & 0xff])
+
+   def read_block_data(self, reg):
+      return self.batch.read_block(self.address, [reg],
+                                   convert=lambda data: data[1:data[0] + 1])
+
+   def read_bytes(self, cmd, datalen):
+      return self.batch.read_bytes(self.address, cmd, datalen)
+
+   def write_bytes(self, cmd):
+      return self.batch.write_bytes(self.address, cmd)
+
+   def submit(self):
+      return self.batch.submit()
+
 class I2cDevDriver(UserDriver):
 
    REGISTER_CLS = None
@@ -36,14 +73,17 @@ class I2cDevDriver(UserDriver):
    @property
    def bus(self):
       if self.bus_ is None:
-         self.bus_ = utils.SMBus(self.addr.bus)
+         self.bus_ = I2cPooledBus(getI2cBusPool(), self.addr.bus)
       return self.bus_
 
+   def busTransaction(self):
+      '''Hold the bus for a sequence of SMBus operations'''
+      return getI2cBusPool().transaction(self.addr.bus)
+
    @property
    def msg(self):
       if self.msg_ is None:
-         self.msg_ = I2cMsg(self.addr)
-         self.msg_.open()
+         self.msg_ = I2cPooledMsg(getI2cBusPool(), self.addr.bus)
       return self.msg_
 
    def __enter__(self):
@@ -53,16 +93,12 @@ class I2cDevDriver(UserDriver):
       self.close()
 
    def close(self):
-      if self.bus_ is not None:
-         self.bus_.close()
-         self.bus_ = None
-      if self.msg_ is not None:
-         self.msg_.close()
-         self.msg_ = None
+      self.bus_ = None
+      self.msg_ = None
 
    def smbusPing(self):
       try:
-         with closing(SMBus(self.addr.bus)) as bus:
+         with self.busTransaction() as bus:
             bus.read_byte(self.addr.address)
       except IOError:
          return False
@@ -110,6 +146,9 @@ class I2cDevDriver(UserDriver):
    def write_bytes(self, cmd):
       return self.msg.write_bytes(self.addr.address, cmd)
 
+   def batch(self):
+      return I2cDevBatch(self)
+
    def read(self, reg):
       res = self.read_byte_data(reg)
       if res is None:
@@ -119,6 +158,13 @@ class I2cDevDriver(UserDriver):
    def write(self, reg, data):
       return self.write_byte_data(reg, data)
 
+   def readRange(self, reg, count):
+      data = []
+      while len(data) < count:
+         length = min(count - len(data), 32)
+         data.extend(self.read_i2c_block_data(reg + len(data), length))
+      return data[:count]
+
    def getGpio(self, attr, name=None):
       assert self.regs
       func = getattr(self.regs, attr)
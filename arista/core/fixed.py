@@ -19,6 +19,7 @@ class FixedSystem(Sku):
       return MetaInventory(self.iterInventory())
 
    def setup(self, filters=Priority.defaultFilter):
+      self.preloadModules(filters)
       super(FixedSystem, self).setup()
       super(FixedSystem, self).finish(filters)
 
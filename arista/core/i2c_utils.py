@@ -7,8 +7,18 @@ from ctypes import \
    sizeof, \
    cast, \
    pointer
+from concurrent.futures import Future
+from contextlib import contextmanager
+from errno import EINVAL, EOPNOTSUPP
 from fcntl import ioctl
+import queue
+import threading
+import time
+
+from . import utils
+from .config import Config
 from .log import getLogger
+from .types import I2cAddr
 
 logging = getLogger(__name__)
 
@@ -16,6 +26,7 @@ I2C_M_RD = 0x0001
 I2C_M_RECV_LEN = 0x0400
 
 I2C_RDWR = 0x0707
+I2C_RDWR_IOCTL_MAX_MSGS = 42
 
 I2C_SMBUS_BLOCK_MAX = 32
 
@@ -78,6 +89,11 @@ class i2c_rdwr_ioctl_data(Structure):
       )
       return cls(msg_data, 2)
 
+   @classmethod
+   def from_msgs(cls, msgs):
+      msg_data = (i2c_msg * len(msgs))(*msgs)
+      return cls(msg_data, len(msgs))
+
    def __str__(self):
       return "%s(%s)" % (
          self.__class__.__name__,
@@ -86,10 +102,94 @@ class i2c_rdwr_ioctl_data(Structure):
    def __repr__(self):
       return str(self)
 
+class I2cTransfer(object):
+   '''Write followed by an optional read, as queued in an I2cBatch'''
+   def __init__(self, addr, cmd, datalen=0, block=False, convert=None):
+      self.addr = addr
+      self.wrbuf = (c_uint8 * len(cmd))(*cmd) if cmd else None
+      self.rdbuf = None
+      self.rdflags = I2C_M_RD
+      if block:
+         self.rdbuf = (c_uint8 * (1 + I2C_SMBUS_BLOCK_MAX))( 1 )
+         self.rdflags |= I2C_M_RECV_LEN
+      elif datalen:
+         self.rdbuf = (c_uint8 * datalen)()
+      self.convert = convert
+      self.result = None
+      self.count = (self.wrbuf is not None) + (self.rdbuf is not None)
+
+   def messages(self):
+      msgs = []
+      if self.wrbuf is not None:
+         msgs.append(i2c_msg(self.addr, 0, sizeof(self.wrbuf),
+                             cast(self.wrbuf, POINTER(c_uint8))))
+      if self.rdbuf is not None:
+         msgs.append(i2c_msg(self.addr, self.rdflags, sizeof(self.rdbuf),
+                             cast(self.rdbuf, POINTER(c_uint8))))
+      return msgs
+
+   def complete(self, msgs):
+      if self.rdbuf is None:
+         return
+      # NOTE: the kernel updates the length of I2C_M_RECV_LEN messages
+      data = [self.rdbuf[i] for i in range(msgs[-1].len)]
+      self.result = self.convert(data) if self.convert else data
+
+class I2cBatch(object):
+   '''Queue transfers to be sent using as few I2C_RDWR ioctls as possible
+
+   All the messages of a batch are sent with repeated starts in between,
+   transfers that need a stop condition to take effect should not be batched.
+   '''
+   def __init__(self, msg, maxMsgs=I2C_RDWR_IOCTL_MAX_MSGS):
+      self.msg = msg
+      self.maxMsgs = maxMsgs
+      self.transfers = []
+
+   def __len__(self):
+      return len(self.transfers)
+
+   def queue(self, transfer):
+      self.transfers.append(transfer)
+      return transfer
+
+   def write_bytes(self, addr, cmd):
+      return self.queue(I2cTransfer(addr, cmd))
+
+   def read_bytes(self, addr, cmd, datalen, convert=None):
+      return self.queue(I2cTransfer(addr, cmd, datalen, convert=convert))
+
+   def read_block(self, addr, cmd, convert=None):
+      return self.queue(I2cTransfer(addr, cmd, block=True, convert=convert))
+
+   def chunks(self):
+      chunk = []
+      count = 0
+      for transfer in self.transfers:
+         size = transfer.count
+         if chunk and count + size > self.maxMsgs:
+            yield chunk
+            chunk = []
+            count = 0
+         chunk.append(transfer)
+         count += size
+      if chunk:
+         yield chunk
+
+   def submit(self):
+      '''Send all the queued transfers and return their results in order'''
+      chunks = list(self.chunks())
+      transfers = self.transfers
+      self.transfers = []
+      for chunk in chunks:
+         self.msg.transfer(chunk)
+      return [transfer.result for transfer in transfers]
+
 class I2cMsg(object):
    def __init__(self, addr):
       self.addr = addr
       self.device = None
+      self.batchSupported = True
 
    def __str__(self):
       return '%s(%s, fd=%d)' % (
@@ -127,6 +227,38 @@ class I2cMsg(object):
          logging.io('%s.i2c_rdwr(%s): ret=%s',
                        self, data, ret) # kernel msgs
 
+   def _transfer(self, transfers):
+      msgs = [msg for transfer in transfers for msg in transfer.messages()]
+      ioctl_data = i2c_rdwr_ioctl_data.from_msgs(msgs)
+      self.i2c_rdwr(ioctl_data)
+      offset = 0
+      for transfer in transfers:
+         count = transfer.count
+         transfer.complete(ioctl_data.msgs[offset:offset + count])
+         offset += count
+
+   def transfer(self, transfers):
+      '''Send transfers in a single ioctl, one by one if the adapter refuses'''
+      if len(transfers) > 1 and self.batchSupported:
+         try:
+            self._transfer(transfers)
+            return
+         except IOError as e:
+            # NOTE: only a rejection of the whole batch by the adapter is safe
+            #       to retry, any other error can happen after some of the
+            #       messages were already sent to the device
+            if e.errno not in (EINVAL, EOPNOTSUPP):
+               raise
+            self.batchSupported = False
+            logging.debug('%s: batch of %d transfers rejected (%s), '
+                          'falling back to individual transfers',
+                          self, len(transfers), e)
+      for transfer in transfers:
+         self._transfer([transfer])
+
+   def batch(self, maxMsgs=I2C_RDWR_IOCTL_MAX_MSGS):
+      return I2cBatch(self, maxMsgs=maxMsgs)
+
    def write_bytes(self, addr, cmd):
       wrbuf = (c_uint8 * len(cmd))(*cmd)
       ioctl_data = i2c_rdwr_ioctl_data.write_bytes(addr,
@@ -150,3 +282,280 @@ class I2cMsg(object):
                                                   pointer(rdbuf))
       self.i2c_rdwr(ioctl_data)
       return [rdbuf[i] for i in range(ioctl_data.msgs[1].len)]
+
+class I2cBusHandle(object):
+   '''SMBus and I2cMsg handles of a bus shared by the users of an I2cBusPool'''
+   def __init__(self, bus):
+      self.bus = bus
+      self.lock = threading.RLock()
+      self.smbus = None
+      # NOTE: kept across closes so that the adapter capabilities are not
+      #       probed again
+      self.msg = None
+      self.lastUsed = 0
+      self.opens = 0
+      self.transactions = 0
+
+   def __str__(self):
+      return '%s(bus=%d)' % (self.__class__.__name__, self.bus)
+
+   def isOpen(self):
+      return self.smbus is not None or \
+             (self.msg is not None and self.msg.device is not None)
+
+   def open(self):
+      if self.smbus is None:
+         self.smbus = utils.SMBus(self.bus)
+         self.opens += 1
+      return self.smbus
+
+   def openMsg(self):
+      if self.msg is None:
+         self.msg = I2cMsg(self)
+      if self.msg.device is None:
+         self.msg.open()
+         self.opens += 1
+      return self.msg
+
+   def close(self):
+      if self.smbus is not None:
+         self.smbus.close()
+         self.smbus = None
+      if self.msg is not None:
+         self.msg.close()
+
+   def stats(self):
+      return {
+         'open': self.isOpen(),
+         'opens': self.opens,
+         'transactions': self.transactions,
+      }
+
+class I2cBusPool(object):
+   '''Process wide pool of SMBus handles, one per bus
+
+   Accesses to a bus are serialized, a transaction holds the bus for its whole
+   duration. Handles unused for more than idleTimeout seconds are closed.
+   '''
+   def __init__(self, idleTimeout=5.):
+      self.idleTimeout = idleTimeout
+      self.lock = threading.Lock()
+      self.handles = {}
+      self.lastSweep = 0
+
+   def get(self, bus):
+      with self.lock:
+         handle = self.handles.get(bus)
+         if handle is None:
+            handle = I2cBusHandle(bus)
+            self.handles[bus] = handle
+         return handle
+
+   @contextmanager
+   def _hold(self, bus):
+      handle = self.get(bus)
+      with handle.lock:
+         handle.transactions += 1
+         try:
+            yield handle
+         finally:
+            handle.lastUsed = time.time()
+      self.closeIdle(now=handle.lastUsed)
+
+   @contextmanager
+   def transaction(self, bus):
+      with self._hold(bus) as handle:
+         yield handle.open()
+
+   @contextmanager
+   def msgTransaction(self, bus):
+      '''Same as transaction for I2C_RDWR transfers through an I2cMsg'''
+      with self._hold(bus) as handle:
+         yield handle.openMsg()
+
+   def closeIdle(self, now=None):
+      now = time.time() if now is None else now
+      if now - self.lastSweep < self.idleTimeout:
+         return
+      self.lastSweep = now
+      with self.lock:
+         handles = list(self.handles.values())
+      for handle in handles:
+         if not handle.isOpen() or now - handle.lastUsed < self.idleTimeout:
+            continue
+         # NOTE: a bus in use is not idle, skip it
+         if not handle.lock.acquire(blocking=False):
+            continue
+         try:
+            logging.debug('%s: closing idle handle', handle)
+            handle.close()
+         finally:
+            handle.lock.release()
+
+   def close(self):
+      with self.lock:
+         handles = list(self.handles.values())
+      for handle in handles:
+         with handle.lock:
+            handle.close()
+
+   def stats(self):
+      with self.lock:
+         return {bus : handle.stats() for bus, handle in self.handles.items()}
+
+class I2cPooledBus(object):
+   '''SMBus like object running each call as a transaction of an I2cBusPool'''
+   def __init__(self, pool, bus):
+      self.pool = pool
+      self.bus = bus
+
+   def __getattr__(self, attr):
+      def wrapped(*args, **kwargs):
+         with self.pool.transaction(self.bus) as smbus:
+            return getattr(smbus, attr)(*args, **kwargs)
+      return wrapped
+
+   def close(self):
+      pass
+
+class I2cPooledMsg(object):
+   '''I2cMsg like object running each call as a transaction of an I2cBusPool'''
+   def __init__(self, pool, bus):
+      self.pool = pool
+      self.bus = bus
+
+   def __getattr__(self, attr):
+      def wrapped(*args, **kwargs):
+         with self.pool.msgTransaction(self.bus) as msg:
+            return getattr(msg, attr)(*args, **kwargs)
+      return wrapped
+
+   def batch(self, maxMsgs=I2C_RDWR_IOCTL_MAX_MSGS):
+      return I2cBatch(self, maxMsgs=maxMsgs)
+
+   def close(self):
+      pass
+
+_i2cBusPool = None
+def getI2cBusPool():
+   global _i2cBusPool
+   if _i2cBusPool is None:
+      _i2cBusPool = I2cBusPool(
+         idleTimeout=float(Config().i2c_bus_idle_timeout))
+   return _i2cBusPool
+
+def getI2cBus(obj, depth=4):
+   '''Best effort lookup of the i2c bus used by an object, None if unknown'''
+   if isinstance(obj, I2cAddr):
+      try:
+         return obj.bus
+      except Exception: # pylint: disable=broad-except
+         return None
+   if obj is None or depth == 0:
+      return None
+   for attr in ('inv', 'api', 'driver', 'addr'):
+      bus = getI2cBus(getattr(obj, attr, None), depth - 1)
+      if bus is not None:
+         return bus
+   return None
+
+class I2cBusExecutor(object):
+   '''Run work items of distinct i2c buses concurrently
+
+   Every bus is assigned to one of the workers so that the items of a bus are
+   always run sequentially and in order. Items without a bus as well as items
+   submitted from a worker are run inline by the caller. Without workers
+   everything is run inline.
+   '''
+   def __init__(self, workers=0):
+      self.workers = workers
+      self.lock = threading.Lock()
+      self.lanes = []
+      self.busLanes = {}
+      self.local = threading.local()
+
+   def _getLane(self, bus):
+      with self.lock:
+         lane = self.busLanes.get(bus)
+         if lane is not None:
+            return lane
+         if len(self.lanes) < self.workers:
+            lane = queue.Queue()
+            thread = threading.Thread(target=self._worker, args=(lane,),
+                                      name='i2c-worker-%d' % len(self.lanes),
+                                      daemon=True)
+            thread.start()
+            self.lanes.append(lane)
+         else:
+            lane = self.lanes[len(self.busLanes) % self.workers]
+         self.busLanes[bus] = lane
+         return lane
+
+   def _worker(self, lane):
+      self.local.worker = True
+      while True:
+         item = lane.get()
+         if item is None:
+            return
+         future, func, args, kwargs = item
+         if not future.set_running_or_notify_cancel():
+            continue
+         try:
+            future.set_result(func(*args, **kwargs))
+         except BaseException as e: # pylint: disable=broad-except
+            future.set_exception(e)
+
+   def inWorker(self):
+      return getattr(self.local, 'worker', False)
+
+   def submit(self, bus, func, *args, **kwargs):
+      future = Future()
+      if bus is None or not self.workers or self.inWorker():
+         future.set_running_or_notify_cancel()
+         try:
+            future.set_result(func(*args, **kwargs))
+         except Exception as e: # pylint: disable=broad-except
+            future.set_exception(e)
+         return future
+      self._getLane(bus).put((future, func, args, kwargs))
+      return future
+
+   def map(self, func, items, key=getI2cBus):
+      '''Apply func on all items and return the results in order
+
+      The first exception raised by func is forwarded to the caller once all
+      the items have been processed.
+      '''
+      items = list(items)
+      if not self.workers or self.inWorker():
+         return [func(item) for item in items]
+      futures = [None] * len(items)
+      # NOTE: items with a bus are queued before running the others inline
+      inline = []
+      for i, item in enumerate(items):
+         bus = key(item)
+         if bus is None:
+            inline.append(i)
+         else:
+            futures[i] = self.submit(bus, func, item)
+      for i in inline:
+         futures[i] = self.submit(None, func, items[i])
+      errors = [f.exception() for f in futures if f.exception() is not None]
+      if errors:
+         raise errors[0]
+      return [f.result() for f in futures]
+
+   def shutdown(self):
+      with self.lock:
+         lanes = self.lanes
+         self.lanes = []
+         self.busLanes = {}
+      for lane in lanes:
+         lane.put(None)
+
+_i2cExecutor = None
+def getI2cExecutor():
+   global _i2cExecutor
+   if _i2cExecutor is None:
+      _i2cExecutor = I2cBusExecutor(workers=int(Config().i2c_executor_workers))
+   return _i2cExecutor
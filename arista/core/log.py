@@ -44,21 +44,52 @@ class LoggerError(Exception):
    def __str__(self):
       return 'LoggerError: %s (code %d)' % (self.msg, self.code)
 
+class LazyArg(object):
+   '''Defer the rendering of an expensive log argument until it is emitted'''
+   def __init__(self, func, *args, **kwargs):
+      self.func = func
+      self.args = args
+      self.kwargs = kwargs
+
+   def __str__(self):
+      return str(self.func(*self.args, **self.kwargs))
+
+   def __repr__(self):
+      return repr(self.func(*self.args, **self.kwargs))
+
+def lazy(func, *args, **kwargs):
+   return LazyArg(func, *args, **kwargs)
+
 class Logger(object):
    def __init__(self, manager, name, cliLevel=None, syslogLevel=None):
       self.manager = manager
       self.name = name
       self.levels = {}
+      # highest level enabled in any of the sinks, -1 when nothing is logged
+      self.level = -1
+
+   def updateLevel(self):
+      self.level = max((sink.getEffectiveLevel(self)
+                        for sink in self.manager.sinks), default=-1)
+
+   def isEnabledFor(self, level):
+      return level <= self.level
 
    def log(self, level, msg, *args, **kwargs):
+      if level > self.level:
+         return
       record = LogRecord(self, LEVELS[level], msg, *args, **kwargs)
       self.manager.log(record)
 
    def io(self, msg, *args, **kwargs):
-      self.log(IO, msg, *args, **kwargs)
+      if self.level < IO:
+         return
+      self.manager.log(LogRecord(self, LEVELS[IO], msg, *args, **kwargs))
 
    def debug(self, msg, *args, **kwargs):
-      self.log(DEBUG, msg, *args, **kwargs)
+      if self.level < DEBUG:
+         return
+      self.manager.log(LogRecord(self, LEVELS[DEBUG], msg, *args, **kwargs))
 
    def info(self, msg, *args, **kwargs):
       self.log(INFO, msg, *args, **kwargs)
@@ -112,6 +143,10 @@ class LogSink(object):
    def applyLoggerLevel(self, name, logger):
       level = logger.levels.get(self.NAME, self.level)
       logger.levels[self.NAME] = self.matchLoggerLevel(name, level)
+      logger.updateLevel()
+
+   def getEffectiveLevel(self, logger):
+      return logger.levels.get(self.NAME) or self.level
 
    def applyLoggerLevels(self, loggers):
       for name, logger in loggers.items():
@@ -185,6 +220,11 @@ class SyslogLogSink(LogSink):
          facility=syslog.LOG_DAEMON,
       )
 
+   def getEffectiveLevel(self, logger):
+      # IO messages are never sent to syslog
+      level = super(SyslogLogSink, self).getEffectiveLevel(logger)
+      return min(level, DEBUG)
+
    def write(self, line, record):
       if not record.level.syslog:
          return
@@ -207,8 +247,8 @@ class LoggerManager(object):
       self.prefix = prefix
 
    def addSink(self, sink):
-      sink.applyLoggerLevels(self.loggers)
       self.sinks.append(sink)
+      sink.applyLoggerLevels(self.loggers)
 
    def initCliLogging(self, verbosity, default=INFO, color=False):
       fmt = '%(prefix)s%(levelname)s: %(message)s'
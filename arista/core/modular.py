@@ -1,9 +1,16 @@
+import contextvars
+import gc
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
 from .config import Config
 from .log import getLogger
 from .metainventory import MetaInventory
 from .reboot import LinecardRebootManager
 from .sku import Sku
 from .utils import clog
+from ..libs.benchmark import profile
 
 logging = getLogger(__name__)
 
@@ -67,32 +74,65 @@ class Modular(Sku):
             continue
          yield sup
 
+   def _loadSlot(self, kind, slot, load):
+      logging.debug('Loading %s slot %d', kind, slot.slotId)
+      begin = time.monotonic()
+      with profile('load %s slot %d', kind, slot.slotId):
+         load(slot)
+      logging.debug('Loaded %s slot %d in %.3fs', kind, slot.slotId,
+                    time.monotonic() - begin)
+
+   def _loadSlots(self, jobs):
+      '''Load a list of (kind, slot, load) concurrently
+
+      Loading a card slot mostly waits on the eeprom read over i2c, the slots
+      are independent from each other. Replacing the default card definitions
+      leaves garbage behind which is collected once all slots are loaded.
+      '''
+      workers = min(Config().card_load_workers, len(jobs))
+      if workers > 1:
+         with ThreadPoolExecutor(max_workers=workers,
+                                 thread_name_prefix='load') as pool:
+            futures = [pool.submit(contextvars.copy_context().run,
+                                   self._loadSlot, kind, slot, load)
+                       for kind, slot, load in jobs]
+            for future in futures:
+               future.result()
+      else:
+         for kind, slot, load in jobs:
+            self._loadSlot(kind, slot, load)
+      if any(kind != 'psu' for kind, _, _ in jobs):
+         gc.collect()
+
+   def _linecardJobs(self, slotIds=None):
+      standbyOnly = Config().linecard_standby_only
+      return [('linecard', slot,
+               lambda s: s.loadCard(standbyOnly=standbyOnly, collect=False))
+              for slot in self.active.linecardSlots[:self.NUM_LINECARDS]
+              if slotIds is None or slot.slotId in slotIds]
+
+   def _fabricJobs(self, slotIds=None):
+      return [('fabric', slot, lambda s: s.loadCard(collect=False))
+              for slot in self.active.fabricSlots[:self.NUM_FABRICS]
+              if slotIds is None or slot.slotId in slotIds]
+
+   def _psuJobs(self, slotIds=None):
+      return [('psu', slot, lambda s: s.load())
+              for slot in self.active.psuSlots[:self.NUM_PSUS]
+              if slotIds is None or slot.slotId in slotIds]
+
    def loadLinecards(self, slotIds=None):
-      for slot in self.active.linecardSlots[:self.NUM_LINECARDS]:
-         if slotIds is not None and slot.slotId not in slotIds:
-            continue
-         logging.debug('Loading linecard slot %d', slot.slotId)
-         standbyOnly = Config().linecard_standby_only
-         slot.loadCard(standbyOnly=standbyOnly)
+      self._loadSlots(self._linecardJobs(slotIds))
 
    def loadFabrics(self, slotIds=None):
-      for slot in self.active.fabricSlots[:self.NUM_FABRICS]:
-         if slotIds is not None and slot.slotId not in slotIds:
-            continue
-         logging.debug('Loading fabric slot %d', slot.slotId)
-         slot.loadCard()
+      self._loadSlots(self._fabricJobs(slotIds))
 
    def loadPsus(self, slotIds=None):
-      for slot in self.active.psuSlots[:self.NUM_PSUS]:
-         if slotIds is not None and slot.slotId not in slotIds:
-            continue
-         logging.debug('Loading psu slot %d', slot.slotId)
-         slot.load()
+      self._loadSlots(self._psuJobs(slotIds))
 
    def loadAll(self):
-      self.loadPsus()
-      self.loadFabrics()
-      self.loadLinecards()
+      self._loadSlots(self._psuJobs() + self._fabricJobs() +
+                      self._linecardJobs())
 
    def _iterSlots(self, slots, count, presentOnly=True, key=lambda s: s):
       for slot in slots[:count]:
@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import importlib
 import os
 import re
 
@@ -12,7 +13,7 @@ from .prefdl import Prefdl
 from .types import I2cBus
 from .utils import simulateWith, getCmdlineDict
 
-from ..libs.benchmark import timeit
+from ..libs.benchmark import profile, timeit
 
 logging = getLogger(__name__)
 
@@ -36,6 +37,9 @@ class PlatformManager:
       self.platforms = []
       self.platformSidIndex = {}
       self.platformSkuIndex = {}
+      self.modules = None
+      self.package = 'arista.platforms'
+      self.registry_ = None
 
    def registerPlatform(self, cls):
       self.platforms.append(cls)
@@ -52,6 +56,42 @@ class PlatformManager:
 
       return cls
 
+   @property
+   def registry(self):
+      if self.registry_ is None:
+         self.registry_ = importlib.import_module('%s.registry' % self.package)
+      return self.registry_
+
+   def _lookup(self, index, registry, name):
+      if name is None:
+         return None
+      platformCls = index.get(name)
+      if platformCls is None and self.modules is None:
+         # only import the module providing this platform and what it depends on
+         module = registry.get(name)
+         if module is not None:
+            with profile('import %s', module):
+               importlib.import_module('%s.%s' % (self.package, module))
+            platformCls = index.get(name)
+      return platformCls
+
+   def lookupSid(self, sid):
+      return self._lookup(self.platformSidIndex, self.registry.PLATFORM_SIDS, sid)
+
+   def lookupSku(self, sku):
+      return self._lookup(self.platformSkuIndex, self.registry.PLATFORM_SKUS, sku)
+
+   def _detectPlatform(self):
+      platformCls = self.lookupSid(readSid())
+      if platformCls is not None:
+         return platformCls
+
+      platformCls = self.lookupSku(readSku())
+      if platformCls is not None:
+         return platformCls
+
+      return self.lookupSid(readPlatformName())
+
    def detectPlatform(self):
       # TODO: refactor by obtaining a Cpu object based on the platform= from
       #       cmdline implement getEeprom on all Cpu to get the prefdl from hw
@@ -59,43 +99,67 @@ class PlatformManager:
       #       today
       getSysEeprom()
 
-      sid = readSid()
-      platformCls = self.platformSidIndex.get(sid)
+      platformCls = self._detectPlatform()
+      if platformCls is None and self.modules is None:
+         # the registry could be missing a platform, look at all of them
+         self.loadPlatforms()
+         platformCls = self._detectPlatform()
       if platformCls is not None:
          return platformCls
 
-      sku = readSku()
-      platformCls = self.platformSkuIndex.get(sku)
-      if platformCls is not None:
-         return platformCls
-
-      name = readPlatformName()
-      platformCls = self.platformSidIndex.get(name)
-      if platformCls is not None:
-         return platformCls
-
-      raise UnknownPlatformError(sku, sid, name, self.platforms)
-
-   def getPlatformCls(self, *names):
-      if not names or not [name for name in names if name]:
-         return self.detectPlatform()
+      raise UnknownPlatformError(readSku(), readSid(), readPlatformName(),
+                                 self.platforms)
 
+   def _getPlatformCls(self, names):
       for name in names:
-         if name is None:
-            continue
-
-         platformCls = self.platformSkuIndex.get(name)
+         platformCls = self.lookupSku(name)
          if platformCls is not None:
             return platformCls
 
-         platformCls = self.platformSidIndex.get(name)
+         platformCls = self.lookupSid(name)
          if platformCls is not None:
             return platformCls
 
+      return None
+
+   def getPlatformCls(self, *names):
+      if not names or not [name for name in names if name]:
+         return self.detectPlatform()
+
+      platformCls = self._getPlatformCls(names)
+      if platformCls is None and self.modules is None:
+         self.loadPlatforms()
+         platformCls = self._getPlatformCls(names)
+      if platformCls is not None:
+         return platformCls
+
       raise UnknownPlatformError(names, self.platforms)
 
-   def loadPlatforms(self, package):
-      return importSubmodules(package).keys()
+   def loadPlatforms(self, package=None):
+      if self.modules is None:
+         self.modules = importSubmodules(package or self.package)
+      return self.modules.keys()
+
+   def buildRegistry(self):
+      '''Compute the content of the prebuilt registry from all the platforms'''
+      self.loadPlatforms()
+      sids = {}
+      skus = {}
+      prefix = self.package + '.'
+      for cls in self.platforms:
+         if not cls.__module__.startswith(prefix):
+            continue
+         module = cls.__module__[len(prefix):]
+         for sid in cls.SID:
+            sids[sid] = module
+         for sku in cls.SKU:
+            skus[sku] = module
+         if cls.PLATFORM is not None:
+            sids[cls.PLATFORM] = module
+      return {
+         'PLATFORM_SIDS': sids,
+         'PLATFORM_SKUS': skus,
+      }
 
 manager = PlatformManager()
 
@@ -179,7 +243,8 @@ def getSysEeprom():
 def getSysEepromData():
    global syseepromData
    if not syseepromData:
-      syseepromData = getSysEeprom().prefdl()
+      with profile('read prefdl'):
+         syseepromData = getSysEeprom().prefdl()
       assert 'SKU' in syseepromData
    return syseepromData
 
@@ -199,23 +264,29 @@ def getPlatformCls(*names):
    return manager.getPlatformCls(*names)
 
 def getPlatform(name=None):
-   platformCls = manager.getPlatformCls(name)
-   platform = platformCls()
-   platform.refresh()
+   with profile('detect platform'):
+      platformCls = manager.getPlatformCls(name)
+   with profile('create %s', platformCls.__name__):
+      platform = platformCls()
+   with profile('refresh %s', platform):
+      platform.refresh()
    return platform
 
 def getPlatformSkus():
+   manager.loadPlatforms()
    return manager.platformSkuIndex
 
 def getPlatformSids():
+   manager.loadPlatforms()
    return manager.platformSidIndex
 
 def getPlatforms():
+   manager.loadPlatforms()
    return manager.platforms
 
 def loadPlatforms():
    with timeit('Loading platform definitions'):
-      from .. import platforms as _
+      manager.loadPlatforms()
    logging.debug('Loaded %d platforms', len(manager.platforms))
 
 def registerPlatform():
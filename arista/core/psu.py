@@ -1,9 +1,11 @@
 
 import copy
+import importlib
 
 from .component import Priority
 from .component.slot import SlotComponent
 from .component.unmanaged import UnmanagedComponent
+from .config import Config
 from .dynload import importSubmodules
 from .log import getLogger
 from .utils import JsonStoredData, inSimulation
@@ -130,6 +132,7 @@ class PsuManager:
       self.psus_ = []
       self.modules = None
       self.package = 'arista.components.psu'
+      self.index_ = None
 
    def _loadModule(self, module):
       for value in module.__dict__.values():
@@ -152,7 +155,56 @@ class PsuManager:
          self.loadPsuModels()
       return self.psus_
 
+   @property
+   def index(self):
+      if self.index_ is None:
+         self.index_ = importlib.import_module('%s.index' % self.package)
+      return self.index_
+
+   def _getModelCls(self, module, clsname):
+      module = importlib.import_module('%s.%s' % (self.package, module))
+      return getattr(module, clsname)
+
+   def buildIndex(self):
+      '''Compute the content of the prebuilt index from all the psu models'''
+      models = {}
+      pmbusAddrs = []
+      pmbusModels = {}
+      prefix = self.package + '.'
+      for model in self.psuModels:
+         if not model.__module__.startswith(prefix):
+            continue
+         module = model.__module__[len(prefix):]
+         models[model.__name__] = module
+         if not model.PMBUS_ADDR or not model.IDENTIFIERS:
+            continue
+         if model.PMBUS_ADDR not in pmbusAddrs:
+            pmbusAddrs.append(model.PMBUS_ADDR)
+         entry = (module, model.__name__, model.PMBUS_ADDR)
+         vendors = [model.MANUFACTURER] + model.MANUFACTURER_ALIASES
+         for vendor in vendors:
+            for ident in model.IDENTIFIERS:
+               key = (vendor.lower(), ident.partName.rstrip())
+               entries = pmbusModels.setdefault(key, [])
+               if entry not in entries:
+                  entries.append(entry)
+      return {
+         'PSU_MODELS': dict(sorted(models.items())),
+         'PSU_PMBUS_ADDRS': pmbusAddrs,
+         'PSU_PMBUS_MODELS': dict(sorted(pmbusModels.items())),
+      }
+
+   def lookupPmbusModels(self, vendor, partName, addr):
+      key = (vendor.lower().rstrip(), partName.rstrip())
+      return [self._getModelCls(module, clsname)
+              for module, clsname, pmbusAddr in
+              self.index.PSU_PMBUS_MODELS.get(key, [])
+              if pmbusAddr == addr]
+
    def psuForIdentifier(self, clsname, identifier):
+      module = self.index.PSU_MODELS.get(clsname)
+      if module is not None:
+         return self._getModelCls(module, clsname)(identifier)
       for model in self.psuModels:
          if model.__name__ == clsname:
             return model(identifier)
@@ -170,37 +222,43 @@ class PsuManager:
 
       return None
 
+   def _getDetector(self, slot, addr, detectors):
+      # cache pmbus detector to minimize IO operations
+      detector = detectors.get(addr)
+      if detector is None:
+         detector = PsuPmbusDetect(slot.addrFunc(addr))
+         detectors[addr] = detector
+         if detector.exists():
+            logging.debug('searching for psu vendor "%s" model "%s"',
+                          detector.id(), detector.model())
+      return detector
+
    def autodetectPmbusPsu(self, slot):
       psus = []
       detectors = {}
-      # try expected PSU models first
-      models = slot.psus + [p for p in self.psuModels if p not in slot.psus]
-      for model in models:
-         if not model.PMBUS_ADDR:
-            continue
-
+      tried = set()
+      # try expected PSU models first, then the ones of the prebuilt index
+      # matching what the device reports, only their module gets imported
+      candidates = [(m.PMBUS_ADDR, [m]) for m in slot.psus if m.PMBUS_ADDR]
+      candidates += [(addr, None) for addr in self.index.PSU_PMBUS_ADDRS]
+      for addr, models in candidates:
          try:
-            # cache pmbus detector to minimize IO operations
-            detector = detectors.get(model.PMBUS_ADDR)
-            detectorCached = True
-            if detector is None:
-               detector = PsuPmbusDetect(slot.addrFunc(model.PMBUS_ADDR))
-               detectorCached = False
-               detectors[model.PMBUS_ADDR] = detector
-
+            detector = self._getDetector(slot, addr, detectors)
             if not detector.exists():
                # No PMBus device found at the address expected for this model
                continue
 
-            if not detectorCached:
-               logging.debug('searching for psu vendor "%s" model "%s"',
-                             detector.id(), detector.model())
-
-            ident = self.identifyPsuModel(model, detector)
-            if ident is not None:
-               # TODO: add logging
-               logging.debug('found matching psu %s', model.__name__)
-               psus.append(model(ident))
+            if models is None:
+               models = self.lookupPmbusModels(detector.id(), detector.model(),
+                                               addr)
+            for model in models:
+               if model in tried:
+                  continue
+               tried.add(model)
+               ident = self.identifyPsuModel(model, detector)
+               if ident is not None:
+                  logging.debug('found matching psu %s', model.__name__)
+                  psus.append(model(ident))
          except Exception as e: # pylint: disable=broad-except
             logging.error('something happened while trying to detect the psu: %s', e)
 
@@ -237,6 +295,7 @@ class PsuSlot(SlotComponent):
       self.psuSlot = self.inventory.addPsuSlot(PsuSlotImpl(self))
       self.psuInv = None
       self.psu = None
+      self.lastPresence = None
       self.load(cacheOnly=True) # no IO in the constructor
 
    def _forcePsuModel(self, model):
@@ -258,15 +317,47 @@ class PsuSlot(SlotComponent):
    def getCacheStore(self):
       return JsonStoredData('psu_slot_%d.json' % self.slotId)
 
+   def getPresenceStore(self):
+      return JsonStoredData('psu_slot_%d_presence.json' % self.slotId)
+
+   def getPresenceGeneration(self):
+      '''Number of times the slot was seen empty, a re-seat changes it'''
+      data = self.getPresenceStore().readOrClear()
+      if not isinstance(data, dict):
+         return 0
+      return data.get('generation', 0)
+
+   def updatePresenceGeneration(self, presence):
+      if presence == self.lastPresence:
+         return
+      self.lastPresence = presence
+      if presence or inSimulation():
+         return
+      generation = self.getPresenceGeneration() + 1
+      try:
+         self.getPresenceStore().write({'generation': generation}, mode='w+')
+      except Exception: # pylint: disable=broad-except
+         logging.debug('PSU %d failed to store presence generation', self.slotId)
+
    def getCache(self):
       cache = self.getCacheStore()
-      return cache.readOrClear()
+      data = cache.readOrClear()
+      if not isinstance(data, dict):
+         return None
+      generation = self.getPresenceGeneration()
+      if data.get('generation') != generation:
+         logging.debug('PSU %d cache is stale (generation %s, expected %d)',
+                       self.slotId, data.get('generation'), generation)
+         cache.clear()
+         return None
+      return data
 
    def setCache(self):
       cache = self.getCacheStore()
       cache.write({
          'cls': self.model.__class__.__name__,
          'identifier': self.model.identifier.__dict__,
+         'generation': self.getPresenceGeneration(),
       }, mode='w+')
 
    def clearCache(self):
@@ -281,6 +372,26 @@ class PsuSlot(SlotComponent):
       identifier = PsuIdent(**data['identifier'])
       return getPsuManager().psuForIdentifier(clsname, identifier)
 
+   def validateCachedModel(self, model):
+      '''Check that the psu in the slot is still the one of the cache
+
+      Only the serial is read back, without probing the device first, which is
+      much cheaper than a full detection. This catches a psu swapped while no
+      process was watching the presence of the slot.
+      '''
+      if inSimulation() or not self.addrFunc or not model.PMBUS_ADDR:
+         return True
+      serial = model.identifier.metadata.get('serial')
+      if serial in (None, 'N/A'):
+         return False
+      detector = PsuPmbusDetect(self.addrFunc(model.PMBUS_ADDR), prepare=False)
+      try:
+         return detector.readSerial() == serial
+      except Exception as e: # pylint: disable=broad-except
+         logging.debug('PSU %d failed to validate cached model: %s',
+                       self.slotId, e)
+         return False
+
    def logPsuInformation(self):
       logging.debug("PSU %d name: %s", self.slotId, self.model.identifier.aristaName)
       for key, value in self.model.identifier.metadata.items():
@@ -289,6 +400,11 @@ class PsuSlot(SlotComponent):
    def loadPsuModel(self, useCache=True, cacheOnly=False):
       if useCache:
          self.model = self.loadModelFromCache()
+         if self.model is not None and not cacheOnly and \
+               not self.validateCachedModel(self.model):
+            logging.debug("PSU %d does not match the cache", self.slotId)
+            self.clearCache()
+            self.model = None
          if self.model is not None:
             logging.debug("PSU %d loaded from cache", self.slotId)
             return self.model
@@ -359,7 +475,9 @@ class PsuSlot(SlotComponent):
       # If the GPIO is just set to True, it's fixed and it's always present.
       if self.presentGpio is True:
          return True
-      return self.presentGpio.isActive()
+      presence = self.presentGpio.isActive()
+      self.updatePresenceGeneration(presence)
+      return presence
 
    def _getGpioActiveOr(self, gpio):
       if gpio is None:
@@ -382,7 +500,8 @@ class PsuSlot(SlotComponent):
       return self.isOutputGood()
 
    def setup(self):
-      self.load(useCache=False)
+      # NOTE: the identity cache is only valid while the psu stays in its slot
+      self.load(useCache=Config().psu_identity_cache)
       if self.psu:
          # initialize the PSU, iterComponent will not run on it since the list
          # has already been computed.
@@ -5,11 +5,17 @@ except ImportError:
    print('This feature only works in python3')
    raise
 
+import contextvars
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
 from .config import Config
 from .linecard import LCpuCtx
 from .log import getLogger
 from .utils import clog
-from ..utils.rpc.client import RpcClient
+from ..libs.benchmark import profile
+from ..utils.rpc.client import AsyncRpcClient
 
 logging = getLogger(__name__)
 
@@ -24,11 +30,27 @@ class LinecardRebootManager(object):
       else:
          self.linecards = linecards
 
-   def doReboot(self, linecard):
+      self.clients = {}
+
+   def getRpcClient(self, linecard):
+      # NOTE: one persistent connection per linecard, shared by all the calls
+      #       made by this manager
+      slotId = linecard.getSlotId()
+      client = self.clients.get(slotId)
+      if client is None:
+         client = AsyncRpcClient(Config().api_rpc_lcx.format(slotId),
+                                 Config().api_rpc_port)
+         self.clients[slotId] = client
+      return client
+
+   async def _async_closeClients(self):
+      clients, self.clients = self.clients, {}
+      for client in clients.values():
+         await client.close()
+
+   async def _async_doReboot(self, linecard):
       if linecard.getPresence() and linecard.hasCpuModule():
-         client = RpcClient(Config().api_rpc_lcx.format(linecard.getSlotId()),
-                            Config().api_rpc_port)
-         client.gracefulShutdown()
+         await self.getRpcClient(linecard).gracefulShutdown()
 
    async def _linecardEarlyBoot(self, linecard):
       while True:
@@ -40,7 +62,7 @@ class LinecardRebootManager(object):
       if linecard.getPresence() and linecard.hasCpuModule():
          try:
             logging.info('Start graceful reboot on linecard %s...', linecard)
-            self.doReboot(linecard)
+            await self._async_doReboot(linecard)
          except: # pylint: disable=bare-except
             logging.exception('Graceful reboot on linecard %s failed', linecard)
          else:
@@ -68,25 +90,75 @@ class LinecardRebootManager(object):
          tasks.append(self.loop.create_task(
             self._async_powerOffLinecard(linecard)))
       await asyncio.gather(*tasks)
+      await self._async_closeClients()
 
    def powerOffLinecards(self):
       return self.loop.run_until_complete(self._async_powerOffLinecards())
 
+   def _powerOnLinecard(self, linecard, lcpuCtx):
+      begin = time.monotonic()
+      error = None
+      try:
+         logging.debug('Power on linecard %s...', linecard)
+         with profile('power on %s', linecard):
+            linecard.powerOnIs(True, lcpuCtx)
+      except Exception as e:  # pylint: disable=broad-except
+         logging.exception('Start linecard %s failed', linecard)
+         clog('Failed to power on linecard %s: %s', linecard, e)
+         error = e
+      duration = time.monotonic() - begin
+      if error is None:
+         logging.info('Power on linecard %s success in %.2fs', linecard,
+                      duration)
+      return error, duration
+
+   async def _async_powerOnLinecards(self, lcpuCtx):
+      # NOTE: the number of cards powering on at once is bounded so that the
+      #       combined inrush current stays within what the PSUs can deliver
+      budget = max(1, Config().linecard_power_on_budget)
+      with ThreadPoolExecutor(max_workers=budget,
+                              thread_name_prefix='poweron') as executor:
+         tasks = []
+         for linecard in self.linecards:
+            context = contextvars.copy_context()
+            tasks.append(self.loop.run_in_executor(
+               executor, context.run, self._powerOnLinecard, linecard, lcpuCtx))
+         results = await asyncio.gather(*tasks)
+      return dict(zip(self.linecards, results))
+
+   def powerOnLinecards(self, lcpuCtx=None):
+      '''Power on the linecards, at most linecard_power_on_budget at once
+
+      A failing card does not prevent the others from being powered on.
+      Returns a mapping of each linecard to its (error, duration) where error
+      is None on success.
+      '''
+      begin = time.monotonic()
+      results = self.loop.run_until_complete(
+         self._async_powerOnLinecards(lcpuCtx or LCpuCtx()))
+      failed = [str(lc) for lc, (error, _) in results.items() if error]
+      logging.info('Powered on %d linecards in %.2fs%s',
+                   len(results) - len(failed), time.monotonic() - begin,
+                   ', failed: %s' % ', '.join(failed) if failed else '')
+      return results
+
+   async def _async_rebootLinecard(self, linecard):
+      try:
+         logging.info('Reboot linecard %s...', linecard)
+         await self._async_doReboot(linecard)
+         logging.info('Reboot linecard %s success', linecard)
+      except: # pylint: disable=bare-except
+         logging.exception('Reboot linecard %s failed', linecard)
+
+   async def _async_rebootLinecards(self):
+      await asyncio.gather(*[self._async_rebootLinecard(linecard)
+                             for linecard in self.linecards])
+      await self._async_closeClients()
+
    def rebootLinecards(self, mode='soft'):
       if mode == 'hard':
          self.powerOffLinecards()
-         lcpuCtx = LCpuCtx()
-         for linecard in self.linecards:
-            try:
-               logging.debug('Power on linecard %s...', linecard)
-               linecard.powerOnIs(True, lcpuCtx)
-            except: # pylint: disable=bare-except
-               logging.exception('Start linecard %s failed', linecard)
+         self.powerOnLinecards()
       else:
-         for linecard in self.linecards:
-            try:
-               logging.info('Reboot linecard %s...', linecard)
-               self.doReboot(linecard)
-               logging.info('Reboot linecard %s success', linecard)
-            except: # pylint: disable=bare-except
-               logging.exception('Reboot linecard %s failed', linecard)
+         self.loop.run_until_complete(self._async_rebootLinecards())
+
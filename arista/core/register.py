@@ -1,11 +1,17 @@
 
 import copy
 
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from .driver.user.gpio import GpioFuncImpl
-from .log import getLogger
+from .log import getLogger, lazy
 
 logging = getLogger(__name__)
 
+def _fmtValues(values):
+   return ', '.join(['%#x' % x for x in values])
+
 class HardwareHandle(object):
 
    def __str__(self):
@@ -24,7 +30,7 @@ class HardwareHandle(object):
       raise NotImplementedError
 
    def log(self, fmt, *args):
-      logging.io('%s ' + fmt, self.fullName(), *args)
+      logging.io('%s ' + fmt, lazy(self.fullName), *args)
 
 class RegBitField(HardwareHandle):
    def __init__(self, bitpos, name, ro=True, flip=False, parent=None):
@@ -150,25 +156,38 @@ class Register(HardwareHandle):
          return self.read()
       return self.write(value)
 
+   def readCurrent(self):
+      '''Value of the register including writes pending in a transaction'''
+      value = self.parent.pendingWrite(self.addr)
+      if value is None:
+         value = self.read()
+      return value
+
+   def writeModified(self, value):
+      '''Write back the result of a read-modify-write cycle'''
+      if self.parent.deferWrite(self, value):
+         return None
+      return self.write(value)
+
    def readBit(self, bitpos):
-      return (self.read() >> bitpos) & 1
+      return (self.readCurrent() >> bitpos) & 1
 
    def writeBit(self, bitpos, value):
-      regval = self.read()
+      regval = self.readCurrent()
       if value:
          regval |= (1 << bitpos)
       else:
          regval &= ~(1 << bitpos)
-      return self.write(regval)
+      return self.writeModified(regval)
 
    def readBits(self, bitstart, bitend):
       mask = (1 << (bitend - bitstart + 1)) - 1
-      return (self.read() >> bitstart) & mask
+      return (self.readCurrent() >> bitstart) & mask
 
    def writeBits(self, bitstart, bitend, value):
       mask = (1 << (bitend - bitstart + 1)) - 1
-      regval = (self.read() & ~(mask << bitstart)) | (value << bitstart)
-      return self.write(regval)
+      regval = (self.readCurrent() & ~(mask << bitstart)) | (value << bitstart)
+      return self.writeModified(regval)
 
    def generateFieldAttributes(self, attrs, field):
       attrs[field.name] = field.getAttribute(self)
@@ -197,7 +216,11 @@ class ClearOnReadRegister(Register):
       return bit
 
    def read(self):
-      self.cache |= super(ClearOnReadRegister, self).read()
+      # NOTE: values of clear on read registers are never taken from a snapshot
+      value = self.parent.readThrough(self.addr)
+      if self.name:
+         self.log('read(): %#x', value)
+      self.cache |= value
       # NOTE: clear on read behavior for users only happens via a readBit
       return self.cache
 
@@ -221,7 +244,7 @@ class RegisterArray(Register):
       value = [self.parent.read(addr)
               for addr in range(self.addrBegin, self.addrEnd + 1)]
       if self.name:
-         self.log('read(): [%s]', ', '.join(['%#x' % x for x in value]))
+         self.log('read(): [%s]', lazy(_fmtValues, value))
       return value
 
    def write(self, value):
@@ -230,7 +253,7 @@ class RegisterArray(Register):
       if len(value) != self.addrEnd - self.addrBegin + 1:
          raise ValueError('value is not of the correct size')
       if self.name:
-         self.log('write([%s])', ', '.join(['%#x' % x for x in value]))
+         self.log('write([%s])', lazy(_fmtValues, value))
       for i, v in enumerate(value):
          self.parent.write(self.addrBegin + i, v)
 
@@ -246,9 +269,117 @@ class RegisterArray(Register):
    def writeBits(self, bitstart, bitend, value):
       raise NotImplementedError
 
+class RegisterCache(object):
+   '''Access the registers of a RegisterMap through its parent
+
+   While a snapshot is active each register address is only read once from the
+   hardware. While a transaction is active the read-modify-write cycles done on
+   a register are coalesced into a single write when the transaction ends.
+   Other writes are forwarded immediately, after the pending ones.
+   '''
+   def __init__(self, parent):
+      self.parent = parent
+      self.values = None
+      self.pending = None
+      self.snapshots = 0
+      self.transactions = 0
+
+   def __str__(self):
+      return str(self.parent)
+
+   def __getattr__(self, key):
+      return getattr(self.parent, key)
+
+   def read(self, addr):
+      if self.pending and addr in self.pending:
+         return self.pending[addr][1]
+      if self.values is None:
+         return self.parent.read(addr)
+      value = self.values.get(addr)
+      if value is None:
+         value = self.parent.read(addr)
+         self.values[addr] = value
+      return value
+
+   def readThrough(self, addr):
+      return self.parent.read(addr)
+
+   def write(self, addr, value):
+      self.flush()
+      if self.values is not None:
+         self.values.pop(addr, None)
+      return self.parent.write(addr, value)
+
+   def prefetch(self, addrs):
+      addrs = sorted(set(addrs))
+      readRange = getattr(self.parent, 'readRange', None)
+      while addrs:
+         count = 1
+         while count < len(addrs) and addrs[count] == addrs[0] + count:
+            count += 1
+         if readRange is not None and count > 1:
+            values = readRange(addrs[0], count)
+         else:
+            values = [self.parent.read(addr) for addr in addrs[:count]]
+         for addr, value in zip(addrs, values):
+            self.values[addr] = value
+         addrs = addrs[count:]
+
+   def pendingWrite(self, addr):
+      if not self.pending or addr not in self.pending:
+         return None
+      return self.pending[addr][1]
+
+   def deferWrite(self, reg, value):
+      if self.pending is None:
+         return False
+      self.pending[reg.addr] = (reg, value)
+      return True
+
+   def flush(self):
+      if not self.pending:
+         return
+      pending = self.pending
+      self.pending = OrderedDict()
+      for addr, (reg, value) in pending.items():
+         if self.values is not None:
+            self.values.pop(addr, None)
+         reg.write(value)
+
+   @contextmanager
+   def snapshot(self, prefetch=None):
+      if not self.snapshots:
+         self.values = {}
+      self.snapshots += 1
+      try:
+         if prefetch:
+            self.prefetch(prefetch)
+         yield self
+      finally:
+         self.snapshots -= 1
+         if not self.snapshots:
+            self.values = None
+
+   @contextmanager
+   def transaction(self):
+      with self.snapshot():
+         if not self.transactions:
+            self.pending = OrderedDict()
+         self.transactions += 1
+         try:
+            yield self
+         finally:
+            self.transactions -= 1
+            if not self.transactions:
+               try:
+                  self.flush()
+               finally:
+                  self.pending = None
+
 class RegisterMap(object):
    def __init__(self, parent, offset=0):
       self.parent_ = parent
+      self.cache_ = RegisterCache(parent)
       self.attributes_ = []
       self.offset = offset
       # initialize attributes from parent to child definition to allow for
@@ -261,7 +392,7 @@ class RegisterMap(object):
 
    def _updateAttributes(self, reg):
       reg.addr += self.offset
-      attrs = reg.generateAttributes(self.parent_)
+      attrs = reg.generateAttributes(self.cache_)
       for key, value in attrs.items():
          self.attributes_.append(key)
          setattr(self, key, value)
@@ -269,19 +400,32 @@ class RegisterMap(object):
    def getGpio(self, name):
       return GpioFuncImpl(self, getattr(self, name))
 
+   def snapshot(self, prefetch=None):
+      '''Read each register at most once within the context
+
+      Addresses listed in prefetch are read upfront, contiguous ones using a
+      single block read when the parent provides readRange.
+      '''
+      return self.cache_.snapshot(prefetch=prefetch)
+
+   def transaction(self):
+      '''Coalesce the bit writes done on a register within the context'''
+      return self.cache_.transaction()
+
    def __diag__(self, ctx):
       res = []
-      for attr in self.attributes_:
-         func = getattr(self, attr)
-         try:
-            value = func() if ctx.performIo else None
-         except (IOError, NotImplementedError):
-            value = False
-         info = {
-            'name': str(attr),
-            'addr': str(func.__self__),
-            'value': value
-         }
-
-         res.append(info)
+      with self.snapshot():
+         for attr in self.attributes_:
+            func = getattr(self, attr)
+            try:
+               value = func() if ctx.performIo else None
+            except (IOError, NotImplementedError):
+               value = False
+            info = {
+               'name': str(attr),
+               'addr': str(func.__self__),
+               'value': value
+            }
+
+            res.append(info)
       return res
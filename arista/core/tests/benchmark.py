@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from ...tests.testing import unittest
+
+from ...libs import benchmark
+from ...libs.benchmark import Profiler, getProfiler, profile
+
+class ProfilerTest(unittest.TestCase):
+   def setUp(self):
+      self.profiler = Profiler()
+      self.saved = benchmark.profiler
+      benchmark.profiler = self.profiler
+
+   def tearDown(self):
+      benchmark.profiler = self.saved
+
+   def testDisabled(self):
+      with profile('ignored %s', 'span') as span:
+         self.assertIsNone(span)
+      self.assertEqual(list(self.profiler.spans), [])
+
+   def testNested(self):
+      self.profiler.enable()
+      with profile('root'):
+         for i in range(2):
+            with profile('child %d', i):
+               with profile('leaf'):
+                  pass
+      with profile('other'):
+         pass
+
+      self.assertEqual([s.name for s in self.profiler.spans], ['root', 'other'])
+      root = self.profiler.spans[0]
+      self.assertEqual([s.name for s in root.children], ['child 0', 'child 1'])
+      for child in root.children:
+         self.assertIs(child.parent, root)
+         self.assertEqual([s.name for s in child.children], ['leaf'])
+         self.assertLessEqual(child.duration, root.duration)
+
+   def testBounded(self):
+      self.profiler = Profiler(maxSpans=3)
+      benchmark.profiler = self.profiler
+      self.profiler.enable()
+      for i in range(5):
+         with profile('root %d', i):
+            for j in range(4):
+               with profile('child %d', j):
+                  pass
+      self.assertEqual([s.name for s in self.profiler.spans],
+                       ['root 2', 'root 3', 'root 4'])
+      self.assertEqual([s.name for s in self.profiler.spans[0].children],
+                       ['child 1', 'child 2', 'child 3'])
+      self.assertEqual(self.profiler.dropped, 2 + 5)
+      self.assertTrue(self.profiler.report().endswith('7 spans dropped'))
+      self.profiler.clear()
+      self.assertEqual(self.profiler.dropped, 0)
+      self.assertEqual(self.profiler.spans.maxlen, 3)
+
+   def testReport(self):
+      self.profiler.enable()
+      with profile('root'):
+         for _ in range(3):
+            with profile('child'):
+               pass
+      lines = self.profiler.report().splitlines()
+      self.assertEqual(len(lines), 2)
+      self.assertTrue(lines[0].endswith(' root'))
+      self.assertTrue(lines[1].endswith('   child (x3)'))
+
+   def testAsyncTasks(self):
+      self.profiler.enable()
+
+      async def task(name):
+         with profile(name):
+            await asyncio.sleep(0)
+            with profile('%s inner', name):
+               await asyncio.sleep(0)
+
+      async def run():
+         with profile('root'):
+            await asyncio.gather(task('a'), task('b'))
+
+      asyncio.run(run())
+      root, = self.profiler.spans
+      self.assertEqual(sorted(s.name for s in root.children), ['a', 'b'])
+      for span in root.children:
+         self.assertEqual([s.name for s in span.children],
+                          ['%s inner' % span.name])
+
+   def testDump(self):
+      self.profiler.enable()
+      with profile('root'):
+         with profile('child'):
+            pass
+      with tempfile.TemporaryDirectory() as tmpdir:
+         path = os.path.join(tmpdir, 'profile.json')
+         self.profiler.dump(path)
+         with open(path) as f:
+            data = json.load(f)
+      self.assertEqual(data[0]['name'], 'root')
+      self.assertEqual(data[0]['children'][0]['name'], 'child')
+      self.assertGreaterEqual(data[0]['duration'],
+                              data[0]['children'][0]['duration'])
+
+   def _readTrace(self, path):
+      with open(path) as f:
+         data = f.read()
+      # NOTE: the trailing bracket is optional in the json array trace format
+      self.assertTrue(data.startswith('[\n'))
+      return json.loads(data.rstrip().rstrip(',') + ']')
+
+   def testTraceEvents(self):
+      self.profiler.enable()
+      self.profiler.processName = 'test'
+      with profile('setup root'):
+         with profile('wait for child'):
+            pass
+      events = self.profiler.traceEvents()
+      meta = [e for e in events if e['ph'] == 'M']
+      self.assertEqual(sorted(e['name'] for e in meta),
+                       ['process_name', 'thread_name'])
+      spans = [(e['ph'], e['name'], e['cat']) for e in events if e['ph'] != 'M']
+      self.assertEqual(spans, [
+         ('B', 'setup root', 'setup'),
+         ('B', 'wait for child', 'wait'),
+         ('E', 'wait for child', 'wait'),
+         ('E', 'setup root', 'setup'),
+      ])
+      timestamps = [e['ts'] for e in events if e['ph'] != 'M']
+      self.assertEqual(timestamps, sorted(timestamps))
+      self.assertEqual(self.profiler.traceEvents(pid=os.getpid() + 1), [])
+
+   def testTraceForkedProcess(self):
+      self.profiler.enable()
+      with tempfile.TemporaryDirectory() as tmpdir:
+         path = os.path.join(tmpdir, 'trace.json')
+         self.profiler.openTrace(path)
+         with profile('parent'):
+            pid = os.fork()
+            if pid == 0:
+               try:
+                  with profile('child'):
+                     pass
+                  self.profiler.writeTrace()
+               finally:
+                  os._exit(0) # pylint: disable=protected-access
+            os.waitpid(pid, 0)
+         self.profiler.writeTrace()
+         events = self._readTrace(path)
+
+      names = {(e['pid'], e['name']) for e in events if e['ph'] == 'B'}
+      self.assertEqual(names, {(os.getpid(), 'parent'), (pid, 'child')})
+
+   def testGetProfiler(self):
+      self.assertIs(getProfiler(), self.profiler)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -1,7 +1,12 @@
 
 from __future__ import absolute_import, division, print_function
 
+import threading
+import time
+
 from ...tests.testing import unittest, patch
+from ...core.component import Component, Priority
+from ...core.config import Config
 from ...core.fixed import FixedSystem
 from ...core.platform import loadPlatforms, getPlatforms
 from ...core.pci import (
@@ -36,6 +41,26 @@ class ComponentTest(unittest.TestCase):
                # python2 mock version can be outdated, it will be check by py3
                mock.assert_called_once()
 
+   def testSetupGraph(self):
+      loadPlatforms()
+      Config().component_setup_workers = 4
+      try:
+         for platformCls in getPlatforms():
+            if not issubclass(platformCls, FixedSystem):
+               continue
+            platform = platformCls()
+
+            mocks = []
+            for c in platform.iterComponents():
+               mocks.append(patch.object(c, 'setup').start())
+
+            platform.setup()
+
+            for mock in mocks:
+               mock.assert_called_once()
+      finally:
+         Config().component_setup_workers = 0
+
    def testPciAddrDuplication(self):
       pciElements = (
          DownstreamPciPort,
@@ -58,6 +83,93 @@ class ComponentTest(unittest.TestCase):
                sysfsPath = c.addr.getSysfsPath()
                self.assertNotIn(sysfsPath, sysfsSet)
                sysfsSet.add(sysfsPath)
+class RecordingComponent(Component):
+   def __init__(self, name, events, delay=0, **kwargs):
+      super(RecordingComponent, self).__init__(**kwargs)
+      self.name = name
+      self.events = events
+      self.delay = delay
+
+   def __str__(self):
+      return self.name
+
+   def setup(self):
+      self.events.append(('setup', self.name, threading.current_thread().name))
+      time.sleep(self.delay)
+
+   def finalize(self):
+      self.events.append(('finalize', self.name, None))
+
+class ComponentSetupGraphTest(unittest.TestCase):
+   def _createTree(self, delay=0):
+      events = []
+      root = RecordingComponent('root', events)
+      for i in range(4):
+         bus = root.newComponent(RecordingComponent, name='bus%d' % i,
+                                 events=events, delay=delay)
+         for j in range(2):
+            dev = bus.newComponent(RecordingComponent, name='dev%d.%d' % (i, j),
+                                   events=events, delay=delay)
+            dev.newComponent(RecordingComponent, name='sub%d.%d' % (i, j),
+                             events=events)
+      root.newComponent(RecordingComponent, name='late', events=events,
+                        priority=Priority.BACKGROUND)
+      return root, events
+
+   def _setup(self, workers, filters=Priority.defaultFilter, delay=0):
+      root, events = self._createTree(delay=delay)
+      Config().component_setup_workers = workers
+      try:
+         begin = time.time()
+         root.finish(filters)
+         return events, time.time() - begin
+      finally:
+         Config().component_setup_workers = 0
+
+   def _names(self, events, kind):
+      return [name for k, name, _ in events if k == kind]
+
+   def testSameComponents(self):
+      for filters in [Priority.defaultFilter, Priority.backgroundFilter]:
+         serial, _ = self._setup(0, filters)
+         parallel, _ = self._setup(4, filters)
+         self.assertEqual(sorted(self._names(serial, 'setup')),
+                          sorted(self._names(parallel, 'setup')))
+         self.assertEqual(sorted(self._names(serial, 'finalize')),
+                          sorted(self._names(parallel, 'finalize')))
+
+   def testDependencyOrder(self):
+      events, _ = self._setup(4)
+      order = {(kind, name): i for i, (kind, name, _) in enumerate(events)}
+      for i in range(4):
+         for j in range(2):
+            dev = 'dev%d.%d' % (i, j)
+            sub = 'sub%d.%d' % (i, j)
+            self.assertLess(order['setup', 'bus%d' % i], order['setup', dev])
+            self.assertLess(order['setup', dev], order['setup', sub])
+            self.assertLess(order['finalize', sub], order['finalize', dev])
+            self.assertLess(order['finalize', dev], order['finalize', 'bus%d' % i])
+         self.assertLess(order['finalize', 'bus%d' % i], order['finalize', 'root'])
+      self.assertEqual(events[-1][:2], ('finalize', 'root'))
+      self.assertNotIn(('setup', 'late'), order)
+
+   def testConcurrent(self):
+      events, duration = self._setup(4, delay=0.05)
+      threads = set(thread for kind, _, thread in events if kind == 'setup')
+      self.assertGreater(len(threads), 1)
+      # 3 levels of 50ms delay per chain when run concurrently, 12 serially
+      self.assertLess(duration, 0.4)
+
+   def testSetupError(self):
+      root, events = self._createTree()
+      root.components[1].setup = lambda: 1 / 0
+      Config().component_setup_workers = 4
+      try:
+         with self.assertRaises(ZeroDivisionError):
+            root.finish()
+      finally:
+         Config().component_setup_workers = 0
+      self.assertNotIn(('finalize', 'root', None), events)
 
 if __name__ == '__main__':
    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+from ...tests.testing import unittest, patch
+
+from .. import driver
+from ..driver import getKernelModules, isModuleLoaded, modprobe, modprobeAll
+from ..driver.kernel import KernelDriver
+from ..platform import getPlatformCls
+
+class KernelModulesTest(unittest.TestCase):
+   def setUp(self):
+      driver.kernelModules = None
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.path = os.path.join(self.tmpdir.name, 'modules')
+      self.writeModules(['i2c_dev', 'scd'])
+      self.calls = []
+
+   def tearDown(self):
+      driver.kernelModules = None
+      self.tmpdir.cleanup()
+
+   def writeModules(self, names):
+      with open(self.path, 'w') as f:
+         for name in names:
+            f.write('%s 16384 0 - Live 0x0000000000000000\n' % name)
+
+   def checkCall(self, args):
+      self.calls.append(args)
+      loaded = getKernelModules().modules or set()
+      self.writeModules(sorted(set(loaded) | set(a for a in args[1:]
+                                                 if not a.startswith('-'))))
+
+   def testSimulation(self):
+      self.assertFalse(isModuleLoaded('i2c-mux'))
+      modprobeAll(['i2c_mux', 'i2c-mux', 'pmbus'])
+      self.assertTrue(isModuleLoaded('i2c-mux'))
+      self.assertTrue(isModuleLoaded('pmbus'))
+
+   @patch('arista.core.driver.inSimulation', lambda: False)
+   def testProcModulesCached(self):
+      driver.kernelModules = driver.KernelModules(path=self.path)
+      with patch('arista.core.driver.subprocess.check_call', self.checkCall):
+         self.assertTrue(isModuleLoaded('i2c-dev'))
+         os.unlink(self.path)
+         # the file is not read again until a module is loaded
+         self.assertTrue(isModuleLoaded('scd'))
+         self.assertFalse(isModuleLoaded('lm75'))
+         self.writeModules(['i2c_dev', 'scd'])
+
+         modprobeAll(['scd', 'lm75', 'i2c-mux', 'i2c_mux'])
+         self.assertEqual(self.calls, [['modprobe', '-a', 'lm75', 'i2c_mux']])
+         self.assertTrue(isModuleLoaded('lm75'))
+
+         modprobeAll(['lm75', 'scd'])
+         modprobe('pmbus')
+         self.assertEqual(len(self.calls), 2)
+         self.assertTrue(isModuleLoaded('pmbus'))
+
+   def testPlatformPreload(self):
+      calls = []
+      def modprobeAllRecorder(names):
+         calls.append(list(names))
+         modprobeAll(names)
+
+      platform = getPlatformCls('DCS-7050CX3-32S')()
+      modules = set(d.module.replace('-', '_')
+                    for c in [platform] + list(platform.iterSetupComponents())
+                    for d in c.drivers.values()
+                    if isinstance(d, KernelDriver) and d.getPreloadModules())
+      with patch('arista.core.component.modprobeAll', modprobeAllRecorder), \
+           patch('arista.core.driver.kernel.modprobe') as single:
+         platform.setup()
+      self.assertEqual(len(calls), 1)
+      self.assertEqual(set(n.replace('-', '_') for n in calls[0]), modules)
+      single.assert_not_called()
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,390 @@
+
+from errno import EIO, EOPNOTSUPP, EREMOTEIO
+import os
+import shutil
+import tempfile
+import threading
+
+from ...libs.i2c import (
+   clearKernelI2cBuses,
+   getKernelI2cBuses,
+   getKernelI2cBusesGeneration,
+   i2cBusFromName,
+)
+from ...tests.testing import unittest, patch
+
+from ..driver.user.i2c import I2cDevDriver
+from ..i2c_utils import (
+   I2C_M_RD,
+   I2C_M_RECV_LEN,
+   I2cBusExecutor,
+   I2cBusPool,
+   I2cMsg,
+   getI2cBus,
+)
+from ..types import I2cAddr
+
+class FakeI2cMsg(I2cMsg):
+   '''Device whose registers read back as their address, writes are recorded'''
+   def __init__(self, addr, maxMsgs=None, failOnce=None):
+      super().__init__(addr)
+      self.maxMsgs = maxMsgs
+      self.failOnce = failOnce
+      self.ioctls = []
+      self.writes = []
+
+   def i2c_rdwr(self, data):
+      self.ioctls.append(data.nmsgs)
+      if self.failOnce is not None:
+         errno, self.failOnce = self.failOnce, None
+         raise IOError(errno, 'transfer failed')
+      if self.maxMsgs is not None and data.nmsgs > self.maxMsgs:
+         raise IOError(EOPNOTSUPP, 'too many messages')
+      reg = None
+      for i in range(data.nmsgs):
+         msg = data.msgs[i]
+         if not msg.flags & I2C_M_RD:
+            wrdata = [msg.buf[j] for j in range(msg.len)]
+            self.writes.append(wrdata)
+            reg = wrdata[0]
+         elif msg.flags & I2C_M_RECV_LEN:
+            msg.buf[0] = 3
+            for j in range(3):
+               msg.buf[1 + j] = reg + j
+            msg.len = 4
+         else:
+            for j in range(msg.len):
+               msg.buf[j] = reg + j
+
+class FakeI2cDevDriver(I2cDevDriver):
+   def __init__(self, **kwargs):
+      super().__init__(addr=I2cAddr(1, 0x50))
+      self.msg_ = FakeI2cMsg(self.addr, **kwargs)
+
+class I2cBatchTest(unittest.TestCase):
+   def testSingleIoctl(self):
+      driver = FakeI2cDevDriver()
+      batch = driver.batch()
+      byte = batch.read_byte_data(0x10)
+      batch.write_byte_data(0x20, 0x1)
+      word = batch.read_word_data(0x30)
+      block = batch.read_block_data(0x40)
+      results = batch.submit()
+      self.assertEqual(driver.msg.ioctls, [7])
+      self.assertEqual(results, [0x10, None, 0x3130, [0x40, 0x41, 0x42]])
+      self.assertEqual(byte.result, 0x10)
+      self.assertEqual(word.result, 0x3130)
+      self.assertEqual(block.result, [0x40, 0x41, 0x42])
+      self.assertEqual(driver.msg.writes, [[0x10], [0x20, 0x1], [0x30], [0x40]])
+      self.assertEqual(len(batch), 0)
+
+   def testAdapterLimit(self):
+      msg = FakeI2cMsg(I2cAddr(1, 0x50))
+      batch = msg.batch(maxMsgs=5)
+      for reg in range(6):
+         batch.read_bytes(0x50, [reg], 2)
+      results = batch.submit()
+      self.assertEqual(msg.ioctls, [4, 4, 4])
+      self.assertEqual(results, [[reg, reg + 1] for reg in range(6)])
+
+   def testFallbackWhenRejected(self):
+      driver = FakeI2cDevDriver(maxMsgs=2)
+      batch = driver.batch()
+      for reg in range(3):
+         batch.read_byte_data(reg)
+      self.assertEqual(batch.submit(), [0, 1, 2])
+      self.assertEqual(driver.msg.ioctls, [6, 2, 2, 2])
+      self.assertFalse(driver.msg.batchSupported)
+
+      batch.read_byte_data(0x10)
+      batch.read_byte_data(0x11)
+      self.assertEqual(batch.submit(), [0x10, 0x11])
+      self.assertEqual(driver.msg.ioctls[4:], [2, 2])
+
+   def testNoReplayOnTransferError(self):
+      driver = FakeI2cDevDriver(failOnce=EREMOTEIO)
+      batch = driver.batch()
+      batch.read_byte_data(0x1)
+      batch.read_byte_data(0x2)
+      with self.assertRaises(IOError) as cm:
+         batch.submit()
+      self.assertEqual(cm.exception.errno, EREMOTEIO)
+      self.assertEqual(driver.msg.ioctls, [4])
+      self.assertTrue(driver.msg.batchSupported)
+
+   def testNoReplayOnEio(self):
+      driver = FakeI2cDevDriver()
+      calls = []
+      def transfer(transfers):
+         calls.append(len(transfers))
+         raise IOError(EIO, 'device error')
+      batch = driver.batch()
+      batch.write_byte_data(0x20, 0x1)
+      batch.write_byte_data(0x21, 0x2)
+      with patch.object(driver.msg, '_transfer', transfer):
+         with self.assertRaises(IOError) as cm:
+            batch.submit()
+      self.assertEqual(cm.exception.errno, EIO)
+      self.assertEqual(calls, [2])
+
+class FakeSMBus(object):
+   instances = []
+
+   def __init__(self, bus):
+      self.bus = bus
+      self.closed = False
+      self.active = 0
+      self.maxActive = 0
+      FakeSMBus.instances.append(self)
+
+   def read_byte(self, addr):
+      self.active += 1
+      self.maxActive = max(self.maxActive, self.active)
+      self.active -= 1
+      return addr
+
+   def close(self):
+      self.closed = True
+
+@patch('arista.core.utils.SMBus', FakeSMBus)
+class I2cBusPoolTest(unittest.TestCase):
+   def setUp(self):
+      FakeSMBus.instances = []
+      self.pool = I2cBusPool(idleTimeout=5.)
+
+   def tearDown(self):
+      self.pool.close()
+
+   def testSharedHandle(self):
+      for address in [0x50, 0x51, 0x52]:
+         with self.pool.transaction(3) as bus:
+            self.assertEqual(bus.read_byte(address), address)
+      with self.pool.transaction(4) as bus:
+         bus.read_byte(0x50)
+      self.assertEqual(len(FakeSMBus.instances), 2)
+      self.assertEqual(self.pool.stats(), {
+         3: {'open': True, 'opens': 1, 'transactions': 3},
+         4: {'open': True, 'opens': 1, 'transactions': 1},
+      })
+
+   def testCloseIdle(self):
+      with self.pool.transaction(3):
+         pass
+      handle = self.pool.get(3)
+      self.pool.closeIdle(now=handle.lastUsed + 1)
+      self.assertTrue(handle.isOpen())
+      self.pool.closeIdle(now=handle.lastUsed + 10)
+      self.assertFalse(handle.isOpen())
+      self.assertTrue(FakeSMBus.instances[0].closed)
+      with self.pool.transaction(3):
+         pass
+      self.assertEqual(handle.stats()['opens'], 2)
+
+   def testSerialized(self):
+      def worker():
+         for _ in range(100):
+            with self.pool.transaction(3) as bus:
+               bus.read_byte(0x50)
+      threads = [threading.Thread(target=worker) for _ in range(4)]
+      for thread in threads:
+         thread.start()
+      for thread in threads:
+         thread.join()
+      self.assertEqual(len(FakeSMBus.instances), 1)
+      self.assertEqual(FakeSMBus.instances[0].maxActive, 1)
+      self.assertEqual(self.pool.get(3).transactions, 400)
+
+   def testDriverPing(self):
+      with patch('arista.core.driver.user.i2c.getI2cBusPool',
+                 return_value=self.pool):
+         drivers = [I2cDevDriver(addr=I2cAddr(5, 0x58 + i)) for i in range(4)]
+         for driver in drivers:
+            self.assertTrue(driver.smbusPing())
+            driver.bus.read_byte(driver.addr.address)
+      self.assertEqual(len(FakeSMBus.instances), 1)
+      self.assertEqual(self.pool.get(5).transactions, 8)
+
+   def testDriverMsg(self):
+      class FakeDevice(object):
+         def fileno(self):
+            return -1
+         def close(self):
+            pass
+      class PooledI2cMsg(FakeI2cMsg):
+         instances = []
+         def __init__(self, addr):
+            super().__init__(addr)
+            PooledI2cMsg.instances.append(self)
+         def open(self):
+            self.device = FakeDevice()
+
+      with patch('arista.core.driver.user.i2c.getI2cBusPool',
+                 return_value=self.pool), \
+           patch('arista.core.i2c_utils.I2cMsg', PooledI2cMsg):
+         drivers = [I2cDevDriver(addr=I2cAddr(5, 0x58 + i)) for i in range(2)]
+         for driver in drivers:
+            self.assertEqual(driver.read_bytes([0x10], 2), [0x10, 0x11])
+            driver.write_bytes([0x20, 0x1])
+            batch = driver.batch()
+            batch.read_byte_data(0x30)
+            batch.read_byte_data(0x40)
+            self.assertEqual(batch.submit(), [0x30, 0x40])
+            driver.smbusPing()
+            driver.close()
+      msg, = PooledI2cMsg.instances
+      self.assertEqual(msg.ioctls, [2, 1, 4] * 2)
+      self.assertEqual(len(FakeSMBus.instances), 1)
+      # the smbus and the i2c msg accesses share the bus and its lock
+      self.assertEqual(self.pool.get(5).transactions, 8)
+
+class FakeI2cDevice(object):
+   def __init__(self, bus, address):
+      self.driver = I2cDevDriver(addr=I2cAddr(bus, address))
+
+class I2cBusExecutorTest(unittest.TestCase):
+   def setUp(self):
+      self.executor = I2cBusExecutor(workers=4)
+      self.lock = threading.Lock()
+      self.active = {}
+      self.maxActive = {}
+
+   def tearDown(self):
+      self.executor.shutdown()
+
+   def _work(self, device):
+      bus = getI2cBus(device)
+      with self.lock:
+         self.active[bus] = self.active.get(bus, 0) + 1
+         self.maxActive[bus] = max(self.maxActive.get(bus, 0), self.active[bus])
+      # let other workers run
+      threading.Event().wait(0.01)
+      with self.lock:
+         self.active[bus] -= 1
+      return device.driver.addr.address
+
+   def testGetI2cBus(self):
+      device = FakeI2cDevice(3, 0x50)
+      self.assertEqual(getI2cBus(device), 3)
+      self.assertEqual(getI2cBus(device.driver.addr), 3)
+      self.assertIsNone(getI2cBus(object()))
+      self.assertIsNone(getI2cBus(None))
+
+   def testBusesInParallel(self):
+      devices = [FakeI2cDevice(bus, 0x50 + i)
+                 for i in range(4) for bus in range(4)]
+      results = self.executor.map(self._work, devices)
+      self.assertEqual(results, [d.driver.addr.address for d in devices])
+      self.assertEqual(self.maxActive, {0: 1, 1: 1, 2: 1, 3: 1})
+      self.assertEqual(len(self.executor.lanes), 4)
+
+   def testWorkersShared(self):
+      executor = I2cBusExecutor(workers=2)
+      try:
+         devices = [FakeI2cDevice(bus, 0x50) for bus in range(6)]
+         executor.map(self._work, devices)
+         self.assertEqual(len(executor.lanes), 2)
+         self.assertTrue(all(v == 1 for v in self.maxActive.values()))
+      finally:
+         executor.shutdown()
+
+   def testInline(self):
+      executor = I2cBusExecutor(workers=0)
+      threads = executor.map(lambda _: threading.current_thread(),
+                             [FakeI2cDevice(1, 0x50), object()])
+      self.assertEqual(threads, [threading.current_thread()] * 2)
+      self.assertEqual(executor.lanes, [])
+
+   def testNestedRunsInline(self):
+      def nested(device):
+         return self.executor.map(lambda d: threading.current_thread(),
+                                  [device, FakeI2cDevice(2, 0x50)])
+      threads = self.executor.map(nested, [FakeI2cDevice(1, 0x50)])[0]
+      self.assertEqual(threads[0], threads[1])
+      self.assertNotEqual(threads[0], threading.current_thread())
+
+   def testException(self):
+      def fail(device):
+         if getI2cBus(device) == 1:
+            raise IOError('nak')
+         return True
+      with self.assertRaises(IOError):
+         self.executor.map(fail, [FakeI2cDevice(0, 0x50), FakeI2cDevice(1, 0x50)])
+
+class KernelI2cBusIndexTest(unittest.TestCase):
+   def setUp(self):
+      clearKernelI2cBuses()
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.root = self.tmpdir.name
+      self.opens = 0
+      for busId, name in enumerate(['SCD master 0', 'i801', 'SCD master 0']):
+         self._addAdapter(busId, name)
+
+   def tearDown(self):
+      clearKernelI2cBuses()
+      self.tmpdir.cleanup()
+
+   def _addAdapter(self, busId, name):
+      path = os.path.join(self.root, 'i2c-%d' % busId)
+      os.mkdir(path)
+      with open(os.path.join(path, 'name'), 'w') as f:
+         f.write('%s\n' % name)
+
+   def _removeAdapter(self, busId):
+      shutil.rmtree(os.path.join(self.root, 'i2c-%d' % busId))
+
+   def _lookup(self, name, idx=0, force=False):
+      realOpen = open
+      def countingOpen(*args, **kwargs):
+         self.opens += 1
+         return realOpen(*args, **kwargs)
+      with patch('builtins.open', countingOpen):
+         return i2cBusFromName(name, idx=idx, force=force, root=self.root)
+
+   def testIndex(self):
+      self.assertEqual(self._lookup('SCD master 0'), 0)
+      self.assertEqual(self._lookup('SCD master 0', idx=1), 2)
+      self.assertIsNone(self._lookup('SCD master 0', idx=2))
+      self.assertEqual(self._lookup('i801'), 1)
+      self.assertEqual(list(getKernelI2cBuses(root=self.root)), [0, 1, 2])
+      # the names are read once, a hit reads back its own name and a miss
+      # rescans the adapter list only
+      self.assertEqual(self.opens, 5)
+
+   def testForceReadsNewAdaptersOnly(self):
+      self._lookup('i801')
+      generation = getKernelI2cBusesGeneration()
+      self._lookup('i801', force=True)
+      self.assertEqual(self.opens, 3)
+      self.assertEqual(getKernelI2cBusesGeneration(), generation)
+
+      self._removeAdapter(0)
+      self._addAdapter(10, 'SCD master 1')
+      self.assertEqual(self._lookup('SCD master 0', force=True), 2)
+      self.assertEqual(self.opens, 4)
+      self.assertGreater(getKernelI2cBusesGeneration(), generation)
+
+   def testNewAdapterOnMiss(self):
+      self._lookup('i801')
+      self._addAdapter(3, 'SCD master 1')
+      self.assertEqual(self._lookup('SCD master 1'), 3)
+      self.assertEqual(self.opens, 4)
+
+   def testStaleHit(self):
+      self.assertEqual(self._lookup('i801'), 1)
+      generation = getKernelI2cBusesGeneration()
+      self._removeAdapter(1)
+      self._addAdapter(5, 'i801')
+      self.assertEqual(self._lookup('i801'), 5)
+      self.assertGreater(getKernelI2cBusesGeneration(), generation)
+
+   def testRecreatedAdapter(self):
+      self._lookup('i801')
+      self._removeAdapter(1)
+      # let another entry pick up the inode freed by the removed adapter
+      os.mkdir(os.path.join(self.root, 'placeholder'))
+      self._addAdapter(1, 'SCD master 2')
+      self.assertEqual(self._lookup('SCD master 2', force=True), 1)
+      self.assertIsNone(self._lookup('i801', force=True))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,89 @@
+
+from ...tests.testing import unittest, patch
+
+from ..log import (
+   DEBUG,
+   INFO,
+   IO,
+   LoggerManager,
+   lazy,
+   parseVerbosity,
+)
+
+class RecordingLoggerManager(LoggerManager):
+   def __init__(self):
+      super(RecordingLoggerManager, self).__init__()
+      self.records = []
+
+   def log(self, record):
+      self.records.append(record)
+      super(RecordingLoggerManager, self).log(record)
+
+class LoggerLevelTest(unittest.TestCase):
+   def setUp(self):
+      self.manager = RecordingLoggerManager()
+
+   def _addCliSink(self, verbosity=None, default=INFO):
+      # disable printing by making the sink write a noop
+      self.manager.initCliLogging(parseVerbosity(verbosity), default=default)
+      self.manager.sinks[-1].write = lambda line, record: None
+
+   def testNoSink(self):
+      logger = self.manager.newLogger('test')
+      self.assertEqual(logger.level, -1)
+      logger.error('dropped')
+      self.assertEqual(self.manager.records, [])
+
+   def testDefaultLevel(self):
+      logger = self.manager.newLogger('test')
+      self._addCliSink()
+      self.assertEqual(logger.level, INFO)
+      logger.io('dropped')
+      logger.debug('dropped')
+      logger.info('kept')
+      self.assertEqual([r.msg for r in self.manager.records], ['kept'])
+
+   def testVerbosityPattern(self):
+      self._addCliSink(verbosity='core.foo/IO')
+      foo = self.manager.newLogger('arista.core.foo')
+      bar = self.manager.newLogger('arista.core.bar')
+      self.assertTrue(foo.isEnabledFor(IO))
+      self.assertFalse(bar.isEnabledFor(DEBUG))
+
+   def testHighestSinkLevel(self):
+      logger = self.manager.newLogger('test')
+      self._addCliSink()
+      self.manager.initSyslogLogging({}, default=IO)
+      # IO messages are never sent to syslog
+      self.assertEqual(logger.level, DEBUG)
+
+   def testLazyArg(self):
+      calls = []
+      def render():
+         calls.append(1)
+         return 'rendered'
+      logger = self.manager.newLogger('test')
+      self._addCliSink()
+      logger.io('%s', lazy(render))
+      self.assertEqual(calls, [])
+      logger.info('%s', lazy(render))
+      self.assertEqual(self.manager.records[0].data, 'rendered')
+      self.assertEqual(calls, [1])
+
+   def testDisabledLevelsSkipRecord(self):
+      calls = []
+      def render():
+         calls.append(1)
+         return 'rendered'
+      logger = self.manager.newLogger('test')
+      self._addCliSink()
+      with patch('arista.core.log.LogRecord') as record:
+         logger.io('%s', lazy(render))
+         logger.debug('%s', lazy(render))
+         logger.log(IO, '%s', lazy(render))
+         record.assert_not_called()
+      self.assertEqual(calls, [])
+      self.assertEqual(self.manager.records, [])
+
+if __name__ == '__main__':
+   unittest.main()
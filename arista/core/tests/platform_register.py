@@ -3,10 +3,15 @@
 
 from __future__ import absolute_import, division, print_function
 
+from ...libs.benchmark import importCost
+from ...platforms import registry
 from ...tests.testing import unittest
 
 from .. import platform
 from ..fixed import FixedSystem
+from ..log import getLogger
+
+logging = getLogger(__name__)
 
 class UniqueKeyDict(dict):
    def __setitem__(self, key, value):
@@ -45,5 +50,30 @@ class RegisterTest(unittest.TestCase):
             continue
          cls()
 
+   def testRegistryUpToDate(self):
+      expected = platform.manager.buildRegistry()
+      self.assertEqual(registry.PLATFORM_SIDS, expected['PLATFORM_SIDS'])
+      self.assertEqual(registry.PLATFORM_SKUS, expected['PLATFORM_SKUS'],
+                       'arista/platforms/registry.py needs to be regenerated')
+
+   def testRegistryLookup(self):
+      platform.loadPlatforms()
+      for sid, module in registry.PLATFORM_SIDS.items():
+         cls = platform.getPlatformCls(sid)
+         self.assertEqual(cls.__module__, 'arista.platforms.%s' % module)
+      for sku, module in registry.PLATFORM_SKUS.items():
+         cls = platform.getPlatformCls(sku)
+         self.assertEqual(cls.__module__, 'arista.platforms.%s' % module)
+
+   def testRegistryImportCost(self):
+      setup = 'from arista.core.platform import getPlatformCls, loadPlatforms'
+      full, fullModules = importCost('loadPlatforms()', setup=setup)
+      lazy, lazyModules = importCost('getPlatformCls("DCS-7050CX3-32S")',
+                                     setup=setup)
+      logging.info('platforms import: all %.2fms (%d modules), '
+                   'registry %.2fms (%d modules)',
+                   full * 1000, fullModules, lazy * 1000, lazyModules)
+      self.assertLess(lazyModules, fullModules)
+
 if __name__ == '__main__':
    unittest.main()
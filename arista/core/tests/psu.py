@@ -1,4 +1,6 @@
 
+import tempfile
+
 from ...tests.testing import unittest, patch
 
 from ...descs.fan import FanDesc, FanPosition
@@ -7,9 +9,10 @@ from ...descs.rail import RailDesc, RailDirection
 from ...descs.sensor import Position, SensorDesc
 
 from ..component import Component, Priority
+from ..config import Config
 from ..cooling import Airflow
 from ..fixed import FixedSystem
-from ..psu import PsuSlot, PsuModel, PsuIdent
+from ..psu import PsuSlot, PsuModel, PsuIdent, getPsuManager
 from ..utils import incrange
 
 from .mockinv import (
@@ -68,10 +71,15 @@ class PsuModel3(MockPsuModel):
    ]
 
 class MockPmbusDetect(object):
-   def __init__(self, mockData):
+   created = 0
+   validated = 0
+
+   def __init__(self, mockData, prepare=True):
+      MockPmbusDetect.created += 1
       if isinstance(mockData, int):
          mockData = { 'id': 'unknown', 'model': 'unknown' }
       self.mockData = mockData
+      self.prepared = prepare
 
    def id(self):
       return self.mockData['id']
@@ -79,6 +87,14 @@ class MockPmbusDetect(object):
    def model(self):
       return self.mockData['model']
 
+   def serial(self):
+      return self.mockData.get('serial')
+
+   def readSerial(self):
+      assert not self.prepared
+      MockPmbusDetect.validated += 1
+      return self.mockData['serial']
+
    def getMetadata(self):
       return self.mockData
 
@@ -142,5 +158,84 @@ class TestPsu(unittest.TestCase):
       self._checkSystem(system)
       self._checkPsu(system, 0, PsuModel2)
 
+@patch('arista.core.psu.inSimulation', lambda: False)
+@patch('arista.core.psu.PsuPmbusDetect', MockPmbusDetect)
+class TestPsuIdentityCache(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.tmpfsPath = Config().tmpfs_path
+      Config().tmpfs_path = self.tmpdir.name
+      MockPmbusDetect.created = 0
+      MockPmbusDetect.validated = 0
+      # models restored from the cache are looked up in the manager
+      self.models = getPsuManager().psuModels
+      self.models.extend([PsuModel1, PsuModel2])
+
+   def tearDown(self):
+      self.models.remove(PsuModel1)
+      self.models.remove(PsuModel2)
+      Config().tmpfs_path = self.tmpfsPath
+      self.tmpdir.cleanup()
+
+   def _setupSystem(self, present=1, model='MODEL2-0', serial='S0'):
+      def psuFunc(_):
+         return { 'id': 'VENDOR1', 'model': model, 'serial': serial }
+      system = MockFixedSystem([PsuModel1, PsuModel2], numPsus=1,
+                               psuFunc=psuFunc)
+      system.slots[0].presentGpio.value = present
+      system.setup(filters=Priority.backgroundFilter)
+      return system
+
+   def testCachedAcrossInstances(self):
+      self._setupSystem()
+      created = MockPmbusDetect.created
+      self.assertGreater(created, 1)
+      system = self._setupSystem()
+      # a single serial read validates the cached identity
+      self.assertEqual(MockPmbusDetect.created, created + 1)
+      self.assertEqual(MockPmbusDetect.validated, 1)
+      self.assertIsInstance(system.slots[0].model, PsuModel2)
+      self.assertEqual(system.slots[0].model.identifier.aristaName, 'SKU2-F')
+
+   def testReseatInvalidates(self):
+      system = self._setupSystem()
+      created = MockPmbusDetect.created
+      slot = system.slots[0]
+      generation = slot.getPresenceGeneration()
+      slot.presentGpio.value = 0
+      self.assertFalse(slot.getPresence())
+      slot.presentGpio.value = 1
+      self.assertTrue(slot.getPresence())
+      self.assertEqual(slot.getPresenceGeneration(), generation + 1)
+      self.assertIsNone(slot.getCache())
+
+      self._setupSystem()
+      self.assertEqual(MockPmbusDetect.created, 2 * created)
+
+   def testSwapWhileUnwatched(self):
+      self._setupSystem()
+      created = MockPmbusDetect.created
+      system = self._setupSystem(model='MODEL1-0', serial='S1')
+      self.assertGreater(MockPmbusDetect.created, created + 1)
+      self.assertIsInstance(system.slots[0].model, PsuModel1)
+      self.assertEqual(system.slots[0].model.identifier.metadata['serial'], 'S1')
+
+   def testUnknownSerialNotCached(self):
+      self._setupSystem(serial='N/A')
+      created = MockPmbusDetect.created
+      self._setupSystem(serial='N/A')
+      self.assertEqual(MockPmbusDetect.created, 2 * created)
+      self.assertEqual(MockPmbusDetect.validated, 0)
+
+   def testDisabled(self):
+      self._setupSystem()
+      created = MockPmbusDetect.created
+      Config().psu_identity_cache = False
+      try:
+         self._setupSystem()
+      finally:
+         Config().psu_identity_cache = True
+      self.assertEqual(MockPmbusDetect.created, 2 * created)
+
 if __name__ == '__main__':
    unittest.main()
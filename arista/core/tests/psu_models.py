@@ -2,7 +2,9 @@
 from ..log import getLogger
 from ..psu import PsuIdent, getPsuManager
 
+from ...components.psu import index
 from ...descs.psu import PsuDesc
+from ...libs.benchmark import importCost
 
 from ...tests.testing import unittest
 
@@ -45,5 +47,37 @@ class PsuModelTest(unittest.TestCase):
       for model in models:
          self._testPsuModel(model)
 
+   def testIndexUpToDate(self):
+      manager = getPsuManager()
+      names = set(model.__name__ for model in manager.psuModels)
+      self.assertEqual(len(names), len(set(manager.psuModels)),
+                       'psu model class names must be unique')
+      expected = manager.buildIndex()
+      self.assertEqual(index.PSU_MODELS, expected['PSU_MODELS'])
+      self.assertEqual(index.PSU_PMBUS_ADDRS, expected['PSU_PMBUS_ADDRS'])
+      self.assertEqual(index.PSU_PMBUS_MODELS, expected['PSU_PMBUS_MODELS'],
+                       'arista/components/psu/index.py needs to be regenerated')
+
+   def testLookup(self):
+      manager = getPsuManager()
+      for vendor in ['ARTESYN', 'emerson ']:
+         models = manager.lookupPmbusModels(vendor, 'DS460S-3 ', 0x58)
+         self.assertEqual([m.__name__ for m in models], ['DS460'])
+      self.assertEqual(manager.lookupPmbusModels('artesyn', 'DS460S-3', 0x40), [])
+      self.assertEqual(manager.lookupPmbusModels('unknown', 'DS460S-3', 0x58), [])
+      psu = manager.psuForIdentifier('DS460', PsuIdent('DS460S-3'))
+      self.assertEqual(psu.__class__.__name__, 'DS460')
+
+   def testIndexImportCost(self):
+      setup = 'from arista.core.psu import getPsuManager'
+      full, fullModules = importCost('getPsuManager().psuModels', setup=setup)
+      lazy, lazyModules = importCost(
+         'getPsuManager().lookupPmbusModels("delta", "DPS-495CB A", 0x58)',
+         setup=setup)
+      logging.info('psu models import: all %.2fms (%d modules), '
+                   'indexed %.2fms (%d modules)',
+                   full * 1000, fullModules, lazy * 1000, lazyModules)
+      self.assertLess(lazyModules, fullModules)
+
 if __name__ == '__main__':
    unittest.main()
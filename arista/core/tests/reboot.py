@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+
+from ...tests.testing import mock, unittest
+
+from ...drivers.plx import PlxPex8700I2cDevDriver
+from ...utils.rpc.api import RpcLinecardApi
+from ...utils.rpc.server import RpcServer
+from ..config import Config
+from ..reboot import LinecardRebootManager
+from ..types import I2cAddr
+
+class MockLinecard(object):
+   def __init__(self, slotId, tracker=None, fail=False, delay=0.05):
+      self.slotId = slotId
+      self.tracker = tracker
+      self.fail = fail
+      self.delay = delay
+      self.lcpuCtx = None
+
+   def __str__(self):
+      return 'MockLinecard(%d)' % self.slotId
+
+   def getSlotId(self):
+      return self.slotId
+
+   def getPresence(self):
+      return True
+
+   def hasCpuModule(self):
+      return True
+
+   def powerOnIs(self, on, lcpuCtx=None):
+      assert on
+      self.lcpuCtx = lcpuCtx
+      with self.tracker:
+         time.sleep(self.delay)
+         if self.fail:
+            raise RuntimeError('failed to power on')
+
+class ConcurrencyTracker(object):
+   def __init__(self):
+      self.lock = threading.Lock()
+      self.current = 0
+      self.peak = 0
+
+   def __enter__(self):
+      with self.lock:
+         self.current += 1
+         self.peak = max(self.peak, self.current)
+
+   def __exit__(self, *args):
+      with self.lock:
+         self.current -= 1
+
+class FakePlxRegisters(object):
+   '''Port disable register of a PLX whose i2c accesses take some time'''
+   def __init__(self):
+      self.value = 0
+
+   def portDisable(self, value=None):
+      current = self.value
+      time.sleep(0.01)
+      if value is None:
+         return current
+      self.value = value
+      return None
+
+class PlxLinecard(MockLinecard):
+   def __init__(self, slotId, plx):
+      super(PlxLinecard, self).__init__(slotId, ConcurrencyTracker())
+      self.plx = plx
+      self.errors = []
+
+   def powerOnIs(self, on, lcpuCtx=None):
+      self.plx.disablePort(self.slotId)
+      for _ in range(3):
+         time.sleep(0.01)
+         if not self.plx.regs.value & (1 << self.slotId):
+            self.errors.append('port %d enabled early' % self.slotId)
+      self.plx.enablePort(self.slotId)
+
+class LinecardPowerOnTest(unittest.TestCase):
+   def setUp(self):
+      self.tracker = ConcurrencyTracker()
+      self.loop = asyncio.new_event_loop()
+      asyncio.set_event_loop(self.loop)
+
+   def tearDown(self):
+      Config().linecard_power_on_budget = 4
+      asyncio.set_event_loop(None)
+      self.loop.close()
+
+   def powerOn(self, linecards):
+      manager = LinecardRebootManager(None, linecards=linecards)
+      return manager.powerOnLinecards()
+
+   def testBudget(self):
+      Config().linecard_power_on_budget = 3
+      linecards = [MockLinecard(i, self.tracker) for i in range(8)]
+      begin = time.monotonic()
+      results = self.powerOn(linecards)
+      self.assertLess(time.monotonic() - begin, 8 * 0.05)
+      self.assertEqual(self.tracker.peak, 3)
+      self.assertEqual(list(results), linecards)
+      for error, duration in results.values():
+         self.assertIsNone(error)
+         self.assertGreaterEqual(duration, 0.05)
+      self.assertIsNotNone(linecards[0].lcpuCtx)
+      self.assertEqual(len(set(id(lc.lcpuCtx) for lc in linecards)), 1)
+
+   def testSerial(self):
+      Config().linecard_power_on_budget = 1
+      self.powerOn([MockLinecard(i, self.tracker) for i in range(3)])
+      self.assertEqual(self.tracker.peak, 1)
+
+   def testSharedPlxPorts(self):
+      plx = PlxPex8700I2cDevDriver(addr=I2cAddr(1, 0x38))
+      plx.regs = FakePlxRegisters()
+      linecards = [PlxLinecard(i, plx) for i in range(3, 7)]
+      results = self.powerOn(linecards)
+      for error, _ in results.values():
+         self.assertIsNone(error)
+      for linecard in linecards:
+         self.assertEqual(linecard.errors, [])
+      self.assertEqual(plx.regs.value, 0)
+
+   def testFailureDoesNotBlock(self):
+      failing = MockLinecard(0, self.tracker, fail=True, delay=0)
+      slow = MockLinecard(1, self.tracker, delay=0.1)
+      results = self.powerOn([failing, slow])
+      self.assertIsInstance(results[failing][0], RuntimeError)
+      self.assertIsNone(results[slow][0])
+      self.assertGreaterEqual(results[slow][1], 0.1)
+
+class LinecardSoftRebootTest(unittest.TestCase):
+   def setUp(self):
+      self.loop = asyncio.new_event_loop()
+      asyncio.set_event_loop(self.loop)
+      self.server = RpcServer(['127.0.0.1'], 0, RpcLinecardApi())
+      self.connections = 0
+      self.listener = self.loop.run_until_complete(asyncio.start_server(
+         self._handleConnection, '127.0.0.1', 0))
+      self.saved = (Config().api_rpc_lcx, Config().api_rpc_port)
+      Config().api_rpc_lcx = '127.0.0.1'
+      Config().api_rpc_port = self.listener.sockets[0].getsockname()[1]
+
+   def tearDown(self):
+      Config().api_rpc_lcx, Config().api_rpc_port = self.saved
+      self.listener.close()
+      self.loop.run_until_complete(self.listener.wait_closed())
+      asyncio.set_event_loop(None)
+      self.loop.close()
+
+   async def _handleConnection(self, reader, writer):
+      self.connections += 1
+      await self.server.handleConnection(reader, writer)
+
+   def testConcurrentGracefulShutdown(self):
+      calls = []
+      async def gracefulShutdown(ctx):
+         calls.append(ctx)
+         await asyncio.sleep(0.1)
+         return {'status': True, 'detail': 'Reboot started'}
+
+      linecards = [MockLinecard(i) for i in range(8)]
+      manager = LinecardRebootManager(None, linecards=linecards)
+      with mock.patch.object(self.server.api, 'gracefulShutdown',
+                             gracefulShutdown):
+         begin = time.monotonic()
+         manager.rebootLinecards(mode='soft')
+      self.assertLess(time.monotonic() - begin, 8 * 0.1)
+      self.assertEqual(len(calls), 8)
+      self.assertEqual(self.connections, 8)
+      self.assertEqual(manager.clients, {})
+
+if __name__ == '__main__':
+   unittest.main()
@@ -250,6 +250,99 @@ class CoreRegisterTest(unittest.TestCase):
       with self.assertRaises(ValueError):
          self.regs.regArray([1, 2])
 
+class CountingDriver(FakeDriver):
+   def __init__(self):
+      super(CountingDriver, self).__init__()
+      self.reads = []
+      self.writes = []
+
+   def read(self, reg):
+      self.reads.append(reg)
+      return super(CountingDriver, self).read(reg)
+
+   def write(self, reg, value):
+      self.writes.append((reg, value))
+      return super(CountingDriver, self).write(reg, value)
+
+class RangeDriver(CountingDriver):
+   def __init__(self):
+      super(RangeDriver, self).__init__()
+      self.ranges = []
+
+   def readRange(self, reg, count):
+      self.ranges.append((reg, count))
+      return [self.regmap[reg + i] for i in range(count)]
+
+class SnapshotRegisterTest(unittest.TestCase):
+   def setUp(self):
+      self.driver = CountingDriver()
+      self.regs = FakeRegisterMap(self.driver)
+
+   def testSnapshotReadsOnce(self):
+      with self.regs.snapshot():
+         self.assertEqual(self.regs.shouldBeZero(), 0)
+         self.assertEqual(self.regs.shouldBeOne(), 1)
+         self.assertEqual(self.regs.invertZero(), 1)
+         self.assertEqual(self.regs.invertOne(), 0)
+      self.assertEqual(self.driver.reads, [0x03])
+      self.regs.shouldBeOne()
+      self.assertEqual(self.driver.reads, [0x03, 0x03])
+
+   def testSnapshotWriteInvalidates(self):
+      with self.regs.snapshot():
+         self.assertEqual(self.regs.scratchpad(), 0)
+         self.regs.scratchpad(0xff)
+         self.assertEqual(self.regs.scratchpad(), 0xff)
+         self.assertEqual(self.regs.bit3(), 1)
+      self.assertEqual(self.driver.reads, [0x05, 0x05])
+
+   def testSnapshotPrefetch(self):
+      driver = RangeDriver()
+      regs = FakeRegisterMap(driver)
+      with regs.snapshot(prefetch=[0x10, 0x11, 0x12, 0x13, 0x01]):
+         self.assertEqual(regs.regArray(), [0, 0, 0, 0])
+         self.assertEqual(regs.revision(), 42)
+      self.assertEqual(driver.ranges, [(0x10, 4)])
+      self.assertEqual(driver.reads, [0x01])
+
+   def testSnapshotClearOnRead(self):
+      addr = self.regs.CLEAR_ON_READ.addr
+      self.driver.regmap[addr] = 0x1
+      with self.regs.snapshot():
+         self.assertEqual(self.regs.clear0(), 1)
+         self.assertEqual(self.regs.clear1(), 0)
+      self.assertEqual(self.regs.clear0(), 0)
+
+   def testTransactionCoalescesWrites(self):
+      with self.regs.transaction():
+         self.regs.writeOk(1)
+         self.regs.range03(0b1010)
+         self.regs.range56(0b00)
+         self.assertEqual(self.regs.writeOk(), 1)
+         self.assertEqual(self.regs.range03(), 0b1010)
+         self.assertEqual(self.driver.writes, [])
+      self.assertEqual(self.driver.reads, [0x02, 0x09])
+      self.assertEqual(self.driver.writes, [(0x02, 0x1), (0x09, 0b1101010)])
+      self.assertEqual(self.regs.range56(), 0b00)
+      self.assertEqual(self.regs.range03(), 0b1010)
+
+   def testTransactionSetClear(self):
+      with self.regs.transaction():
+         self.regs.writeOk(1)
+         self.regs.interrupt0(1)
+         self.regs.interrupt1(1)
+      self.assertEqual(self.driver.writes,
+                       [(0x02, 0x1), (0x07, 0x1), (0x07, 0x2)])
+      self.assertEqual(self.driver.regmap[0x07], 0x3)
+
+   def testNestedTransaction(self):
+      with self.regs.transaction():
+         self.regs.writeOk(1)
+         with self.regs.transaction():
+            self.regs.bit3(1)
+         self.assertEqual(self.driver.writes, [])
+      self.assertEqual(self.driver.writes, [(0x02, 0x1), (0x05, 0x8)])
+
 class OverrideRegisterTest(unittest.TestCase):
    def testShadowRegister(self):
       driver = FakeDriver()
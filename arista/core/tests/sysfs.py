@@ -0,0 +1,163 @@
+
+import os
+import tempfile
+import threading
+
+from ...tests.testing import unittest
+
+from ..driver.kernel.sysfs import HwmonSnapshot, SysfsFdCache
+
+class SysfsFdCacheTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.cache = SysfsFdCache(maxFds=2)
+
+   def tearDown(self):
+      self.cache.clear()
+      self.tmpdir.cleanup()
+
+   def _createEntry(self, name, value):
+      path = os.path.join(self.tmpdir.name, name)
+      with open(path, 'w') as f:
+         f.write(value)
+      return path
+
+   def testReadFreshValue(self):
+      path = self._createEntry('temp1_input', '42000\n')
+      self.assertEqual(self.cache.read(path), '42000\n')
+      with open(path, 'w') as f:
+         f.write('43000\n')
+      self.assertEqual(self.cache.read(path), '43000\n')
+      self.assertEqual(len(self.cache), 1)
+      self.assertEqual(self.cache.hits, 1)
+      self.assertEqual(self.cache.misses, 1)
+      self.assertEqual(self.cache.syscallsSaved, 2)
+
+   def testWrite(self):
+      path = self._createEntry('pwm1', '0')
+      self.cache.write(path, '128')
+      self.cache.write(path, '255')
+      with open(path) as f:
+         self.assertEqual(f.read(), '255')
+      self.assertEqual(self.cache.syscallsSaved, 2)
+
+   def testContains(self):
+      path = self._createEntry('fan1_input', '1000')
+      self.assertFalse(self.cache.contains(path))
+      self.cache.read(path)
+      self.assertTrue(self.cache.contains(path))
+
+   def testExistsAfterRemoval(self):
+      path = self._createEntry('fan2_input', '1000')
+      self.cache.read(path)
+      self.assertTrue(self.cache.exists(path))
+      os.unlink(path)
+      # the cached descriptor is still valid but the attribute is gone
+      self.assertFalse(self.cache.exists(path))
+      self.assertFalse(self.cache.contains(path))
+
+   def testLruEviction(self):
+      paths = [self._createEntry('in%d_input' % i, str(i)) for i in range(3)]
+      self.cache.read(paths[0])
+      self.cache.read(paths[1])
+      self.cache.read(paths[0])
+      self.cache.read(paths[2])
+      self.assertEqual(len(self.cache), 2)
+      self.assertEqual(self.cache.evictions, 1)
+      self.assertTrue(self.cache.contains(paths[0]))
+      self.assertFalse(self.cache.contains(paths[1]))
+      self.assertTrue(self.cache.contains(paths[2]))
+
+   def testEvictionWhileInUse(self):
+      path = self._createEntry('temp2_input', '1')
+      cached = self.cache.acquire(path, os.O_RDONLY)
+      self.cache.invalidate(path)
+      self.assertEqual(os.pread(cached.fd, 16, 0), b'1')
+      self.cache.release(cached)
+      with self.assertRaises(OSError):
+         os.fstat(cached.fd)
+
+   def testInvalidatePrefix(self):
+      hwmon = os.path.join(self.tmpdir.name, 'hwmon1')
+      os.mkdir(hwmon)
+      inside = os.path.join(hwmon, 'temp1_input')
+      with open(inside, 'w') as f:
+         f.write('1')
+      outside = self._createEntry('hwmon10', '2')
+      self.cache.read(inside)
+      self.cache.read(outside)
+      self.cache.invalidatePrefix(hwmon)
+      self.assertFalse(self.cache.contains(inside))
+      self.assertTrue(self.cache.contains(outside))
+
+   def testReadMissing(self):
+      with self.assertRaises(OSError):
+         self.cache.read(os.path.join(self.tmpdir.name, 'missing'))
+      self.assertEqual(len(self.cache), 0)
+
+class HwmonSnapshotTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.path = self.tmpdir.name
+      self._writeAttr('temp1_input', '42000\n')
+      self._writeAttr('temp1_max', '90000\n')
+      self.snapshot = HwmonSnapshot(self.path, ttl=3600)
+
+   def tearDown(self):
+      self.tmpdir.cleanup()
+
+   def _writeAttr(self, name, value):
+      with open(os.path.join(self.path, name), 'w') as f:
+         f.write(value)
+
+   def testExists(self):
+      self.assertTrue(self.snapshot.exists('temp1_input'))
+      self.assertFalse(self.snapshot.exists('temp1_crit'))
+      self.assertEqual(self.snapshot.refreshCount, 1)
+
+   def testServedFromMemory(self):
+      self.assertEqual(self.snapshot.read('temp1_input'), '42000\n')
+      self._writeAttr('temp1_input', '43000\n')
+      self.assertEqual(self.snapshot.read('temp1_input'), '42000\n')
+      self.assertIsNone(self.snapshot.read('temp1_crit'))
+      self.assertEqual(self.snapshot.refreshCount, 1)
+
+   def testRefreshReadsKnownAttributes(self):
+      self.snapshot.read('temp1_input')
+      self.snapshot.read('temp1_max')
+      self._writeAttr('temp1_input', '43000\n')
+      self._writeAttr('temp1_max', '95000\n')
+      self.snapshot.invalidate()
+      self.assertEqual(self.snapshot.read('temp1_input'), '43000\n')
+      self.assertEqual(self.snapshot.values['temp1_max'], '95000\n')
+      self.assertEqual(self.snapshot.refreshCount, 2)
+
+   def testInvalidateAttribute(self):
+      self.snapshot.read('temp1_max')
+      self._writeAttr('temp1_max', '95000\n')
+      self.snapshot.invalidate('temp1_max')
+      self.assertEqual(self.snapshot.read('temp1_max'), '95000\n')
+      self.assertEqual(self.snapshot.refreshCount, 1)
+
+   def testExpired(self):
+      snapshot = HwmonSnapshot(self.path, ttl=0)
+      snapshot.read('temp1_input')
+      snapshot.read('temp1_input')
+      self.assertEqual(snapshot.refreshCount, 2)
+
+   def testConcurrentRefresh(self):
+      threads = [threading.Thread(target=self.snapshot.read, args=('temp1_input',))
+                 for _ in range(8)]
+      for thread in threads:
+         thread.start()
+      for thread in threads:
+         thread.join()
+      self.assertEqual(self.snapshot.refreshCount, 1)
+
+   def testMissingDirectory(self):
+      snapshot = HwmonSnapshot(os.path.join(self.path, 'hwmonX'), ttl=3600)
+      self.assertFalse(snapshot.exists('temp1_input'))
+      self.assertIsNone(snapshot.read('temp1_input'))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -6,7 +6,12 @@ from struct import pack, unpack
 
 from ...tests.testing import unittest
 
-from ..utils import FileResource, MmapResource, ResourceAccessor
+from ..utils import (
+   FileResource,
+   MmapResource,
+   ResourceAccessor,
+   SharedMmapResource,
+)
 
 class ResourceTestBase(object):
    class TestClass(unittest.TestCase):
@@ -119,5 +124,44 @@ class FileResourceTest(ResourceTestBase.TestClass):
 class MmapResourceTest(ResourceTestBase.TestClass):
    CLASS_TO_TEST = MmapResource
 
+class SharedMmapResourceTest(ResourceTestBase.TestClass):
+   CLASS_TO_TEST = SharedMmapResource
+
+   def testMappingReused(self):
+      res = self.CLASS_TO_TEST(self.tempFile.name)
+      for _ in range(3):
+         with res as mm:
+            self._testRead(0, 4, mm.read32)
+      self.assertEqual(res.mapCount, 1)
+      self.assertEqual(res.useCount, 3)
+      self.assertEqual(res.refs_, 0)
+      res.unmap()
+
+   def testRemapWhenResourceChanged(self):
+      res = self.CLASS_TO_TEST(self.tempFile.name)
+      with res as mm:
+         self._testRead(0, 4, mm.read32)
+      # simulate a PCI rescan recreating the resource file
+      newData = b'abcdefg7654321'
+      with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(self.tempFile.name), delete=False) as f:
+         f.write(newData)
+      os.rename(f.name, self.tempFile.name)
+      with res as mm:
+         self.assertEqual(pack('<L', mm.read32(0)), newData[:4])
+      self.assertEqual(res.mapCount, 2)
+      res.unmap()
+
+   def testInvalidate(self):
+      res = self.CLASS_TO_TEST(self.tempFile.name)
+      with res as mm:
+         res.invalidate()
+         # mapping stays usable while referenced
+         self._testRead(0, 4, mm.read32)
+      with res as mm:
+         self._testRead(0, 4, mm.read32)
+      self.assertEqual(res.mapCount, 2)
+      res.unmap()
+
 if __name__ == '__main__':
    unittest.main()
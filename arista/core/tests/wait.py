@@ -0,0 +1,58 @@
+import os
+import tempfile
+import threading
+import time
+
+from ...tests.testing import unittest
+
+from ...libs.wait import TimeoutError, waitForPath, waitPath
+from ..utils import FileWaiter
+
+class PathWaitTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.TemporaryDirectory()
+      self.path = os.path.join(self.tmpdir.name, 'a', 'b', 'file')
+
+   def tearDown(self):
+      self.tmpdir.cleanup()
+
+   def createLater(self, delay=0.05):
+      def create():
+         time.sleep(delay)
+         os.makedirs(os.path.dirname(self.path))
+         with open(self.path, 'w'):
+            pass
+      thread = threading.Thread(target=create)
+      thread.start()
+      return thread
+
+   def testWaitPath(self):
+      thread = self.createLater()
+      self.assertTrue(waitPath(self.path, 5, delay=0.01))
+      thread.join()
+      self.assertFalse(waitPath(self.path + '.missing', 0.05, delay=0.01))
+
+   def testWaitPathExisting(self):
+      os.makedirs(os.path.dirname(self.path))
+      with open(self.path, 'w'):
+         pass
+      begin = time.monotonic()
+      # an existing path is reported without sleeping first
+      self.assertTrue(waitPath(self.path, 5, delay=1))
+      self.assertLess(time.monotonic() - begin, 1)
+
+   def testWaitForPath(self):
+      with self.assertRaises(TimeoutError):
+         waitForPath(self.path, timeout=0.05, interval=10)
+      thread = self.createLater()
+      self.assertTrue(waitForPath(self.path, timeout=5, interval=10))
+      thread.join()
+
+   def testFileWaiter(self):
+      thread = self.createLater()
+      self.assertTrue(FileWaiter(self.path, 5).waitFileReady())
+      thread.join()
+      self.assertFalse(FileWaiter(self.path + '.missing', 0.05).waitFileReady())
+
+if __name__ == '__main__':
+   unittest.main()
@@ -9,6 +9,8 @@ from ..xcvr import (
    QsfpSlot,
    SfpSlot,
    EthernetSlot,
+   getXcvrPresenceBitmap,
+   setXcvrControls,
 )
 
 from .mockinv import (
@@ -141,5 +143,47 @@ class MockXcvrTest(unittest.TestCase):
       )
       self._checkSystem(system)
 
+class XcvrPresenceBitmapTest(unittest.TestCase):
+   def setUp(self):
+      self.system = MockFixedSystem(
+         PortLayout(
+            (Sfp(i) for i in incrange(1, 4)),
+            (Qsfp28(i) for i in incrange(5, 8)),
+         )
+      )
+      self.inventory = self.system.getInventory()
+      for slot in self.system.qsfpSlots:
+         slot.presentGpio.value = 1 if slot.getId() % 2 else 0
+
+   def testBitmap(self):
+      self.assertEqual(getXcvrPresenceBitmap(self.inventory),
+                       (1 << 5) | (1 << 7))
+
+class XcvrControlTest(unittest.TestCase):
+   def setUp(self):
+      self.system = MockFixedSystem(
+         PortLayout(
+            (Sfp(i) for i in incrange(1, 4)),
+            (Qsfp28(i) for i in incrange(5, 8)),
+         )
+      )
+      self.inventory = self.system.getInventory()
+      for slot in self.system.sfpSlots:
+         slot.txDisableGpio.value = None
+      for slot in self.system.qsfpSlots:
+         slot.modSel.value = None
+         slot.lpMode.value = None
+
+   def _setupXcvrs(self):
+      setXcvrControls(self.inventory, moduleSelect=True, txDisable=False)
+
+   def testPerSlotFallback(self):
+      self._setupXcvrs()
+      for slot in self.system.sfpSlots:
+         self.assertIs(slot.txDisableGpio.value, False)
+      for slot in self.system.qsfpSlots:
+         self.assertIs(slot.modSel.value, True)
+         self.assertIsNone(slot.lpMode.value)
+
 if __name__ == '__main__':
    unittest.main()
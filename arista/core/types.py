@@ -3,7 +3,7 @@ import os
 
 from collections import namedtuple
 
-from ..libs.i2c import i2cBusFromName
+from ..libs.i2c import getKernelI2cBusesGeneration, i2cBusFromName
 from .utils import inSimulation
 
 Register = namedtuple("Register", ["addr", "ro"])
@@ -72,14 +72,19 @@ class I2cBus(object):
       self.name_ = name
       self.bus_ = None
       self.idx_ = idx
+      self.generation_ = None
 
    @property
    def bus(self):
-      if self.bus_ is None:
-         if inSimulation():
+      if inSimulation():
+         if self.bus_ is None:
             self.bus_ = 1
-         else:
-            self.bus_ = i2cBusFromName(self.name_, idx=self.idx_)
+         return self.bus_
+      # NOTE: resolve again when the kernel adapter index changed
+      if self.bus_ is None or \
+         self.generation_ != getKernelI2cBusesGeneration():
+         self.bus_ = i2cBusFromName(self.name_, idx=self.idx_)
+         self.generation_ = getKernelI2cBusesGeneration()
       return self.bus_
 
    def i2cAddr(self, address, **kwargs):
@@ -4,6 +4,7 @@ import json
 import mmap
 import os
 import re
+import threading
 import time
 
 from datetime import datetime
@@ -13,6 +14,7 @@ from struct import pack, unpack
 from .config import flashPath, tmpfsPath
 from .log import getLogger
 from ..libs.procfs import getCmdlineDict
+from ..libs.wait import waitPath
 
 logging = getLogger(__name__)
 
@@ -127,6 +129,66 @@ class MmapResource(ResourceAccessor):
    def writeResource(self, addr, size, value):
       self.mmap_[addr: addr + size] = value
 
+class SharedMmapResource(MmapResource):
+   """Long lived memory mapping shared by all the users of a resource.
+
+   The region is mapped on first use and kept mapped afterwards. Each context
+   manager usage takes a reference and checks that the underlying file is still
+   the one that was mapped, the mapping is re-established when it changed
+   (e.g. driver reload or PCI rescan) and no reference is held.
+   """
+   def __init__(self, *args, **kwargs):
+      super().__init__(*args, **kwargs)
+      self.lock_ = threading.Lock()
+      self.refs_ = 0
+      self.identity_ = None
+      self.stale_ = False
+      self.mapCount = 0
+      self.useCount = 0
+
+   def _identity(self):
+      try:
+         st = os.stat(self.path_)
+      except EnvironmentError:
+         return None
+      return (st.st_dev, st.st_ino)
+
+   def map(self):
+      identity = self._identity()
+      if not super().map():
+         return False
+      self.identity_ = identity
+      self.stale_ = False
+      self.mapCount += 1
+      return True
+
+   def unmap(self):
+      with self.lock_:
+         super().closeResource()
+
+   def invalidate(self):
+      with self.lock_:
+         self.stale_ = True
+         if not self.refs_:
+            super().closeResource()
+
+   def openResource(self):
+      with self.lock_:
+         if self.mmap_ and not self.refs_ and \
+            (self.stale_ or self._identity() != self.identity_):
+            logging.debug('%s: resource changed, remapping', self)
+            super().closeResource()
+         if not self.mmap_ and not self.map():
+            return False
+         self.refs_ += 1
+         self.useCount += 1
+         return True
+
+   def closeResource(self):
+      with self.lock_:
+         if self.refs_:
+            self.refs_ -= 1
+
 class FileResource(ResourceAccessor):
    ''' Resource implementation for a file base memory region. '''
    def __init__(self, *args, **kwargs):
@@ -245,6 +307,12 @@ class FileWaiter():
 
       logging.debug('Waiting file %s.', self.waitFile)
 
+      if isinstance(self.waitFile, str):
+         if waitPath(self.waitFile, self.waitTimeout):
+            return True
+         logging.error('Waiting file %s failed.', self.waitFile)
+         return False
+
       for r in Retrying(interval=self.waitTimeout):
          if self.fileExists():
             return True
@@ -13,6 +13,31 @@ from ..inventory.xcvr import (
 
 from .component.slot import SlotComponent
 
+def getXcvrPresenceBitmap(inventory):
+   '''Presence of all the xcvr slots of an inventory, bit N is slot id N'''
+   bitmap = 0
+   for slotId, slot in inventory.getXcvrSlots().items():
+      if slot.getPresence():
+         bitmap |= 1 << slotId
+   return bitmap
+
+def setXcvrControls(inventory, moduleSelect=None, txDisable=None,
+                    lowPowerMode=None):
+   '''Program the control signals of all the xcvr slots of an inventory
+
+   A None value leaves the signal untouched.
+   '''
+   for slot in inventory.getXcvrSlots().values():
+      for func, value in [(slot.setModuleSelect, moduleSelect),
+                          (slot.setTxDisable, txDisable),
+                          (slot.setLowPowerMode, lowPowerMode)]:
+         if value is None:
+            continue
+         try:
+            func(value)
+         except NotImplementedError:
+            pass
+
 class EthernetImpl(EthernetInv):
    def __init__(self, slot):
       self.slot = slot
@@ -115,9 +115,11 @@ class Adm1266UserDriver(PmbusUserDriver):
       data = self.read_i2c_block_data(self.registers.POWERUP_COUNTER, 3)[1:]
       return struct.unpack('<H', bytearray(data))[0]
 
+   def _userDataCmd(self, idx=0, length=32):
+      return [self.registers.USER_DATA, 3, length, idx & 0xff, (idx >> 8) & 0xff]
+
    def getUserData(self, idx=0, length=32):
-      cmd = [self.registers.USER_DATA, 3, length, idx & 0xff, (idx >> 8) & 0xff]
-      return self.read_bytes(cmd, length + 1)[1:]
+      return self.read_bytes(self._userDataCmd(idx, length), length + 1)[1:]
 
    def getUserDataStr(self, idx=0, length=32):
       return self._bytesToStr(self.getUserData(idx, length))
@@ -128,15 +130,26 @@ class Adm1266UserDriver(PmbusUserDriver):
    def getVersion(self):
       if inSimulation():
          return "MODEL VERSION DATE SERIAL FW"
-      model = self._readMfrStr(self.registers.MFR_MODEL)
-      version = self._readMfrStr(self.registers.MFR_REVISION)
-      date = self._readMfrStr(self.registers.MFR_DATE)
-      serial = self._readMfrStr(self.registers.MFR_SERIAL)
-      fw = self.getUserDataStr()
+      batch = self.batch()
+      for reg in [self.registers.MFR_MODEL, self.registers.MFR_REVISION,
+                  self.registers.MFR_DATE, self.registers.MFR_SERIAL]:
+         batch.read_bytes([reg, 32], 33)
+      batch.read_bytes(self._userDataCmd(), 33)
+      data = batch.submit()
+      model, version, date, serial = [self._bytesToStr(d[1:]).strip()
+                                      for d in data[:4]]
+      fw = self._bytesToStr(data[4][1:])
       return "%s %s %s %s %s" % (model, version, date, serial, fw)
 
+   def _blackboxFaultCmd(self, index):
+      return [self.registers.READ_BLACKBOX, 1, index]
+
    def getBlackboxFault(self, index):
-      data = self.read_bytes([self.registers.READ_BLACKBOX, 1, index], 65)[1:]
+      data = self.read_bytes(self._blackboxFaultCmd(index), 65)
+      return self._parseBlackboxFault(index, data)
+
+   def _parseBlackboxFault(self, index, data):
+      data = data[1:]
       logging.debug('%s: fault %d: %s', self, index,
                     ' '.join('%02x' % s for s in data))
 
@@ -149,9 +162,14 @@ class Adm1266UserDriver(PmbusUserDriver):
    def getBlackboxFaults(self):
       _, index, count = self.getBlackboxInfo()
       logging.debug('%s: fault info: index=%d count=%d', self, index, count)
+      # all the records are fetched using as few transfers as possible
+      indexes = list(reversed(list(cyclicRange(index + 1, count))))
+      batch = self.batch()
+      for i in indexes:
+         batch.read_bytes(self._blackboxFaultCmd(i), 65)
       faults = []
-      for i in reversed(list(cyclicRange(index + 1, count))):
-         fault = self.getBlackboxFault(i)
+      for i, data in zip(indexes, batch.submit()):
+         fault = self._parseBlackboxFault(i, data)
          if fault.isValid():
             faults.append(fault)
       return faults
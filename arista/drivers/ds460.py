@@ -1,6 +1,5 @@
-from contextlib import closing
-
 from ..core import utils
+from ..core.i2c_utils import getI2cBusPool
 from ..core.log import getLogger
 
 from .pmbus import PmbusKernelDriver
@@ -15,26 +14,28 @@ class Ds460KernelDriver(PmbusKernelDriver):
       addr = self.addr.address
 
       logging.debug('%s: initializing registers', self.name)
-      with closing(utils.SMBus(self.addr.bus)) as bus:
-         for _ in utils.Retrying(interval=10.0, delay=0.5):
-            try:
+      pool = getI2cBusPool()
+      for _ in utils.Retrying(interval=10.0, delay=0.5):
+         try:
+            with pool.transaction(self.addr.bus) as bus:
                bus.read_byte_data(addr, 0x00)
-               logging.debug('%s: device accessible: bus=%s',
-                             self.name, self.addr.bus)
-               break
-            except IOError:
-               logging.debug('%s: device not accessible; retrying...', self.name)
-         else:
-            logging.error('%s: failed to access device: bus=%s',
+            logging.debug('%s: device accessible: bus=%s',
                           self.name, self.addr.bus)
-            return
-
-         try:
+            break
+         except IOError:
+            logging.debug('%s: device not accessible; retrying...', self.name)
+      else:
+         logging.error('%s: failed to access device: bus=%s',
+                       self.name, self.addr.bus)
+         return
+
+      try:
+         with pool.transaction(self.addr.bus) as bus:
             byte = bus.read_byte_data(addr, 0x10)
             bus.write_byte_data(addr, 0x10, 0)
             bus.write_byte_data(addr, 0x03, 1)
             bus.write_byte_data(addr, 0x10, byte)
-         except IOError:
-            logging.debug('%s: failed to initialize', self.name)
+      except IOError:
+         logging.debug('%s: failed to initialize', self.name)
 
       super(Ds460KernelDriver, self).setup()
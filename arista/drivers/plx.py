@@ -1,12 +1,17 @@
+import threading
+
 from contextlib import closing
 
 from ..core.i2c_utils import I2cMsg
-from ..core.log import getLogger
+from ..core.log import getLogger, lazy
 
 from ..core.driver.user.i2c import I2cDevDriver
 
 logging = getLogger(__name__)
 
+def _fmtBytes(data):
+   return ', '.join(["%#x" % c for c in data])
+
 # cmd[0].rw: read/write command designation
 PEX_I2C_RD = 0x4
 PEX_I2C_WR = 0x3
@@ -244,8 +249,7 @@ class PlxPexI2cDevDriver(I2cDevDriver):
       logging.io("%s._read(%d, %#x): %s", self, order, addr, cmd)
       data = self.read_bytes(cmd, 4)
       logging.io("%s.read_bytes([%s], 4) = [%s]", self,
-                    ', '.join(["%#x" % c for c in cmd]),
-                    ', '.join(["%#x" % d for d in data]))
+                 lazy(_fmtBytes, cmd), lazy(_fmtBytes, data))
       return cmd.rdval(data)
 
    def _write(self, order, addr, val):
@@ -253,8 +257,7 @@ class PlxPexI2cDevDriver(I2cDevDriver):
       logging.io("%s._write(%d, %#x, %#x): %s", self, order, addr, val, cmd)
       data = cmd.wrdata(val)
       logging.io("%s.write_bytes([%s] + [%s])", self,
-                    ', '.join(["%#x" % c for c in cmd]),
-                    ', '.join(["%#x" % d for d in data]))
+                 lazy(_fmtBytes, cmd), lazy(_fmtBytes, data))
       self.write_bytes(list(cmd) + data)
 
    def read(self, addr):
@@ -279,6 +282,12 @@ class PlxPex8700I2cDevDriver(PlxPexI2cDevDriver):
 
    PLX_ADDR_MAP = PlxPexI2cPciAddrMap
 
+   def __init__(self, **kwargs):
+      super(PlxPex8700I2cDevDriver, self).__init__(**kwargs)
+      # NOTE: the port disable register is shared by all the ports and the
+      #       linecards are powered on concurrently
+      self.portLock = threading.Lock()
+
    def smbusPing(self):
       try:
          with self:
@@ -298,10 +307,12 @@ class PlxPex8700I2cDevDriver(PlxPexI2cDevDriver):
       self.regs.hotPlugCapable(True)
 
    def disablePort(self, port):
-      self.regs.portDisable(self.regs.portDisable() | (1 << port))
+      with self.portLock:
+         self.regs.portDisable(self.regs.portDisable() | (1 << port))
 
    def enablePort(self, port):
-      self.regs.portDisable(self.regs.portDisable() & ~(1 << port))
+      with self.portLock:
+         self.regs.portDisable(self.regs.portDisable() & ~(1 << port))
 
    def setUpstreamPort(self, port):
       self.regs.upstreamPort(port)
@@ -22,7 +22,7 @@ class PsuPmbusDetect(I2cDevDriver):
       for key in ['id', 'model', 'revision', 'location', 'date', 'serial']
    }
 
-   def __init__(self, addr):
+   def __init__(self, addr, prepare=True):
       super(PsuPmbusDetect, self).__init__(name='pmbus-detect', addr=addr)
       self.addr = addr
       self.exists_ = None
@@ -33,7 +33,8 @@ class PsuPmbusDetect(I2cDevDriver):
       self.date_ = None
       self.serial_ = None
 
-      self._prepare()
+      if prepare:
+         self._prepare()
 
    def _prepare(self):
       if not self.exists():
@@ -85,6 +86,10 @@ class PsuPmbusDetect(I2cDevDriver):
          self.serial_ = self._tryReadBlockStr(self.MFR_SERIAL)
       return self.serial_
 
+   def readSerial(self):
+      # NOTE: unlike serial() a failed read raises instead of returning N/A
+      return self.read_block_data_str(self.MFR_SERIAL)
+
    def getMfrMetadata(self):
       return {
          'id': self.id(),
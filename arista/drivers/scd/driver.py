@@ -64,6 +64,8 @@ class ScdKernelDriver(PciKernelDriver):
       return "SCD %s SMBus master %d bus %d" % (self.addr, master, bus)
 
    def refresh(self):
+      super(ScdKernelDriver, self).refresh()
+      self.scd.invalidateMmap()
       # reload i2c bus cache
       masterName = self.getMasterName(0, 0)
       if not utils.inSimulation():
@@ -137,6 +139,10 @@ class ScdKernelDriver(PciKernelDriver):
          logging.debug('applying scd tweaks')
          self.writeComponents(tweaks, "smbus_tweaks")
 
+   def clean(self):
+      self.scd.invalidateMmap()
+      super(ScdKernelDriver, self).clean()
+
    def finish(self):
       logging.debug('applying scd configuration')
       path = self.addr.getSysfsPath()
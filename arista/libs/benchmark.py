@@ -1,16 +1,229 @@
 
 import contextlib
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import threading
 import time
 
+from collections import OrderedDict, deque
+
 from ..core.log import getLogger
 
 logging = getLogger(__name__)
 
+MAX_SPANS = 10000
+
+class Span(object):
+   def __init__(self, name, parent=None, maxChildren=None):
+      self.name = name
+      self.parent = parent
+      self.children = deque(maxlen=maxChildren)
+      self.thread = threading.current_thread().name
+      self.tid = threading.get_native_id()
+      self.pid = os.getpid()
+      self.begin = time.perf_counter()
+      self.end = None
+
+   @property
+   def duration(self):
+      end = self.end if self.end is not None else time.perf_counter()
+      return end - self.begin
+
+   def toDict(self, origin=0):
+      return {
+         'name': self.name,
+         'thread': self.thread,
+         'begin': self.begin - origin,
+         'duration': self.duration,
+         'children': [child.toDict(origin) for child in self.children],
+      }
+
+   def _traceEvent(self, phase, ts):
+      return {
+         'name': self.name,
+         'cat': self.name.split(' ', 1)[0],
+         'ph': phase,
+         'pid': self.pid,
+         'tid': self.tid,
+         'ts': int(ts * 1000000),
+      }
+
+   def traceEvents(self, pid):
+      '''Begin and end events of this span and its children run by pid'''
+      if self.pid == pid:
+         yield self._traceEvent('B', self.begin)
+      for child in self.children:
+         yield from child.traceEvents(pid)
+      if self.pid == pid:
+         end = self.end if self.end is not None else time.perf_counter()
+         yield self._traceEvent('E', end)
+
+def _mergeSpans(spans):
+   nodes = OrderedDict()
+   for span in spans:
+      node = nodes.setdefault(span.name, [0, 0, []])
+      node[0] += span.duration
+      node[1] += 1
+      node[2].extend(span.children)
+   return sorted(nodes.items(), key=lambda item: -item[1][0])
+
+class Profiler(object):
+   '''Record nested spans of time while enabled
+
+   The current span is tracked per thread and per asyncio task, spans started
+   from a thread of their own are recorded at the top of the tree.
+
+   At most maxSpans spans are kept at the top of the tree and under each span,
+   the oldest ones are dropped first so that a long running process does not
+   grow without bound.
+   '''
+   def __init__(self, maxSpans=MAX_SPANS):
+      self.enabled = False
+      self.origin = None
+      self.maxSpans = maxSpans
+      self.spans = deque(maxlen=maxSpans)
+      self.dropped = 0
+      self.current = contextvars.ContextVar('span', default=None)
+      self.tracePath = None
+      self.processName = None
+
+   def enable(self):
+      self.enabled = True
+      if self.origin is None:
+         self.origin = time.perf_counter()
+
+   def disable(self):
+      self.enabled = False
+
+   def clear(self):
+      self.origin = time.perf_counter() if self.enabled else None
+      self.spans = deque(maxlen=self.maxSpans)
+      self.dropped = 0
+
+   @contextlib.contextmanager
+   def span(self, name):
+      parent = self.current.get()
+      span = Span(name, parent=parent, maxChildren=self.maxSpans)
+      spans = parent.children if parent is not None else self.spans
+      if len(spans) == spans.maxlen:
+         self.dropped += 1
+      spans.append(span)
+      token = self.current.set(span)
+      try:
+         yield span
+      finally:
+         span.end = time.perf_counter()
+         self.current.reset(token)
+
+   def toDict(self):
+      return [span.toDict(self.origin or 0) for span in self.spans]
+
+   def dump(self, path):
+      with open(path, 'w') as f:
+         json.dump(self.toDict(), f, indent=1)
+
+   def traceEvents(self, pid=None):
+      '''Trace events of the spans recorded by a process
+
+      The timestamps come from the monotonic clock which is shared by all the
+      processes so the events of forked children line up with their parent.
+      '''
+      pid = pid or os.getpid()
+      events = [event for span in self.spans for event in span.traceEvents(pid)]
+      threads = {span.tid: span.thread for span in self.iterSpans()
+                 if span.pid == pid}
+      meta = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+               'args': {'name': thread}} for tid, thread in threads.items()]
+      if self.processName is not None and events:
+         meta.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                      'args': {'name': self.processName}})
+      return meta + events
+
+   def iterSpans(self):
+      spans = list(self.spans)
+      while spans:
+         span = spans.pop()
+         yield span
+         spans.extend(span.children)
+
+   def openTrace(self, path):
+      '''Start a trace-event file that processes append their events to'''
+      with open(path, 'w') as f:
+         f.write('[\n')
+      self.tracePath = path
+
+   def writeTrace(self):
+      '''Append the events of the current process to the trace file
+
+      The trace uses the JSON array format, for which the closing bracket is
+      optional, so each process can append its own events with a single write.
+      '''
+      if self.tracePath is None:
+         return
+      data = ''.join('%s,\n' % json.dumps(event)
+                     for event in self.traceEvents())
+      fd = os.open(self.tracePath, os.O_WRONLY | os.O_APPEND)
+      try:
+         os.write(fd, data.encode())
+      finally:
+         os.close(fd)
+
+   def _formatSpans(self, spans, total, depth, lines):
+      for name, (duration, count, children) in _mergeSpans(spans):
+         lines.append('%10.2fms %5.1f%% %s%s%s' % (
+            duration * 1000, 100 * duration / total if total else 0,
+            '  ' * depth, name, ' (x%d)' % count if count > 1 else ''))
+         self._formatSpans(children, total, depth + 1, lines)
+
+   def report(self):
+      '''Timing tree with siblings of the same name merged, longest first'''
+      total = time.perf_counter() - self.origin if self.origin else 0
+      lines = []
+      self._formatSpans(self.spans, total, 0, lines)
+      if self.dropped:
+         lines.append('%d spans dropped' % self.dropped)
+      return '\n'.join(lines)
+
+profiler = None
+
+def getProfiler():
+   global profiler
+   if profiler is None:
+      profiler = Profiler()
+   return profiler
+
+_noSpan = contextlib.nullcontext()
+
+def profile(name, *args):
+   '''Context recording a span when profiling, name is formatted with args'''
+   if profiler is None or not profiler.enabled:
+      return _noSpan
+   return profiler.span(name % args if args else name)
+
 @contextlib.contextmanager
 def timeit(message):
    begin = time.time()
    try:
-      yield
+      with profile(message):
+         yield
    finally:
       end = time.time()
       logging.debug('%s (took %s seconds)', message, end - begin)
+
+def importCost(statement, setup='', count=3):
+   '''Best duration and number of modules imported by running statement in a
+   fresh interpreter, what setup does is not accounted for'''
+   code = '\n'.join([
+      'import sys, time',
+      setup,
+      'before = set(sys.modules)',
+      'begin = time.perf_counter()',
+      statement,
+      'print(time.perf_counter() - begin, len(set(sys.modules) - before))',
+   ])
+   results = [subprocess.check_output([sys.executable, '-c', code]).split()
+              for _ in range(count)]
+   return min(float(r[0]) for r in results), int(results[0][1])
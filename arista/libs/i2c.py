@@ -1,27 +1,96 @@
-
 import os
+import threading
 from collections import OrderedDict
 
+I2C_ADAPTER_ROOT = '/sys/class/i2c-adapter'
+
+# index of the kernel i2c adapters, busId -> name
 _i2cBuses = OrderedDict()
-def getKernelI2cBuses(force=False):
-   if _i2cBuses and not force:
-      return _i2cBuses
+# name -> list of busId sorted in ascending order
+_i2cBusNames = {}
+# busId -> inode of the adapter entry, used to detect re-created adapters
+_i2cBusInodes = {}
+_i2cBusLock = threading.Lock()
+_i2cBusGeneration = 0
+
+def _listKernelI2cBuses(root):
+   # NOTE: the inode is provided by the directory listing and changes whenever
+   #       an adapter is removed and created again, even under the same id
+   entries = {}
+   with os.scandir(root) as it:
+      for entry in it:
+         if entry.name.startswith('i2c-'):
+            entries[int(entry.name[4:])] = entry.inode()
+   return entries
+
+def _readKernelI2cBusName(root, busId):
+   with open(os.path.join(root, 'i2c-%d' % busId, 'name')) as f:
+      return f.read().rstrip()
+
+def _updateKernelI2cBuses(root):
+   global _i2cBusGeneration
+   entries = _listKernelI2cBuses(root)
+   if entries == _i2cBusInodes:
+      return
+
+   buses = {busId: name for busId, name in _i2cBuses.items()
+            if _i2cBusInodes.get(busId) == entries.get(busId)}
+   for busId in entries:
+      if busId not in buses:
+         buses[busId] = _readKernelI2cBusName(root, busId)
+
    _i2cBuses.clear()
-   buses = {}
-   root = '/sys/class/i2c-adapter'
-   for busName in sorted(os.listdir(root), key=lambda x: int(x[4:])):
-      busId = int(busName.replace('i2c-', ''))
-      with open(os.path.join(root, busName, 'name')) as f:
-         buses[busId] = f.read().rstrip()
-   return buses
-
-def i2cBusFromName(name, idx=0, force=False):
-   buses = getKernelI2cBuses(force=force)
-   for busId, busName in buses.items():
-      if name == busName:
-         if idx > 0:
-            idx -= 1
-         else:
-            return busId
-   return None
+   _i2cBusNames.clear()
+   for busId in sorted(buses):
+      name = buses[busId]
+      _i2cBuses[busId] = name
+      _i2cBusNames.setdefault(name, []).append(busId)
+   _i2cBusInodes.clear()
+   _i2cBusInodes.update(entries)
+   _i2cBusGeneration += 1
+
+def getKernelI2cBuses(force=False, root=I2C_ADAPTER_ROOT):
+   '''Return the kernel i2c adapters indexed by bus id
+
+   The index is built once and only revalidated against the adapter list when
+   force is set, only the names of new or re-created adapters are read.
+   '''
+   with _i2cBusLock:
+      if force or not _i2cBusInodes:
+         _updateKernelI2cBuses(root)
+      return _i2cBuses
+
+def getKernelI2cBusesGeneration():
+   '''Counter incremented every time the adapter index changes'''
+   return _i2cBusGeneration
+
+def clearKernelI2cBuses():
+   with _i2cBusLock:
+      _i2cBuses.clear()
+      _i2cBusNames.clear()
+      _i2cBusInodes.clear()
+
+def _lookupI2cBus(name, idx):
+   busIds = _i2cBusNames.get(name, [])
+   return busIds[idx] if idx < len(busIds) else None
+
+def _isKernelI2cBusNamed(root, busId, name):
+   try:
+      return _readKernelI2cBusName(root, busId) == name
+   except OSError:
+      return False
 
+def i2cBusFromName(name, idx=0, force=False, root=I2C_ADAPTER_ROOT):
+   generation = getKernelI2cBusesGeneration()
+   getKernelI2cBuses(force=force, root=root)
+   fresh = force or generation != getKernelI2cBusesGeneration()
+   busId = _lookupI2cBus(name, idx)
+   if fresh:
+      return busId
+   # NOTE: the adapter may have been created, removed or re-created under
+   #       another id since the index was built, a hit is checked against the
+   #       name of the adapter which is cheaper than listing them all
+   if busId is None or not _isKernelI2cBusNamed(root, busId, name):
+      getKernelI2cBuses(force=True, root=root)
+      busId = _lookupI2cBus(name, idx)
+   return busId
@@ -2,8 +2,11 @@
 import os
 import time
 
+from .benchmark import profile
 from .python import monotonicRaw
 
+POLL_DELAY = 0.05
+
 class TimeoutError(Exception):
    def __init__(self, msg, code=1):
       self.msg = msg
@@ -66,5 +69,19 @@ def waitFor(func, description=None, timeout=60, delay=None, delayMax=1000,
 
    raise RuntimeError("Not reachable")
 
+def waitPath(path, timeout, delay=POLL_DELAY):
+   '''Wait up to timeout seconds for path to exist, return whether it does
+
+   The path is checked right away and then polled every delay seconds.
+   '''
+   end = time.monotonic() + timeout
+   while not os.path.exists(path):
+      remaining = end - time.monotonic()
+      if remaining <= 0:
+         return False
+      time.sleep(min(delay, remaining))
+   return True
+
 def waitForPath(path, *args, **kwargs):
-    return waitFor(lambda: os.path.exists(path), *args, **kwargs)
+   with profile('wait for %s', path):
+      return waitFor(lambda: os.path.exists(path), *args, **kwargs)
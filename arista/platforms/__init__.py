@@ -1,4 +1,2 @@
-
-from ..core import platform
-
-__all__ = platform.manager.loadPlatforms(__package__)
+# NOTE: platform modules are imported on demand through the prebuilt registry
+#       use arista.core.platform.loadPlatforms() to import all of them
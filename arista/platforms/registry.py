@@ -0,0 +1,161 @@
+# NOTE: prebuilt registry of the platforms, kept in sync by the platform tests
+#       regenerate it from platform.manager.buildRegistry() when adding a platform
+
+# sid or platform name -> module defining the platform
+PLATFORM_SIDS = {
+   'Alhambra': 'alhambra',
+   'AlhambraSsd': 'alhambra',
+   'BlackhawkDD': 'blackhawk',
+   'BlackhawkDDM': 'blackhawk',
+   'BlackhawkO': 'blackhawk',
+   'BlackhawkT4DD': 'blackhawktd4',
+   'BlackhawkT4O': 'blackhawktd4',
+   'BlackhawkTH4DD': 'blackhawkth4',
+   'Brooks': 'fabric.brooks',
+   'CatalinaDD': 'catalina',
+   'Clearlake': 'clearlake',
+   'ClearlakePlus': 'clearlake',
+   'ClearlakePlusSsd': 'clearlake',
+   'ClearlakeSsd': 'clearlake',
+   'Clearwater': 'linecard.clearwater',
+   'Clearwater2': 'linecard.clearwater2',
+   'Clearwater2Ms': 'linecard.clearwater2',
+   'ClearwaterMs': 'linecard.clearwater',
+   'Cloverdale': 'cloverdale',
+   'CloverdaleSsd': 'cloverdale',
+   'Dragonfly': 'fabric.dragonfly',
+   'Eldridge': 'fabric.eldridge',
+   'Gardena': 'gardena',
+   'GardenaE': 'gardena',
+   'Lodoga': 'lodoga',
+   'LodogaPrime': 'lodoga',
+   'LodogaSsd': 'lodoga',
+   'Marysville': 'marysville',
+   'Marysville10': 'marysville',
+   'Mineral': 'mineral',
+   'MineralD': 'mineral',
+   'MineralSsd': 'mineral',
+   'Moby': 'moby',
+   'Otterlake': 'supervisor.otterlake',
+   'PikeIslandZ': 'pikez',
+   'PikeIslandZ-2F': 'pikez',
+   'PikeIslandZ-2R': 'pikez',
+   'PikeIslandZ-F': 'pikez',
+   'PikeIslandZ-R': 'pikez',
+   'Redstart8CFixedNMoby': 'moby',
+   'Shearwater4Mk2': 'quicksilver',
+   'Shearwater4Mk2N': 'quicksilver',
+   'Shearwater4Mk2NQuicksilverDD': 'quicksilver',
+   'Shearwater4Mk2NQuicksilverP': 'quicksilver',
+   'Shearwater4Mk2QuicksilverDD': 'quicksilver',
+   'Shearwater4Mk2QuicksilverP': 'quicksilver',
+   'SilverstrandDd': 'silverstrand',
+   'SilverstrandP': 'silverstrand',
+   'Smartsville': 'smartsville',
+   'SmartsvilleBK': 'smartsville',
+   'SmartsvilleBkMs': 'smartsville',
+   'SmartsvilleDD': 'smartsville',
+   'SmartsvilleDDBK': 'smartsville',
+   'SmartsvilleDDBkMs': 'smartsville',
+   'SmartsvilleDDBkMsTpm': 'smartsville',
+   'SmartsvilleDDSsd': 'smartsville',
+   'SmartsvilleSsd': 'smartsville',
+   'SmartvilleBkMsTpm': 'smartsville',
+   'Upperlake': 'upperlake',
+   'UpperlakeES': 'upperlake',
+   'UpperlakeElite': 'upperlake',
+   'UpperlakePlus': 'upperlake',
+   'UpperlakeSsd': 'upperlake',
+   'WolverineO': 'linecard.wolverine',
+   'WolverineOBkMs': 'linecard.wolverine',
+   'WolverineOMs': 'linecard.wolverine',
+   'WolverineQ': 'linecard.wolverine',
+   'WolverineQBkMs': 'linecard.wolverine',
+   'WolverineQCpu': 'linecard.wolverine',
+   'WolverineQCpuBkMs': 'linecard.wolverine',
+   'WolverineQCpuMs': 'linecard.wolverine',
+   'WolverineQMs': 'linecard.wolverine',
+   'Woodleaf': 'woodleaf',
+   'raven': 'cloverdale',
+   'sprucefish': 'supervisor.otterlake',
+}
+
+# sku -> module defining the platform
+PLATFORM_SKUS = {
+   '7800R-48QC-LC': 'linecard.clearwater',
+   '7800R-48QC2-LC': 'linecard.clearwater2',
+   '7800R-48QCM-LC': 'linecard.clearwater',
+   '7800R-48QCM2-LC': 'linecard.clearwater2',
+   '7800R3-48CQ-LC': 'linecard.clearwater',
+   '7800R3-48CQ2-LC': 'linecard.clearwater2',
+   '7800R3-48CQM-LC': 'linecard.clearwater',
+   '7800R3-48CQM2-LC': 'linecard.clearwater2',
+   '7800R3A-36D-LC': 'linecard.wolverine',
+   '7800R3A-36D2-LC': 'linecard.wolverine',
+   '7800R3A-36DM-LC': 'linecard.wolverine',
+   '7800R3A-36DM2-LC': 'linecard.wolverine',
+   '7800R3A-36P-LC': 'linecard.wolverine',
+   '7800R3A-36PM-LC': 'linecard.wolverine',
+   '7800R3AK-36DM-LC': 'linecard.wolverine',
+   '7800R3AK-36DM2-LC': 'linecard.wolverine',
+   '7800R3AK-36PM-LC': 'linecard.wolverine',
+   '7808R3-FM': 'fabric.eldridge',
+   '7808R3A-FM': 'fabric.dragonfly',
+   'CCS-720DT-48S': 'pikez',
+   'CCS-720DT-48S-2F': 'pikez',
+   'CCS-720DT-48S-2R': 'pikez',
+   'CCS-720DT-48S-F': 'pikez',
+   'CCS-720DT-48S-R': 'pikez',
+   'DCS-7050CX3-32C': 'lodoga',
+   'DCS-7050CX3-32S': 'lodoga',
+   'DCS-7050CX3-32S-SSD': 'lodoga',
+   'DCS-7050DX4-32S': 'blackhawktd4',
+   'DCS-7050PX4-32S': 'blackhawktd4',
+   'DCS-7050QX-32': 'cloverdale',
+   'DCS-7050QX-32S': 'clearlake',
+   'DCS-7050QX-32S-SSD': 'clearlake',
+   'DCS-7050QX2-32S': 'clearlake',
+   'DCS-7050QX2-32S-SSD': 'clearlake',
+   'DCS-7050SX3-48C8': 'marysville',
+   'DCS-7050SX3-48YC8': 'marysville',
+   'DCS-7060CX-32C': 'upperlake',
+   'DCS-7060CX-32S': 'upperlake',
+   'DCS-7060CX-32S-ES': 'upperlake',
+   'DCS-7060CX-32S-SSD': 'upperlake',
+   'DCS-7060CX2-32S': 'upperlake',
+   'DCS-7060DX4-32': 'blackhawk',
+   'DCS-7060DX4-32-D': 'blackhawk',
+   'DCS-7060DX5-32': 'blackhawkth4',
+   'DCS-7060DX5-64': 'silverstrand',
+   'DCS-7060DX5-64S': 'catalina',
+   'DCS-7060PX4-32': 'blackhawk',
+   'DCS-7060PX5-64': 'silverstrand',
+   'DCS-7060X6-16PE-384C': 'moby',
+   'DCS-7060X6-64DE': 'quicksilver',
+   'DCS-7060X6-64PE': 'quicksilver',
+   'DCS-7170-32C': 'mineral',
+   'DCS-7170-32C-M': 'mineral',
+   'DCS-7170-32CD': 'mineral',
+   'DCS-7170-64C': 'alhambra',
+   'DCS-7170-64C-M': 'alhambra',
+   'DCS-7170B-64C': 'woodleaf',
+   'DCS-7260CX3-64': 'gardena',
+   'DCS-7260CX3-64E': 'gardena',
+   'DCS-7280CR3-32D4': 'smartsville',
+   'DCS-7280CR3-32D4-M': 'smartsville',
+   'DCS-7280CR3-32P4': 'smartsville',
+   'DCS-7280CR3-32P4-M': 'smartsville',
+   'DCS-7280CR3K-32D4': 'smartsville',
+   'DCS-7280CR3K-32P4': 'smartsville',
+   'DCS-7280CR3MK-32D4': 'smartsville',
+   'DCS-7280CR3MK-32D4S': 'smartsville',
+   'DCS-7280CR3MK-32P4': 'smartsville',
+   'DCS-7280CR3MK-32P4S': 'smartsville',
+   'DCS-7800-SUP': 'supervisor.otterlake',
+   'DCS-7800-SUP1A': 'supervisor.otterlake',
+   'DCS-7800-SUP1S': 'supervisor.otterlake',
+   'DCS-7804-CH': 'chassis.camp',
+   'DCS-7804-FM': 'fabric.brooks',
+   'DCS-7808-CH': 'chassis.northface',
+   'DCS-7808-FM': 'fabric.eldridge',
+}
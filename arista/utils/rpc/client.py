@@ -1,3 +1,4 @@
+import asyncio
 import errno
 import json
 from json.decoder import JSONDecodeError
@@ -6,9 +7,11 @@ import socket
 import time
 
 from ...core.log import getLogger
+from ...libs.benchmark import profile
 
 from .api import RpcSupervisorApi, RpcLinecardApi
 from .constants import JSONRPC_VERSION
+from .server import RpcServer
 
 logging = getLogger(__name__)
 
@@ -23,6 +26,35 @@ class RpcServerException(Exception):
       self.code = error.get('code', None)
       self.message = error.get('message', None)
 
+def buildRequest(call, uid, args, kwargs):
+   params = kwargs
+   if params:
+      params[ '_args' ] = args
+   else:
+      params = args
+   if not params:
+      params = None
+   return json.dumps({
+      'jsonrpc': JSONRPC_VERSION,
+      'method': call,
+      'params': params,
+      'id': uid}) + '\n'
+
+def parseResponse(response, uid):
+   if response.get('jsonrpc') != JSONRPC_VERSION:
+      raise RpcClientException(f'Got unexpected JsonRpc version {response.get("jsonrpc")}')
+   if response.get('id') != uid:
+      raise RpcClientException(f'Got unexpected message id {response.get("id")}, expected {uid}')
+   if 'error' in response:
+      raise RpcServerException(response['error'])
+   if 'result' not in response:
+      raise RpcClientException(f'Neither result nor error in JsonRpc response for message {uid}')
+   return response['result']
+
+def isRpcMethod(name):
+   return name in RpcSupervisorApi.methods() or \
+          name in RpcLinecardApi.methods()
+
 class RpcClient():
    """JSON-RPC client implementation.
 
@@ -95,17 +127,7 @@ class RpcClient():
       return buf.decode('utf-8')
 
    def _processResponse(self, responseStr, uid):
-      response = json.loads(responseStr)
-
-      if response.get('jsonrpc') != JSONRPC_VERSION:
-         raise RpcClientException(f'Got unexpected JsonRpc version {response.get("jsonrpc")}')
-      if response.get('id') != uid:
-         raise RpcClientException(f'Got unexpected message id {response.get("id")}, expected {uid}')
-      if 'error' in response:
-         raise RpcServerException(response['error'])
-      if 'result' not in response:
-         raise RpcClientException(f'Neither result nor error in JsonRpc response for message {uid}')
-      return response['result']
+      return parseResponse(json.loads(responseStr), uid)
 
    def _doGetCommandResponse(self, uid):
       attempts = 0
@@ -129,18 +151,7 @@ class RpcClient():
       if self.sock is None:
          self._connectSocket()
       uid = self.next_id()
-      params = kwargs
-      if params:
-         params[ '_args' ] = args
-      else:
-         params = args
-      if not params:
-         params = None
-      command = json.dumps({
-         'jsonrpc': JSONRPC_VERSION,
-         'method': call,
-         'params': params,
-         'id': uid}) + '\n'
+      command = buildRequest(call, uid, args, kwargs)
 
       self._clearSocket()
       # Allow reconnecting the socket if the connection dies; if we timeout twice then give up.
@@ -156,12 +167,156 @@ class RpcClient():
       raise RpcClientException('JSON-RPC server did not respond')
 
    def __getattr__(self, name):
-      if name not in RpcSupervisorApi.methods() and \
-         name not in RpcLinecardApi.methods():
+      if not isRpcMethod(name):
          return super().__getattr__(name)
 
       def fn(*args, **kwargs):
-         return self.doCommand(name, *args, **kwargs)
+         with profile('rpc %s', name):
+            return self.doCommand(name, *args, **kwargs)
+      fn.__name__ = name
+      setattr(self, name, fn)
+      return fn
+
+class AsyncRpcClient():
+   """asyncio JSON-RPC client implementation.
+
+   A single connection to the server is kept open and shared by all the
+   calls, any number of them can be in flight at once and their responses are
+   matched by id. The connection is (re)established on demand.
+
+   The methods that are supported are dynamically added to this class as for
+   RpcClient and return coroutines."""
+
+   CONNECT_TIMEOUT = 5
+   CONNECT_RETRY_DELAYS = [1, 2, 4, 8]
+   CALL_TIMEOUT = 30
+   MAX_MESSAGE_SIZE = RpcServer.MAX_MESSAGE_SIZE
+
+   def __init__(self, host, port, timeout=CALL_TIMEOUT):
+      self.host = host
+      self.port = port
+      self.timeout = timeout
+      self.reader = None
+      self.writer = None
+      self.readerTask = None
+      self.lock = None
+      self.pending = {}
+      self._next_id = 0
+
+   def __str__(self):
+      return f'{self.__class__.__name__}({self.host}:{self.port})'
+
+   def next_id(self):
+      uid = self._next_id
+      self._next_id += 1
+      return uid
+
+   def connected(self):
+      return self.readerTask is not None and not self.readerTask.done()
+
+   async def connect(self):
+      if self.lock is None:
+         self.lock = asyncio.Lock()
+      async with self.lock:
+         if self.connected():
+            return
+         for delay in self.CONNECT_RETRY_DELAYS + [None]:
+            try:
+               self.reader, self.writer = await asyncio.wait_for(
+                  asyncio.open_connection(self.host, self.port,
+                                          limit=self.MAX_MESSAGE_SIZE),
+                  self.CONNECT_TIMEOUT)
+               break
+            except (OSError, asyncio.TimeoutError) as e:
+               if delay is None:
+                  raise RpcClientException(f'Could not connect to {self.host}:{self.port}: {e}')
+               logging.debug('%s: connection failed (%s), retrying in %ss',
+                             self, e, delay)
+               await asyncio.sleep(delay)
+         self.readerTask = asyncio.ensure_future(self._readResponses())
+
+   async def close(self):
+      if self.readerTask is not None:
+         self.readerTask.cancel()
+         try:
+            await self.readerTask
+         except asyncio.CancelledError:
+            pass
+         self.readerTask = None
+      if self.writer is not None:
+         self.writer.close()
+         self.writer = None
+
+   async def __aenter__(self):
+      return self
+
+   async def __aexit__(self, *args):
+      await self.close()
+
+   def _dispatch(self, response):
+      if isinstance(response, list):
+         for item in response:
+            self._dispatch(item)
+         return
+      future = self.pending.pop(response.get('id'), None) \
+               if isinstance(response, dict) else None
+      if future is None:
+         logging.debug('%s: dropping unexpected response %r', self, response)
+      elif not future.done():
+         future.set_result(response)
+
+   async def _readResponses(self):
+      error = RpcClientException('JSON-RPC server closed the connection')
+      try:
+         while True:
+            line = await self.reader.readline()
+            if not line:
+               break
+            try:
+               response = json.loads(line)
+            except ValueError:
+               logging.debug('%s: could not decode response %r', self, line)
+               continue
+            self._dispatch(response)
+      except OSError as e:
+         error = RpcClientException(f'JSON-RPC connection lost: {e}')
+      except ValueError:
+         # NOTE: the id of an oversized response is unknown and its remainder
+         #       would be read as garbage, fail the pending calls and drop the
+         #       connection
+         error = RpcClientException(
+            f'JSON-RPC response larger than {self.MAX_MESSAGE_SIZE} bytes')
+      finally:
+         pending, self.pending = self.pending, {}
+         for future in pending.values():
+            if not future.done():
+               future.set_exception(error)
+         self.writer.close()
+
+   async def doCommand(self, call, *args, timeout=None, **kwargs):
+      await self.connect()
+      uid = self.next_id()
+      future = asyncio.get_running_loop().create_future()
+      self.pending[uid] = future
+      try:
+         self.writer.write(buildRequest(call, uid, args, kwargs).encode('utf-8'))
+         await self.writer.drain()
+         response = await asyncio.wait_for(future, timeout or self.timeout)
+      except asyncio.TimeoutError:
+         raise RpcClientException(f'JSON-RPC call {call} timed out') from None
+      except OSError as e:
+         raise RpcClientException(f'JSON-RPC call {call} failed: {e}') from e
+      finally:
+         self.pending.pop(uid, None)
+      return parseResponse(response, uid)
+
+   def __getattr__(self, name):
+      if not isRpcMethod(name):
+         raise AttributeError(name)
+
+      async def fn(*args, **kwargs):
+         with profile('rpc %s', name):
+            return await self.doCommand(name, *args, **kwargs)
       fn.__name__ = name
       setattr(self, name, fn)
       return fn
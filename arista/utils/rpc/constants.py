@@ -7,5 +7,7 @@ class JsonRpcError(IntEnum):
    METHOD_NOT_FOUND = -32601
    INVALID_PARAMS = -32602
    INTERNAL_ERROR = -32603
+   # -32000 to -32099 are reserved for implementation-defined server errors
+   REQUEST_TIMEOUT = -32000
 
 JSONRPC_VERSION = '2.0'
@@ -6,15 +6,26 @@ except ImportError:
 
 import json
 
+from ...core.config import Config
 from ...core.log import getLogger
+from ...libs.benchmark import profile
 from .constants import JsonRpcError, JSONRPC_VERSION
 from .context import ClientContext
 
 logging = getLogger(__name__)
 
 class RpcServer():
+   """JSON-RPC server implementation.
 
-   READER_MSG_SIZE = 4096
+   Messages are newline delimited in both directions, a connection can carry
+   any number of them. The requests received on a connection are processed
+   concurrently, up to MAX_PIPELINED_REQUESTS at a time, and each response is
+   sent as soon as it is ready which is not necessarily in the request order.
+   """
+
+   MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+   MAX_PIPELINED_REQUESTS = 16
+   MAX_BATCH_CONCURRENCY = 8
 
    def __init__(self, hosts, port, api):
       self.hosts = hosts
@@ -28,7 +39,8 @@ class RpcServer():
       for host in self.hosts:
          logging.info('%s: listening on %s:%s', self, host, self.port)
          await asyncio.start_server(self.handleConnection, host, self.port,
-                                    reuse_port=True)
+                                    reuse_port=True,
+                                    limit=self.MAX_MESSAGE_SIZE)
 
    def response(self, result, uid=None, id_present=True):
       return json.dumps({
@@ -70,6 +82,11 @@ class RpcServer():
       method = getattr(self.api, methodName)
 
       params = request.get('params', None)
+      with profile('rpc %s', methodName):
+         return await self._callMethod(ctx, method, methodName, params, uid,
+                                       id_present)
+
+   async def _callMethod(self, ctx, method, methodName, params, uid, id_present):
       try:
          result = None
          if params is None:
@@ -100,6 +117,46 @@ class RpcServer():
                                    str(e),
                                    uid=uid, id_present=id_present)
 
+   async def _handleBatchEntry(self, ctx, request, slots):
+      if not isinstance(request, dict):
+         return self.errorResponse(JsonRpcError.INVALID_REQUEST,
+                                   'Batch entry is not a JSON-RPC request')
+      uid = request.get('id', None)
+      id_present = 'id' in request
+      timeout = Config().api_rpc_batch_timeout
+      await slots.acquire()
+      # NOTE: a method timing out keeps running in the background, only its
+      #       result is dropped, as cancelling it could leave a half done
+      #       operation behind. It holds its slot until it really completes.
+      task = asyncio.ensure_future(self.handleRequest(ctx, request))
+      task.add_done_callback(lambda _: slots.release())
+      try:
+         return await asyncio.wait_for(asyncio.shield(task), timeout)
+      except asyncio.TimeoutError:
+         logging.error('%s: %s from %s timed out after %ss', self,
+                       request.get('method'), ctx, timeout)
+         self.api.tasks.append(task)
+         return self.errorResponse(JsonRpcError.REQUEST_TIMEOUT,
+                                   'Request timed out',
+                                   uid=uid, id_present=id_present)
+
+   async def _handleBatch(self, ctx, batch):
+      '''Process the entries of a batch concurrently
+
+      At most MAX_BATCH_CONCURRENCY entries run at once and each of them gets
+      api_rpc_batch_timeout seconds. The responses are returned in the order of
+      the requests, notifications have none.
+      '''
+      if not batch:
+         return self.errorResponse(JsonRpcError.INVALID_REQUEST, 'Empty batch')
+      slots = asyncio.Semaphore(self.MAX_BATCH_CONCURRENCY)
+      responses = await asyncio.gather(*[
+         self._handleBatchEntry(ctx, request, slots) for request in batch])
+      responses = [r for r in responses if r is not None]
+      if not responses:
+         return None
+      return '[%s]' % ', '.join(responses)
+
    async def _handleMessage(self, ctx, message):
       logging.debug('%s: Received %r from %s', self, message, ctx.addr)
       if message is None:
@@ -109,7 +166,7 @@ class RpcServer():
          return await self.handleRequest(ctx, message)
 
       if isinstance(message, list):
-         return await asyncio.gather(self.handleRequest(ctx, m) for m in message)
+         return await self._handleBatch(ctx, message)
 
       return json.dumps({
          'jsonrpc': '2.0',
@@ -120,35 +177,83 @@ class RpcServer():
          },
       })
 
+   async def _sendResponse(self, ctx, writer, lock, response):
+      if not response:
+         logging.debug('%s: No response for %s', self, ctx)
+         return
+      response += '\n'
+      logging.debug('%s: Send %r to %s', self, response, ctx)
+      async with lock:
+         writer.write(response.encode('utf-8'))
+         await writer.drain()
+
+   async def _processMessage(self, ctx, data, writer, lock, slots):
+      try:
+         message = None
+         try:
+            message = json.loads(data)
+         except ValueError:
+            pass
+
+         response = await self._handleMessage(ctx, message)
+         self.api.tasks = [x for x in self.api.tasks if not x.done()]
+         await self._sendResponse(ctx, writer, lock, response)
+      except ConnectionError:
+         logging.debug('%s: Could not respond to %s', self, ctx)
+      finally:
+         slots.release()
+
+   async def _readMessage(self, reader):
+      '''Read the next message, None if it was larger than MAX_MESSAGE_SIZE
+
+      An oversized message is discarded up to and including its newline so
+      that its remainder is not mistaken for the next message.
+      '''
+      oversized = False
+      while True:
+         try:
+            data = await reader.readuntil(b'\n')
+         except asyncio.IncompleteReadError as e:
+            # NOTE: a last message without a trailing newline is returned once
+            #       the peer closes its side of the connection
+            data = e.partial
+         except asyncio.LimitOverrunError as e:
+            # the separator is left in the buffer and consumed by the next read
+            await reader.readexactly(e.consumed)
+            oversized = True
+            continue
+         return None if oversized else data
+
    async def handleConnection(self, reader, writer):
       ctx = ClientContext(writer.get_extra_info('peername'))
       logging.info('%s: New connection from %s', self, ctx)
       exitReason = 'closed'
+      lock = asyncio.Lock()
+      slots = asyncio.Semaphore(self.MAX_PIPELINED_REQUESTS)
+      tasks = set()
       try:
-         data = b''
-         while not reader.at_eof():
+         while True:
             try:
-               data = await reader.read(self.READER_MSG_SIZE)
+               data = await self._readMessage(reader)
             except ConnectionResetError:
                exitReason = 'reset'
                return
-            message = None
-            try:
-               message = json.loads(data)
-            except ValueError:
-               pass
-
-            response = await self._handleMessage(ctx, message)
-
-            if response:
-               response += '\n'
-               logging.debug('%s: Send %r to %s', self, response, ctx)
-               writer.write(response.encode('utf-8'))
-            else:
-               logging.debug('%s: No response for %s', self, ctx)
-
-            self.api.tasks = [x for x in self.api.tasks if not x.done()]
-            await asyncio.sleep(0)
+            if data is None:
+               await self._sendResponse(ctx, writer, lock, self.errorResponse(
+                  JsonRpcError.INVALID_REQUEST,
+                  'Message larger than %d bytes' % self.MAX_MESSAGE_SIZE))
+               continue
+            if not data:
+               break
+            if not data.strip():
+               continue
+            await slots.acquire()
+            task = asyncio.ensure_future(
+               self._processMessage(ctx, data, writer, lock, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+         if tasks:
+            await asyncio.gather(*tasks)
       except: # pylint: disable=bare-except
          logging.exception('%s: Failed to handle request for %s', self, ctx)
          response = self.errorResponse(JsonRpcError.INTERNAL_ERROR,
@@ -158,5 +263,7 @@ class RpcServer():
             response += '\n'
             writer.write(response.encode('utf-8'))
       finally:
+         for task in tasks:
+            task.cancel()
          logging.info('%s: Connection %s for %s', self, exitReason, ctx)
          writer.close()
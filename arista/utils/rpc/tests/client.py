@@ -1,3 +1,4 @@
+import asyncio
 from errno import EAGAIN
 import json
 import os
@@ -5,7 +6,15 @@ import select
 
 from ....tests.testing import mock, unittest
 
-from ..client import RpcClient, RpcClientException, RpcServerException
+from ....core.supervisor import Supervisor
+from ..api import RpcSupervisorApi
+from ..client import (
+   AsyncRpcClient,
+   RpcClient,
+   RpcClientException,
+   RpcServerException,
+)
+from ..server import RpcServer
 
 class FakeSocket():
    def __init__(self):
@@ -104,5 +113,97 @@ class ClientTest(unittest.TestCase):
          with self.assertRaises(RpcClientException):
             api.doCommand('test')
 
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+   async def asyncSetUp(self):
+      self.server = RpcServer(['127.0.0.1'], 0, RpcSupervisorApi(Supervisor))
+      self.connections = 0
+      self.listener = await asyncio.start_server(
+         self._handleConnection, '127.0.0.1', 0)
+      self.port = self.listener.sockets[0].getsockname()[1]
+      self.client = AsyncRpcClient('127.0.0.1', self.port, timeout=5)
+      self.client.CONNECT_RETRY_DELAYS = [0.01, 0.01]
+
+   async def asyncTearDown(self):
+      await self.client.close()
+      self.listener.close()
+      await self.listener.wait_closed()
+
+   async def _handleConnection(self, reader, writer):
+      self.connections += 1
+      await self.server.handleConnection(reader, writer)
+
+   async def _delay(self, ctx, slot, powerCycleIfOn=False):
+      await asyncio.sleep(slot)
+      return slot
+
+   async def testConcurrentCalls(self):
+      with mock.patch.object(self.server.api, 'linecardSetup', self._delay):
+         results = await asyncio.gather(*[self.client.linecardSetup(delay)
+                                          for delay in [0.2, 0.1, 0]])
+         self.assertEqual(results, [0.2, 0.1, 0])
+         self.assertEqual(await self.client.linecardSetup(0), 0)
+      self.assertEqual(self.connections, 1)
+      self.assertEqual(self.client.pending, {})
+
+   async def testServerError(self):
+      with mock.patch.object(self.server.api, 'linecardClean',
+                             new_callable=mock.AsyncMock) as mockObj:
+         mockObj.side_effect = Exception('failed')
+         with self.assertRaises(RpcServerException):
+            await self.client.linecardClean(3)
+
+   async def testTimeout(self):
+      with mock.patch.object(self.server.api, 'linecardSetup', self._delay):
+         with self.assertRaises(RpcClientException):
+            await self.client.linecardSetup(1, timeout=0.1)
+         # the connection is still usable
+         self.assertEqual(await self.client.linecardSetup(0), 0)
+      self.assertEqual(self.connections, 1)
+
+   async def testReconnect(self):
+      with mock.patch.object(self.server.api, 'linecardSetup', self._delay):
+         self.assertEqual(await self.client.linecardSetup(0), 0)
+         self.client.writer.close()
+         await asyncio.sleep(0.05)
+         self.assertFalse(self.client.connected())
+         self.assertEqual(await self.client.linecardSetup(0), 0)
+      self.assertEqual(self.connections, 2)
+
+   async def testConnectionFailure(self):
+      self.listener.close()
+      await self.listener.wait_closed()
+      with self.assertRaises(RpcClientException):
+         await self.client.linecardSetup(0)
+
+   async def testConnectBackoff(self):
+      attempts = []
+      openConnection = asyncio.open_connection
+      async def flakyOpenConnection(*args, **kwargs):
+         attempts.append(kwargs.get('limit'))
+         if len(attempts) < 3:
+            raise ConnectionRefusedError()
+         return await openConnection(*args, **kwargs)
+
+      with mock.patch.object(self.server.api, 'linecardSetup', self._delay), \
+           mock.patch('asyncio.open_connection', flakyOpenConnection):
+         self.assertEqual(await self.client.linecardSetup(0), 0)
+      self.assertEqual(attempts, [RpcServer.MAX_MESSAGE_SIZE] * 3)
+
+   async def testOversizedResponse(self):
+      async def echo(ctx, slot):
+         return slot
+
+      self.client.MAX_MESSAGE_SIZE = 1024
+      with mock.patch.object(self.server.api, 'linecardClean', echo):
+         with self.assertRaises(RpcClientException):
+            await self.client.linecardClean('x' * 4096)
+         # the next call goes through a new connection
+         self.assertEqual(await self.client.linecardClean(3), 3)
+      self.assertEqual(self.connections, 2)
+
+   def testUnknownMethod(self):
+      with self.assertRaises(AttributeError):
+         self.client.methodThatDoesNotExist() # pylint: disable=no-member
+
 if __name__ == '__main__':
    unittest.main()
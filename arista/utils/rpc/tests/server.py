@@ -1,7 +1,10 @@
+import asyncio
 import json
+import time
 
 from ....tests.testing import mock, unittest
 
+from ....core.config import Config
 from ....core.supervisor import Supervisor
 from ..api import RpcSupervisorApi
 from ..constants import JsonRpcError, JSONRPC_VERSION
@@ -127,5 +130,187 @@ class RpcServerTest(unittest.IsolatedAsyncioTestCase):
          })
       self._testErrorResult(json.loads(result), 5, -1)
 
+class RpcServerBatchTest(unittest.IsolatedAsyncioTestCase):
+   def setUp(self):
+      self.server = RpcServer(['127.0.0.1'], 0, RpcSupervisorApi(Supervisor))
+      self.ctx = ClientContext(('127.0.0.1', '43000'))
+      self.running = 0
+      self.peak = 0
+
+   def tearDown(self):
+      Config().api_rpc_batch_timeout = 60
+
+   def _request(self, uid, method, *params):
+      return {
+         'jsonrpc': JSONRPC_VERSION,
+         'id': uid,
+         'method': method,
+         'params': list(params),
+      }
+
+   async def _sleep(self, ctx, slot, powerCycleIfOn=False):
+      self.running += 1
+      self.peak = max(self.peak, self.running)
+      try:
+         await asyncio.sleep(slot)
+         return slot
+      finally:
+         self.running -= 1
+
+   async def _batch(self, batch):
+      with mock.patch.object(self.server.api, 'linecardSetup', self._sleep):
+         response = await self.server._handleMessage(self.ctx, batch)
+      return json.loads(response) if response is not None else None
+
+   async def testConcurrentInOrder(self):
+      batch = [self._request(i, 'linecardSetup', delay)
+               for i, delay in enumerate([0.2, 0, 0.2, 0])]
+      notification = self._request(None, 'linecardSetup', 0)
+      del notification['id']
+      batch.insert(2, notification)
+      batch.append(42)
+
+      begin = time.monotonic()
+      responses = await self._batch(batch)
+      self.assertLess(time.monotonic() - begin, 0.4)
+      self.assertEqual([r.get('result') for r in responses[:4]],
+                       [0.2, 0, 0.2, 0])
+      self.assertEqual([r['id'] for r in responses[:4]], [0, 1, 2, 3])
+      self._testError(responses[4], JsonRpcError.INVALID_REQUEST)
+
+   async def testBounded(self):
+      self.server.MAX_BATCH_CONCURRENCY = 2
+      await self._batch([self._request(i, 'linecardSetup', 0.05)
+                         for i in range(5)])
+      self.assertEqual(self.peak, 2)
+
+   async def testEntryTimeout(self):
+      Config().api_rpc_batch_timeout = 0.1
+      responses = await self._batch([self._request(0, 'linecardSetup', 0.5),
+                                     self._request(1, 'linecardSetup', 0)])
+      self._testError(responses[0], JsonRpcError.REQUEST_TIMEOUT)
+      self.assertEqual(responses[0]['id'], 0)
+      self.assertEqual(responses[1]['result'], 0)
+      # the timed out method is still running in the background
+      self.assertEqual(self.running, 1)
+      await asyncio.gather(*self.server.api.tasks)
+
+   async def testTimedOutEntryKeepsItsSlot(self):
+      Config().api_rpc_batch_timeout = 0.1
+      self.server.MAX_BATCH_CONCURRENCY = 1
+      begin = time.monotonic()
+      responses = await self._batch([self._request(0, 'linecardSetup', 0.3),
+                                     self._request(1, 'linecardSetup', 0)])
+      self.assertGreaterEqual(time.monotonic() - begin, 0.3)
+      self._testError(responses[0], JsonRpcError.REQUEST_TIMEOUT)
+      self.assertEqual(responses[1]['result'], 0)
+      self.assertEqual(self.peak, 1)
+
+   async def testEmptyAndNotifications(self):
+      self._testError(await self._batch([]), JsonRpcError.INVALID_REQUEST)
+      notification = self._request(None, 'linecardSetup', 0)
+      del notification['id']
+      self.assertIsNone(await self._batch([notification]))
+
+   def _testError(self, response, code):
+      self.assertEqual(response['error']['code'], code)
+
+class RpcServerConnectionTest(unittest.IsolatedAsyncioTestCase):
+   async def asyncSetUp(self):
+      self.server = RpcServer(['127.0.0.1'], 0, RpcSupervisorApi(Supervisor))
+      self.server.MAX_MESSAGE_SIZE = 64 * 1024
+      self.listener = await asyncio.start_server(
+         self.server.handleConnection, '127.0.0.1', 0,
+         limit=self.server.MAX_MESSAGE_SIZE)
+      port = self.listener.sockets[0].getsockname()[1]
+      self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+
+   async def asyncTearDown(self):
+      self.writer.close()
+      self.listener.close()
+      await self.listener.wait_closed()
+
+   def _request(self, uid, method='linecardClean', params=None):
+      return json.dumps({
+         'jsonrpc': JSONRPC_VERSION,
+         'id': uid,
+         'method': method,
+         'params': params,
+      }).encode('utf-8') + b'\n'
+
+   async def _readResponses(self, count):
+      responses = []
+      for _ in range(count):
+         line = await asyncio.wait_for(self.reader.readline(), 5)
+         self.assertTrue(line.endswith(b'\n'))
+         responses.append(json.loads(line))
+      return responses
+
+   async def testMultipleRequests(self):
+      async def echo(ctx, slot):
+         return slot
+
+      with mock.patch.object(self.server.api, 'linecardClean', echo):
+         large = 'x' * (3 * 4096)
+         data = self._request(0, params=[0]) + self._request(1, params=[large])
+         # back to back requests, the second one split across writes
+         self.writer.write(data[:-100])
+         await self.writer.drain()
+         await asyncio.sleep(0.05)
+         self.writer.write(data[-100:] + b'\n' + b'{not json\n')
+         responses = await self._readResponses(3)
+
+      results = {r['id']: r for r in responses}
+      self.assertEqual(results[0]['result'], 0)
+      self.assertEqual(results[1]['result'], large)
+      self.assertEqual(results[None]['error']['code'], JsonRpcError.PARSE_ERROR)
+
+   async def testPipelining(self):
+      async def slow(ctx, slot, powerCycleIfOn=False):
+         await asyncio.sleep(0.2)
+         return 'slow'
+
+      async def fast(ctx, slot):
+         return 'fast'
+
+      with mock.patch.object(self.server.api, 'linecardSetup', slow), \
+           mock.patch.object(self.server.api, 'linecardClean', fast):
+         self.writer.write(self._request(0, method='linecardSetup', params=[3]) +
+                           self._request(1, method='linecardClean', params=[3]))
+         responses = await self._readResponses(2)
+
+      # the fast request is not blocked behind the slow one
+      self.assertEqual([(r['id'], r['result']) for r in responses],
+                       [(1, 'fast'), (0, 'slow')])
+
+   async def testOversizedMessage(self):
+      with mock.patch.object(self.server.api, 'linecardClean',
+                             new_callable=mock.AsyncMock) as mockObj:
+         mockObj.return_value = True
+         # the oversized message arrives in several chunks, none of which
+         # must be interpreted as a message of its own
+         chunk = b'{"jsonrpc": "2.0", ' + b'x' * 32 * 1024 + b'\n'
+         for _ in range(6):
+            self.writer.write(chunk.rstrip())
+            await self.writer.drain()
+            await asyncio.sleep(0.01)
+         self.writer.write(b'\n' + self._request(3, params=[1]))
+         self.writer.write_eof()
+         error, response = await self._readResponses(2)
+         self.assertEqual(await asyncio.wait_for(self.reader.readline(), 5), b'')
+      self.assertEqual(error['error']['code'], JsonRpcError.INVALID_REQUEST)
+      self.assertEqual(response['id'], 3)
+      self.assertEqual(response['result'], True)
+
+   async def testLastMessageWithoutNewline(self):
+      with mock.patch.object(self.server.api, 'linecardClean',
+                             new_callable=mock.AsyncMock) as mockObj:
+         mockObj.return_value = True
+         self.writer.write(self._request(7, params=[1]).rstrip())
+         self.writer.write_eof()
+         response, = await self._readResponses(1)
+      self.assertEqual(response['id'], 7)
+      self.assertEqual(response['result'], True)
+
 if __name__ == '__main__':
    unittest.main()
@@ -13,6 +13,7 @@ try:
    from arista.core.platform import getPlatform, readPrefdl, getFanDirectionSku
    from arista.core.supervisor import Supervisor
    from arista.core.linecard import Linecard
+   from arista.core.xcvr import getXcvrPresenceBitmap
    from arista.utils.sonic_platform.component import Component
    from arista.utils.sonic_platform.eeprom import Eeprom
    from arista.utils.sonic_platform.fan_drawer import (
@@ -202,7 +203,10 @@ class Chassis(ChassisBase):
 
    def _get_event_watcher(self):
       if self._event_watcher is None:
-         self._event_watcher = EventWatcher(preserve=Config().persistent_presence_check)
+         self._event_watcher = EventWatcher(
+            preserve=Config().persistent_presence_check,
+            presenceBitmap=lambda: getXcvrPresenceBitmap(self._inventory),
+         )
       return self._event_watcher
 
    def get_change_event(self, timeout=0):
@@ -19,10 +19,12 @@ class Event(object):
       self.typ = typ
       self.status = None
 
-   def get_status_changed(self):
+   def get_status_changed(self, presence=None):
       # NOTE: The logic in this function could be enhanced to report more
       #       statuses. This would would then require object specific logic
-      status = INSERTED if self.obj.get_presence() else REMOVED
+      if presence is None:
+         presence = self.obj.get_presence()
+      status = INSERTED if presence else REMOVED
       changed = (status != self.status and self.status is not None)
       self.status = status
       return changed, self.status
@@ -55,8 +57,11 @@ class PollEvent(Event):
    pass
 
 class EventWatcher(object):
-   def __init__(self, preserve=False, pollInterval=1000.):
+   def __init__(self, preserve=False, pollInterval=1000., presenceBitmap=None):
       self.preserve = preserve
+      # callback returning the presence of all the sfps as a bitmap indexed by
+      # uid, allows a single bulk read per poll instead of one read per sfp
+      self.presenceBitmap = presenceBitmap
       self.pollInterval = pollInterval
       self.epollHack = True
       self.epoll_ = None
@@ -118,11 +123,25 @@ class EventWatcher(object):
 
       return detected
 
+   def get_presence_bitmap(self):
+      if self.presenceBitmap is None:
+         return None
+      if not any(e.typ == 'sfp' for e in self.pollItems.values()):
+         return None
+      try:
+         return self.presenceBitmap()
+      except Exception: # pylint: disable=broad-except
+         return None
+
    def poll_events(self, res):
       detected = False
+      bitmap = self.get_presence_bitmap()
       for event in self.pollItems.values():
+         presence = None
+         if bitmap is not None and event.typ == 'sfp':
+            presence = bool((bitmap >> event.uid) & 1)
          try:
-            changed, status = event.get_status_changed()
+            changed, status = event.get_status_changed(presence=presence)
          except Exception: # pylint: disable=broad-except
             continue
          if changed:
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import atexit
 import os
 
 try:
@@ -7,6 +8,7 @@ try:
    import arista.platforms
    from arista.core.log import setupLogging
    from arista.core.platform import getPlatform
+   from arista.libs.benchmark import getProfiler, profile
    from arista.utils.sonic_platform.chassis import Chassis
 except ImportError as e:
    raise ImportError("%s - required module not found" % e)
@@ -18,6 +20,14 @@ def _maybeEnableTracing():
    # pylint: disable=import-outside-toplevel
    setupLogging(tracing)
 
+def _maybeEnableProfiling():
+   path = os.getenv('ARPROFILE')
+   if not path:
+      return
+   profiler = getProfiler()
+   profiler.enable()
+   atexit.register(profiler.dump, path)
+
 class Platform(PlatformBase):
 
    # NOTE: this cache is necessary since it's possible for some daemon or their
@@ -36,7 +46,9 @@ class Platform(PlatformBase):
          self._chassis = pcache._chassis
       else:
          self._platform = platform
-         self._chassis = Chassis(self._platform)
+         with profile('create Chassis'):
+            self._chassis = Chassis(self._platform)
          Platform.PLATFORM_CACHE[uid] = self
 
 _maybeEnableTracing()
+_maybeEnableProfiling()
@@ -6,6 +6,7 @@ try:
    from sonic_platform_base.sonic_thermal_control.thermal_json_object \
       import thermal_json_object
    from arista.core.cooling import CoolingAlgorithm
+   from arista.core.i2c_utils import getI2cExecutor
    from .thermal_helper import CoolingEntityManager
 except ImportError as e:
    raise ImportError("%s - required module not found" % e)
@@ -25,8 +26,7 @@ class FanInfo(ThermalPolicyInfo):
 
    def collect(self, chassis):
       self.fans = CoolingEntityManager.get(chassis).get_all_fans()
-      for fan in self.fans.values():
-         fan.update()
+      getI2cExecutor().map(lambda fan: fan.update(), self.fans.values())
 
 @thermal_json_object("thermal_info")
 class ThermalInfo(ThermalPolicyInfo):
@@ -36,8 +36,7 @@ class ThermalInfo(ThermalPolicyInfo):
 
    def collect(self, chassis):
       self.thermals = CoolingEntityManager.get(chassis).get_all_thermals()
-      for thermal in self.thermals.values():
-         thermal.update()
+      getI2cExecutor().map(lambda thermal: thermal.update(), self.thermals.values())
 
 @thermal_json_object("psu_info")
 class PsuInfo(ThermalPolicyInfo):
@@ -47,8 +46,7 @@ class PsuInfo(ThermalPolicyInfo):
 
    def collect(self, chassis):
       self.psus = CoolingEntityManager.get(chassis).get_all_psus()
-      for psu in self.psus.values():
-         psu.update()
+      getI2cExecutor().map(lambda psu: psu.update(), self.psus.values())
 
 @thermal_json_object("control_info")
 class ControlInfo(ThermalPolicyInfo):
@@ -1,5 +1,6 @@
 import time
 
+from ..core.xcvr import getXcvrPresenceBitmap
 from .sonic_utils import getPlatform
 
 try:
@@ -114,8 +115,9 @@ def getSfpUtil():
             start_time = time.time()
             timeout = timeout / float(1000) # convert msec to sec
             while True:
+                bitmap = getXcvrPresenceBitmap(inventory)
                 for xcvrSlot in xcvrSlots.values():
-                    presence = xcvrSlot.getPresence()
+                    presence = bool((bitmap >> xcvrSlot.getId()) & 1)
                     if self.xcvr_presence_map[xcvrSlot.getId()] != presence:
                         ret[str(xcvrSlot.getId())] = '1' if presence else '0'
                         self.xcvr_presence_map[xcvrSlot.getId()] = presence